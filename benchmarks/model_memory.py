@@ -0,0 +1,237 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Measures the memory used by each model object, slotted or not.
+
+The model of a synthetic VSS sized tree is built and every object of
+this project reachable from it is collected. For each class, samples
+are copied as they are and as plain objects with a ``__dict__`` holding
+the same attributes, the difference is the per instance saving of
+``__slots__``.
+
+Usage::
+
+    python -m benchmarks.model_memory [--branches N] [--leaves N] \\
+        [--samples N] [--json results.json]
+'''
+
+import argparse
+import enum
+import json
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Type,
+)
+
+from graphql import build_schema
+
+from graphql_schema2cpp_codegen.types import VSSGraphQLSchema
+
+from vss_deploy.model.deploy import (
+    VehicleDeployMap,
+    get_deploy_types,
+    load_depl,
+)
+
+from .synthetic import SyntheticVSS
+
+
+MODEL_MODULES = ('graphql_schema2cpp_codegen.', 'vss_deploy.')
+
+
+def get_slots(cls: Type[Any]) -> List[str]:
+    slots: List[str] = []
+    for c in reversed(cls.__mro__):
+        s = c.__dict__.get('__slots__', ())
+        slots.extend((s,) if isinstance(s, str) else s)
+    return slots
+
+
+def is_model_object(obj: Any) -> bool:
+    return type(obj).__module__.startswith(MODEL_MODULES) \
+        and not isinstance(obj, enum.Enum)
+
+
+def iter_model_objects(roots: Iterable[Any]) -> Iterator[Any]:
+    '''
+    Walks the attributes and containers reachable from ``roots``,
+    yielding the objects defined by this project once. Objects of other
+    libraries (ie: graphql-core) are not followed.
+    '''
+    seen = set()
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, dict):
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            pending.extend(obj)
+        elif is_model_object(obj):
+            yield obj
+            pending.extend(
+                getattr(obj, name) for name in get_slots(type(obj))
+                if hasattr(obj, name)
+            )
+            pending.extend(getattr(obj, '__dict__', {}).values())
+
+
+def measure(factory: Callable[[], Any], count: int) -> float:
+    '''
+    Average size of the objects created by ``factory``.
+    '''
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def get_attrs(obj: Any) -> Dict[str, Any]:
+    attrs = {
+        name: getattr(obj, name) for name in get_slots(type(obj))
+        if hasattr(obj, name)
+    }
+    attrs.update(getattr(obj, '__dict__', {}))
+    return attrs
+
+
+def make_copy(obj: Any) -> Callable[[], Any]:
+    '''
+    Shallow copies of ``obj`` sharing its attribute values. They are
+    built like the ``make_dict_copy()`` ones, not by ``copy.copy()``,
+    which may call ``__setstate__`` and allocate new values.
+    '''
+    cls = type(obj)
+    attrs = get_attrs(obj)
+
+    def factory() -> Any:
+        o = object.__new__(cls)
+        for name, value in attrs.items():
+            object.__setattr__(o, name, value)
+        return o
+
+    return factory
+
+
+def make_dict_copy(obj: Any) -> Callable[[], Any]:
+    '''
+    Copies of ``obj`` as plain objects with a ``__dict__`` sharing its
+    attribute values.
+    '''
+    cls = type(f'{type(obj).__name__}WithDict', (), {})
+    attrs = get_attrs(obj)
+
+    def factory() -> Any:
+        o = cls()
+        for name, value in attrs.items():
+            setattr(o, name, value)
+        return o
+
+    return factory
+
+
+def build_model(directory: str, synthetic: SyntheticVSS) -> List[Any]:
+    schema_path, depl_path = synthetic.write(directory)
+    with open(depl_path) as f:
+        deploy_map = VehicleDeployMap(load_depl(f, directory))
+    deploy_types = get_deploy_types(deploy_map)
+    with open(schema_path) as f:
+        schema = build_schema(f.read())
+    vss_graphql = VSSGraphQLSchema(schema, deploy_types, {})
+    return [vss_graphql, dict(deploy_map)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--branches',
+        help='Number of branches of Vehicle',
+        type=int,
+        default=100,
+    )
+    parser.add_argument(
+        '--leaves',
+        help='Number of leaves of each branch',
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        '--samples',
+        help='Copies of each class measured',
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    synthetic = SyntheticVSS(
+        args.branches, args.leaves, list_branches=args.branches // 10)
+    with tempfile.TemporaryDirectory() as directory:
+        roots = build_model(directory, synthetic)
+
+    by_class: Dict[Type[Any], List[Any]] = defaultdict(list)
+    for obj in iter_model_objects(roots):
+        by_class[type(obj)].append(obj)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for cls, objects in sorted(
+        by_class.items(), key=lambda i: len(i[1]), reverse=True,
+    ):
+        sample = objects[0]
+        slotted = not hasattr(sample, '__dict__')
+        size = measure(make_copy(sample), args.samples)
+        dict_size = measure(make_dict_copy(sample), args.samples)
+        results[f'{cls.__module__}.{cls.__qualname__}'] = {
+            'count': len(objects),
+            'slotted': slotted,
+            'bytes_per_instance': size,
+            'dict_bytes_per_instance': dict_size,
+            'saved_bytes': (dict_size - size) * len(objects),
+        }
+        print(  # noqa: T001
+            f'{cls.__name__:>28} {len(objects):7}'
+            f' {"slots" if slotted else "dict ":>5}'
+            f' {size:7.0f} B vs {dict_size:7.0f} B with __dict__,'
+            f' saves {(dict_size - size) * len(objects) / 1024:9.1f} KiB'
+        )
+
+    total = sum(r['saved_bytes'] for r in results.values())
+    print(f'total saved: {total / 1024:.1f} KiB')  # noqa: T001
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
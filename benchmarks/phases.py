@@ -0,0 +1,287 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Times each phase of a run on a synthetic VSS sized tree.
+
+The GraphQL schema and the ``!include`` deploy tree are generated in a
+temporary directory, then every phase is timed on its own: deploy
+loading, flattening, deploy types, schema building, permissions,
+``VSSGraphQLSchema`` and code generation.
+
+Usage::
+
+    python -m benchmarks.phases [--branches N] [--leaves N] \\
+        [--list_branches N] [--list_depth N] \\
+        [--deploy_mix franca=4,custom=2,constant=1,dispatcher=1] \\
+        [--tracemalloc] [--json results.json]
+
+Each run should use its own process, so the memory figures are not
+polluted by a previous one.
+'''
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    TypeVar,
+)
+
+from graphql import Source, build_schema
+
+from graphql_schema2cpp_codegen.generators.cppgraphqlgen.generators import (
+    generate,
+)
+from graphql_schema2cpp_codegen.generators.cppgraphqlgen.types import (
+    GenerationParameters,
+)
+from graphql_schema2cpp_codegen.types import VSSGraphQLSchema
+
+from vss_deploy.model.deploy import (
+    IncludeCache,
+    VehicleDeployMap,
+    get_deploy_types,
+    load_depl,
+    update_permissions,
+)
+from vss_deploy.model.permissions_registry import PermissionsRegistry
+
+from .synthetic import (
+    DEFAULT_DEPLOY_MIX,
+    SyntheticVSS,
+    parse_deploy_mix,
+)
+
+
+T = TypeVar('T')
+
+
+class PhaseTimer:
+    '''
+    Runs the phases and records their wall time and memory usage.
+
+    The maximum resident set size is the process high water mark after
+    the phase. If ``trace_memory``, the peak of the Python allocations
+    done by each phase is traced as well, at the expense of slower
+    phases.
+    '''
+    __slots__ = ('trace_memory', 'results')
+    trace_memory: bool
+    results: Dict[str, Dict[str, float]]
+
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    def __call__(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        phase = {
+            'seconds': elapsed,
+            'max_rss_kib': resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss,
+        }
+        if self.trace_memory:
+            _, phase['tracemalloc_peak_bytes'] = \
+                tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        self.results[name] = phase
+        print(  # noqa: T001
+            f'{name:>20}: {elapsed:8.3f}s'
+            f' {phase["max_rss_kib"] / 1024:8.1f} MiB max RSS'
+        )
+        return result
+
+
+def run_phases(
+    directory: str,
+    schema_path: str,
+    depl_path: str,
+    timer: PhaseTimer,
+    jobs: int,
+) -> Dict[str, int]:
+    '''
+    Runs each phase like ``graphql_schema2cpp_codegen.run()`` does,
+    returns the size of the intermediate results.
+    '''
+    include_cache = IncludeCache()
+
+    def load() -> dict:
+        with open(depl_path) as f:
+            return load_depl(
+                f, os.path.dirname(depl_path), include_cache=include_cache)
+
+    def build() -> Any:
+        with open(schema_path) as f:
+            return build_schema(Source(f.read(), schema_path))
+
+    def permissions() -> PermissionsRegistry:
+        registry = PermissionsRegistry.create(
+            os.path.join(directory, 'perms.yaml'))
+        update_permissions(registry, schema)
+        return registry
+
+    raw_data = timer('load_depl', load)
+    deploy_map = timer('flatten', VehicleDeployMap, raw_data)
+    deploy_types = timer('get_deploy_types', get_deploy_types, deploy_map)
+    schema = timer('build_schema', build)
+    registry = timer('update_permissions', permissions)
+    vss_graphql = timer(
+        'vss_graphql_schema',
+        VSSGraphQLSchema, schema, deploy_types, registry.registry,
+    )
+
+    params = GenerationParameters(
+        vss_graphql=vss_graphql,
+        graphql_namespace='vehicle',
+        permissions_symbols_file='permissions_symbols.hpp',
+        header_open='',
+        header_close='',
+        source_open='',
+        source_close='',
+        visibility_attribute='',
+        jobs=jobs,
+    )
+    outputs = timer(
+        'generate',
+        generate,
+        params,
+        os.path.join(directory, 'Vehicle.cpp'),
+        os.path.join(directory, 'Vehicle.hpp'),
+        os.path.join(directory, 'permissions_symbols.hpp'),
+    )
+
+    return {
+        'include_hits': include_cache.hits,
+        'include_misses': include_cache.misses,
+        'deploy_entries': sum(1 for _ in deploy_map),
+        'deploy_types': len(deploy_types),
+        'graphql_types': len(schema.type_map),
+        'permissions': len(registry.registry),
+        'generated_bytes': sum(os.path.getsize(p) for p in outputs),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--branches',
+        help='Number of branches of Vehicle, each in its own include file',
+        type=int,
+        default=100,
+    )
+    parser.add_argument(
+        '--leaves',
+        help='Number of leaves of each branch (and list item)',
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        '--list_branches',
+        help='Number of branches that are lists',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '--list_depth',
+        help='Levels of lists nested in the list branches',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--list_items',
+        help='Number of items of each list',
+        type=int,
+        default=2,
+    )
+    parser.add_argument(
+        '--deploy_mix',
+        help='Weights of each deploy kind of the leaves,'
+             f' default: {DEFAULT_DEPLOY_MIX}',
+        type=parse_deploy_mix,
+        default=DEFAULT_DEPLOY_MIX,
+    )
+    parser.add_argument(
+        '--jobs',
+        help='Parallel jobs used to generate the code',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--tracemalloc',
+        help='Trace the peak of Python allocations of each phase.'
+             ' The phases get slower',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    synthetic = SyntheticVSS(
+        branches=args.branches,
+        leaves=args.leaves,
+        list_branches=args.list_branches,
+        list_depth=args.list_depth,
+        list_items=args.list_items,
+        deploy_mix=args.deploy_mix,
+    )
+    timer = PhaseTimer(args.tracemalloc)
+    with tempfile.TemporaryDirectory() as directory:
+        schema_path, depl_path = synthetic.write(directory)
+        sizes = run_phases(directory, schema_path, depl_path, timer,
+                           args.jobs)
+    sizes['leaves'] = synthetic.leaf_count
+
+    total = sum(phase['seconds'] for phase in timer.results.values())
+    print(f'{"total":>20}: {total:8.3f}s')  # noqa: T001
+    print(', '.join(f'{k}: {v}' for k, v in sizes.items()))  # noqa: T001
+
+    if args.json:
+        results = {
+            'parameters': {
+                'branches': args.branches,
+                'leaves': args.leaves,
+                'list_branches': args.list_branches,
+                'list_depth': args.list_depth,
+                'list_items': args.list_items,
+                'deploy_mix': args.deploy_mix,
+                'jobs': args.jobs,
+                'tracemalloc': args.tracemalloc,
+            },
+            'sizes': sizes,
+            'phases': timer.results,
+            'total_seconds': total,
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Compares rendering each section entry by entry (one template context and
+stream per entry) against the single pass section rendering.
+
+Usage::
+
+    python -m benchmarks.section_rendering [--types N] [--json results.json]
+'''
+
+import argparse
+import io
+import json
+import time
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+)
+
+from graphql import build_schema
+
+from graphql_schema2cpp_codegen.generators.cppgraphqlgen.generators.common import (  # noqa: E501
+    CommonGeneratorSingle,
+)
+from graphql_schema2cpp_codegen.generators.cppgraphqlgen.types import (
+    GenerationParameters,
+)
+from graphql_schema2cpp_codegen.types import VSSGraphQLSchema
+
+from .synthetic import make_types_schema
+
+
+def render_per_entry(
+    gen: CommonGeneratorSingle,
+    extra_vars: Mapping[str, Any],
+) -> None:
+    gen.emit_open(extra_vars)
+    for entry in gen.entries:
+        gen.emit_entry(entry, extra_vars)
+    gen.emit_close(extra_vars)
+
+
+def render_section(
+    gen: CommonGeneratorSingle,
+    extra_vars: Mapping[str, Any],
+) -> None:
+    gen.emit_all(extra_vars)
+
+
+RENDER_PATHS = {
+    'per_entry': render_per_entry,
+    'section': render_section,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--types',
+        help='Number of named types in the synthetic schema',
+        type=int,
+        default=10000,
+    )
+    parser.add_argument(
+        '--repeat',
+        help='Number of timed runs, the best one is reported',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results (seconds) to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    schema = build_schema(make_types_schema(args.types))
+    vss_graphql = VSSGraphQLSchema(schema, {}, {})
+    params = GenerationParameters(
+        vss_graphql=vss_graphql,
+        graphql_namespace='vehicle',
+        permissions_symbols_file='permissions_symbols.hpp',
+        header_open='',
+        header_close='',
+        source_open='',
+        source_close='',
+        visibility_attribute='',
+    )
+    extra_vars = {'header_file': 'generated.hpp'}
+
+    results: Dict[str, Dict[str, float]] = {}
+    for kind, entries in vss_graphql:
+        for output in ('header', 'source'):
+            name = f'{kind}_{output}'
+            results[name] = {}
+            rendered = {}
+            for path, render in RENDER_PATHS.items():
+                times = []
+                # first run loads the templates and is not timed
+                for _ in range(args.repeat + 1):
+                    buffer = io.StringIO()
+                    gen: CommonGeneratorSingle = CommonGeneratorSingle(
+                        params, buffer, name, tuple(entries.values()))
+                    start = time.perf_counter()
+                    render(gen, extra_vars)
+                    times.append(time.perf_counter() - start)
+                results[name][path] = min(times[1:])
+                rendered[path] = buffer.getvalue()
+            if rendered['per_entry'] != rendered['section']:
+                raise SystemExit(f'{name}: outputs differ')
+            print(  # noqa: T001
+                f'{name:>14} ({len(entries):5} entries):'
+                f' per entry {results[name]["per_entry"]:7.3f}s,'
+                f' section {results[name]["section"]:7.3f}s'
+            )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Startup benchmark of the template loading.
+
+Each case runs in a fresh interpreter, so imports are not cached. The
+templates module is imported before the timed part, then the sources of
+all templates are read using the former ``pkg_resources`` based loader
+and the ``importlib.resources`` one.
+
+Usage::
+
+    python -m benchmarks.startup [--runs N] [--json results.json]
+'''
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import (
+    Dict,
+    List,
+)
+
+
+SETUP = '''
+import time
+from graphql_schema2cpp_codegen.generators.cppgraphqlgen.templates import (
+    PackageResourceLoader, Templates,
+)
+names = PackageResourceLoader().list_templates()
+start = time.perf_counter()
+'''
+
+CASES = {
+    'pkg_resources': '''
+from pkg_resources import resource_stream
+module = 'graphql_schema2cpp_codegen.generators.cppgraphqlgen'
+for name in names:
+    with resource_stream(module, 'templates/' + name) as f:
+        f.read().decode('utf-8')
+''',
+    'importlib.resources': '''
+loader = PackageResourceLoader()
+for name in names:
+    loader.get_source(Templates.env, name)
+''',
+    'cold start (all Templates)': '''
+for name in dir(Templates):
+    getattr(Templates, name)
+''',
+}
+
+REPORT = '''
+print(time.perf_counter() - start)
+'''
+
+
+def run_case(code: str, runs: int) -> List[float]:
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', SETUP + code + REPORT],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(float(output) * 1000)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--runs',
+        help='Number of interpreters to run per case',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results (milliseconds) to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, code in CASES.items():
+        times = run_case(code, args.runs)
+        results[name] = {
+            'median': statistics.median(times),
+            'min': min(times),
+            'max': max(times),
+        }
+        r = results[name]
+        print(  # noqa: T001
+            f'{name:>28}: {r["median"]:8.2f} ms'
+            f' (min {r["min"]:.2f}, max {r["max"]:.2f})'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Synthetic GraphQL schemas and deploy files for the benchmarks.
+'''
+
+import os
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import yaml
+
+
+DIRECTIVES = '''\
+directive @range(min: Float, max: Float) on FIELD_DEFINITION \
+| INPUT_FIELD_DEFINITION | INPUT_OBJECT
+directive @hasPermissions(permissions: [String!]!) on FIELD_DEFINITION \
+| OBJECT | INPUT_FIELD_DEFINITION
+'''
+
+
+def make_types_schema(types: int) -> str:
+    '''
+    Schema with ``types`` named types: 40% objects, each one referencing
+    the next, and 20% of each enums, inputs and scalars.
+    '''
+    objects = max(1, types * 2 // 5)
+    others = max(1, (types - objects) // 3)
+
+    lines: List[str] = [DIRECTIVES]
+    lines.append('type Query {\n  root: Object0\n}\n')
+    for i in range(others):
+        lines.append(f'scalar Scalar{i}\n')
+        lines.append(f'enum Enum{i} {{ A{i} B{i} C{i} }}\n')
+        lines.append(
+            f'input Input{i} {{\n'
+            f'  id: String!\n'
+            f'  value: Float @range(min: 0, max: {i + 1})\n'
+            f'}}\n'
+        )
+    for i in range(objects):
+        j = i % others
+        fields = [
+            '  name: String',
+            '  value: Float @range(min: 0, max: 100)',
+            f'  kind: Enum{j}',
+            f'  raw: Scalar{j}',
+        ]
+        if i + 1 < objects:
+            fields.append(f'  child: Object{i + 1}')
+        lines.append(f'type Object{i} {{\n' + '\n'.join(fields) + '\n}\n')
+    return '\n'.join(lines)
+
+
+DEPLOY_KINDS = ('franca', 'custom', 'constant', 'dispatcher')
+DEFAULT_DEPLOY_MIX = 'franca=4,custom=2,constant=1,dispatcher=1'
+
+
+def parse_deploy_mix(text: str) -> Dict[str, int]:
+    '''
+    Parses ``kind=weight`` pairs separated by commas.
+
+    >>> parse_deploy_mix('franca=2,constant=1')
+    {'franca': 2, 'constant': 1}
+    '''
+    mix: Dict[str, int] = {}
+    for item in text.split(','):
+        kind, _, weight = item.partition('=')
+        kind = kind.strip()
+        if kind not in DEPLOY_KINDS:
+            raise ValueError(f'unknown deploy kind: {kind}')
+        mix[kind] = int(weight) if weight else 1
+    if not any(mix.values()):
+        raise ValueError('the deploy mix must have a positive weight')
+    return mix
+
+
+def _franca(package: str, attribute: str) -> Dict[str, Any]:
+    return {
+        'package': f'com.example.{package}',
+        'interface': package.capitalize(),
+        'instanceId': 'main',
+        'version': 1,
+        'methods': {
+            'read': {'source': {'attribute': attribute}},
+            'subscribe': {'source': {'broadcast': f'{attribute}Changed'}},
+        },
+    }
+
+
+class SyntheticVSS:
+    '''
+    VSS like tree with its GraphQL schema and deploy files.
+
+    ``Vehicle`` has ``branches`` children, each one with ``leaves``
+    signals deployed using the kinds in ``deploy_mix`` (round robin by
+    weight). Each branch is kept in its own ``!include``-ed file and the
+    first ``list_branches`` ones are lists (like seats), with items
+    nesting ``list_depth`` levels of lists. List items have no constants
+    since the flat deploy model doesn't support them.
+    '''
+    __slots__ = (
+        'branches', 'leaves', 'list_branches', 'list_depth', 'list_items',
+        'kinds', 'list_kinds', 'types', 'leaf_count',
+    )
+    branches: int
+    leaves: int
+    list_branches: int
+    list_depth: int
+    list_items: int
+    kinds: List[str]
+    list_kinds: List[str]
+    types: Dict[str, str]
+    leaf_count: int
+
+    def __init__(
+        self,
+        branches: int,
+        leaves: int,
+        list_branches: int = 0,
+        list_depth: int = 1,
+        list_items: int = 2,
+        deploy_mix: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.branches = branches
+        self.leaves = leaves
+        self.list_branches = min(list_branches, branches)
+        self.list_depth = max(1, list_depth)
+        self.list_items = max(1, list_items)
+        if deploy_mix is None:
+            deploy_mix = parse_deploy_mix(DEFAULT_DEPLOY_MIX)
+        self.kinds = [
+            kind for kind, weight in deploy_mix.items()
+            for _ in range(weight)
+        ]
+        # the flat deploy model doesn't handle constants in list items
+        self.list_kinds = [k for k in self.kinds if k != 'constant'] \
+            or ['custom']
+        self.types = {}
+        self.leaf_count = 0
+
+    def _leaf(
+        self,
+        vss_path: str,
+        graphql_name: str,
+        package: str,
+        kind: str,
+    ) -> Tuple[str, Dict[str, Any]]:
+        self.leaf_count += 1
+        if kind == 'constant':
+            return f'  {graphql_name}: String', {
+                '_constants': f'C{self.leaf_count}',
+            }
+
+        field = f'  {graphql_name}: Float @range(min: 0, max: 100)'
+        if kind == 'franca':
+            return (
+                f'{field} @hasPermissions(permissions:'
+                f' ["{vss_path}_READ"])',
+                {'_francaIDL': _franca(package, graphql_name)},
+            )
+        if kind == 'custom':
+            return field, {'_custom': {
+                'origin': 'Http',
+                'sharedOrigin': True,
+                'sharedAttribute': True,
+                'methods': {
+                    'read': {'source': {'attribute': graphql_name}},
+                },
+            }}
+        return field, {'_dispatcher': {
+            'selector': f'{graphql_name}Selector',
+            'options': [{'_francaIDL': _franca(package, graphql_name)}],
+        }}
+
+    def _branch(
+        self,
+        type_name: str,
+        vss_path: str,
+        package: str,
+        offset: int,
+        depth: Optional[int],
+    ) -> Dict[str, Any]:
+        '''
+        Adds the GraphQL type of the branch and returns its deploy data.
+
+        ``depth`` is the number of list levels still to nest, the
+        branch is a list item if it's not ``None``.
+        '''
+        fields: List[str] = []
+        depl: Dict[str, Any] = {}
+        if depth is not None:
+            fields.append('  id: String')
+            depl['Id'] = {'_parentAttribute': None}
+        kinds = self.kinds if depth is None else self.list_kinds
+        for j in range(self.leaves):
+            # the kind depends on the position only, so list items match
+            kind = kinds[(offset + j) % len(kinds)]
+            field, depl[f'LeafN{j}'] = self._leaf(
+                f'{vss_path}.LeafN{j}', f'leafN{j}', package, kind)
+            fields.append(field)
+        if depth:
+            child = f'{type_name}_RowN{depth}'
+            fields.append(f'  rowN{depth}: [{child}]')
+            depl[f'RowN{depth}'] = [
+                self._branch(child, f'{vss_path}.RowN{depth}', package,
+                             offset + self.leaves, depth - 1)
+                for _ in range(self.list_items)
+            ]
+        # list items share the same GraphQL type
+        self.types.setdefault(
+            type_name,
+            f'type {type_name} {{\n' + '\n'.join(fields) + '\n}\n',
+        )
+        return depl
+
+    def write(self, directory: str) -> Tuple[str, str]:
+        '''
+        Writes the schema and deploy files, returns their paths.
+        '''
+        self.types = {}
+        self.leaf_count = 0
+        vehicle_fields: List[str] = []
+        root_depl = ['Vehicle:']
+        for i in range(self.branches):
+            name = f'BranchN{i}'
+            type_name = f'Vehicle_{name}'
+            package = f'branch{i}'
+            offset = i * self.leaves
+            if i < self.list_branches:
+                vehicle_fields.append(f'  branchN{i}: [{type_name}]')
+                depl: Any = [
+                    self._branch(type_name, f'Vehicle.{name}', package,
+                                 offset, self.list_depth - 1)
+                    for _ in range(self.list_items)
+                ]
+            else:
+                vehicle_fields.append(f'  branchN{i}: {type_name}')
+                depl = self._branch(type_name, f'Vehicle.{name}', package,
+                                    offset, None)
+            filename = f'branch{i}.depl'
+            root_depl.append(f'  {name}: !include {filename}')
+            with open(os.path.join(directory, filename), 'w') as f:
+                yaml.safe_dump(depl, f, sort_keys=False)
+
+        depl_path = os.path.join(directory, 'Vehicle.depl')
+        with open(depl_path, 'w') as f:
+            f.write('\n'.join(root_depl) + '\n')
+
+        schema_path = os.path.join(directory, 'schema.graphql')
+        with open(schema_path, 'w') as f:
+            f.write(DIRECTIVES)
+            f.write('\ntype Query {\n  vehicle: Vehicle\n}\n\n')
+            f.write('type Vehicle {\n' + '\n'.join(vehicle_fields) + '\n}\n')
+            f.write('\n'.join(self.types.values()))
+        return schema_path, depl_path
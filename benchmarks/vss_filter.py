@@ -0,0 +1,282 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Times ``filter_vss_tree`` and ``filter_vss_tree_compact`` on a full VSS
+tree, and measures the memory of the trees they build.
+
+The tree is either loaded from a ``.vspec`` file, ie: the VSS
+specification, or synthesized with the given fan out and depth. The
+deploy covers every node but the leaves left out by ``--coverage``.
+The former recursive filter, which computes the qualified name of every
+node from the root and looks it up twice, is timed as the reference. It
+fails on trees deeper than the recursion limit, ie: ``--fanout 1
+--depth 2000``.
+
+Usage::
+
+    python -m benchmarks.vss_filter [--vspec Vehicle.vspec] \\
+        [--fanout N] [--depth N] [--leaves N] [--coverage 0.9] \\
+        [--repeat N] [--json results.json]
+'''
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from vspec import VSSNode, load_tree
+from vspec.model.constants import VSSTreeType
+
+from vss_deploy.model.deploy import VehicleDeployMap
+from vss_deploy.model.directives import Directives
+from vss_deploy.model.vehicle_node import VehicleNode
+from vss_deploy.vssfilter import filter_vss_tree, filter_vss_tree_compact
+
+
+AVAILABLE_TYPES = {'branch', 'sensor', 'actuator', 'attribute'}
+
+
+def make_vss_tree(fanout: int, depth: int, leaves: int) -> VSSNode:
+    '''
+    Tree of ``fanout`` branches per level, ``depth`` levels deep, with
+    ``leaves`` sensors on each of the deepest branches.
+    '''
+    def branch(name: str, parent: Optional[VSSNode]) -> VSSNode:
+        return VSSNode(name, {
+            'type': 'branch',
+            'description': name,
+            '$file_name$': 'synthetic.vspec',
+        }, AVAILABLE_TYPES, parent=parent)
+
+    root = branch('Vehicle', None)
+    level = [root]
+    for d in range(depth):
+        level = [
+            branch(f'Branch{d}N{i}', parent)
+            for parent in level for i in range(fanout)
+        ]
+    for parent in level:
+        for i in range(leaves):
+            VSSNode(f'Leaf{i}', {
+                'type': 'sensor',
+                'datatype': 'float',
+                'description': 'leaf',
+                '$file_name$': 'synthetic.vspec',
+            }, AVAILABLE_TYPES, parent=parent)
+    return root
+
+
+def iter_nodes(root: Any) -> Iterator[Any]:
+    '''
+    Pre-order walk, anytree's iterators recurse.
+    '''
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(reversed(node.children))
+
+
+def make_deploy(root: VSSNode, coverage: float) -> Dict[str, Any]:
+    '''
+    Deploy data with every branch and the first ``coverage`` fraction of
+    the leaves of each branch.
+    '''
+    data: Dict[str, Any] = {}
+    nodes: Dict[int, Dict[str, Any]] = {id(root): data}
+    for node in iter_nodes(root):
+        if node.is_leaf:
+            continue
+        node_data = nodes[id(node)]
+        leaves = [c for c in node.children if c.is_leaf]
+        deployed = leaves[:max(1, round(len(leaves) * coverage))]
+        for child in node.children:
+            if not child.is_leaf:
+                nodes[id(child)] = node_data[child.name] = {}
+            elif child in deployed:
+                node_data[child.name] = {'franca': {'attribute': child.name}}
+    return {root.name: data}
+
+
+def recursive_filter(
+    vss_node: VSSNode,
+    deploy_map: VehicleDeployMap,
+) -> VehicleNode:
+    '''
+    The filter before it was made iterative, kept as the reference. The
+    directives are lazy now, only the permissions are still registered
+    while walking.
+    '''
+    Directives.register_permissions([vss_node])
+    deploy_entry: Any = deploy_map.get_entry(vss_node.qualified_name('_'))
+    if isinstance(deploy_entry, list):
+        deploy_entry = deploy_entry[0]
+
+    vehicle_node = VehicleNode(vss_node, deploy_entry=deploy_entry)
+    children: List[VehicleNode] = []
+    for child_vss_node in vss_node.children:
+        if deploy_map.contains(child_vss_node.qualified_name('_')):
+            child = recursive_filter(child_vss_node, deploy_map)
+            child.parent = vehicle_node  # type: ignore[misc]
+            if child_vss_node.is_leaf == child.is_leaf:
+                children.append(child)
+            else:
+                sys.stdout.write(
+                    'Deploy has extra node(s) at: '
+                    f'{child_vss_node.qualified_name("_")}\n'
+                )
+    vehicle_node.children = children  # type: ignore[misc]
+    return vehicle_node
+
+
+def measure_memory(
+    func: Callable[[VSSNode, VehicleDeployMap], Any],
+    root: VSSNode,
+    deploy_map: VehicleDeployMap,
+) -> int:
+    '''
+    Bytes allocated by the built tree and still in use.
+    '''
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        tree = func(root, deploy_map)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    del tree
+    return size
+
+
+def measure(
+    func: Callable[[VSSNode, VehicleDeployMap], Any],
+    root: VSSNode,
+    deploy_map: VehicleDeployMap,
+    repeat: int,
+) -> Tuple[float, int]:
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            tree = func(root, deploy_map)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        count = sum(1 for _ in iter_nodes(tree))
+    assert best is not None
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--vspec',
+        help='Load the VSS tree from this file instead of synthesizing it',
+        metavar='VehicleSignalSpecification.vspec',
+        type=str,
+    )
+    parser.add_argument(
+        '--include_dir',
+        help='Include directories of the vspec file',
+        action='append',
+        default=[],
+    )
+    parser.add_argument(
+        '--fanout',
+        help='Branches of each synthetic branch',
+        type=int,
+        default=6,
+    )
+    parser.add_argument(
+        '--depth',
+        help='Levels of synthetic branches',
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        '--leaves',
+        help='Leaves of each deepest synthetic branch',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '--coverage',
+        help='Fraction of the leaves of each branch in the deploy',
+        type=float,
+        default=0.9,
+    )
+    parser.add_argument(
+        '--repeat',
+        help='Runs of each filter, the best one is reported',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    if args.vspec:
+        root = load_tree(
+            args.vspec, args.include_dir, VSSTreeType.SIGNAL_TREE)
+    else:
+        root = make_vss_tree(args.fanout, args.depth, args.leaves)
+    deploy_map = VehicleDeployMap(make_deploy(root, args.coverage))
+    nodes = list(iter_nodes(root))
+    height = max(n.depth for n in nodes)
+    print(  # noqa: T001
+        f'{len(nodes)} VSS nodes, height {height},'
+        f' {sum(1 for _ in deploy_map)} deploy entries'
+    )
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, func in (
+        ('recursive', recursive_filter),
+        ('iterative', filter_vss_tree),
+        ('compact', filter_vss_tree_compact),
+    ):
+        try:
+            seconds, count = measure(func, root, deploy_map, args.repeat)
+            size = measure_memory(func, root, deploy_map)
+        except RecursionError:
+            print(f'{name:>10} hit the recursion limit')  # noqa: T001
+            continue
+        results[name] = {'seconds': seconds, 'nodes': count, 'bytes': size}
+
+    if len({r['nodes'] for r in results.values()}) > 1:
+        raise SystemExit('the filters kept different nodes')
+    baseline = results.get('recursive')
+    for name, result in results.items():
+        speedup = ''
+        if baseline:
+            speedup = f' {baseline["seconds"] / result["seconds"]:6.1f}x'
+        print(  # noqa: T001
+            f'{name:>10} {result["seconds"]:8.3f} s'
+            f' {result["nodes"]:7} nodes kept'
+            f' {result["bytes"] / 1024 / 1024:8.1f} MiB{speedup}'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
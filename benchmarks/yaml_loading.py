@@ -0,0 +1,150 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Compares the deploy parse time of the libyaml and pure-Python loaders.
+
+A synthetic VSS sized include tree is written once and parsed with each
+loader, the best of ``--repeat`` runs is reported. Both loaders must
+produce the same data.
+
+Usage::
+
+    python -m benchmarks.yaml_loading [--branches N] [--leaves N] \\
+        [--repeat N] [--jobs N] [--json results.json]
+'''
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple, Type
+
+from vss_deploy.model.deploy import load_depl
+from vss_deploy.model.yaml_loaders import LIBYAML
+
+import yaml
+
+from .synthetic import SyntheticVSS
+
+
+def get_loaders() -> List[Tuple[str, Type]]:
+    loaders: List[Tuple[str, Type]] = [('python', yaml.FullLoader)]
+    if LIBYAML:
+        loaders.append(('libyaml', yaml.CFullLoader))
+    return loaders
+
+
+def parse(
+    depl_path: str,
+    loader_class: Type,
+    jobs: int = 1,
+) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    with open(depl_path) as f:
+        data = load_depl(
+            f, os.path.dirname(depl_path), loader_class, jobs=jobs)
+    return time.perf_counter() - start, data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--branches',
+        help='Number of branches of Vehicle, each in its own include',
+        type=int,
+        default=200,
+    )
+    parser.add_argument(
+        '--leaves',
+        help='Number of leaves of each branch',
+        type=int,
+        default=50,
+    )
+    parser.add_argument(
+        '--repeat',
+        help='Parse runs of each loader, the best one is reported',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--jobs',
+        help='Also measure each loader parsing the includes using N'
+             ' processes, 0 uses all CPUs',
+        metavar='N',
+        type=int,
+    )
+    parser.add_argument(
+        '--json',
+        help='Write the results to this file',
+        metavar='results.json',
+        type=str,
+    )
+    args = parser.parse_args()
+
+    if not LIBYAML:
+        print(  # noqa: T001
+            'PyYAML was built without libyaml, only the pure-Python'
+            ' loader is measured',
+            file=sys.stderr,
+        )
+
+    synthetic = SyntheticVSS(
+        args.branches, args.leaves, list_branches=args.branches // 10)
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        _, depl_path = synthetic.write(directory)
+        size = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+            if name.endswith('.depl')
+        )
+        reference = None
+        loaders = get_loaders()
+        runs = [(name, loader_class, 1) for name, loader_class in loaders]
+        if args.jobs is not None:
+            jobs = args.jobs or os.cpu_count() or 1
+            runs.extend(
+                (f'{name} x{jobs}', loader_class, jobs)
+                for name, loader_class in loaders
+            )
+        for name, loader_class, jobs in runs:
+            best = None
+            for _ in range(args.repeat):
+                elapsed, data = parse(depl_path, loader_class, jobs)
+                best = elapsed if best is None else min(best, elapsed)
+            if reference is None:
+                reference = data
+            elif data != reference:
+                raise SystemExit(f'{name} parsed different data')
+            results[name] = {'seconds': best, 'bytes': size}
+
+    baseline = results['python']['seconds']
+    for name, result in results.items():
+        print(  # noqa: T001
+            f'{name:>12} {result["seconds"]:8.3f} s'
+            f' {result["bytes"] / result["seconds"] / 1024 / 1024:7.2f} MiB/s'
+            f' {baseline / result["seconds"]:6.1f}x'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -57,6 +57,8 @@ class Range(NamedTuple):
 
 
 class HasPermissions(List[str]):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         s = '@hasPermissions(permissions: ['
         s += ', '.join(json.dumps(p) for p in self)
@@ -14,34 +14,78 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
-import os.path
+import os
+import sys
+from typing import (
+    Iterable,
+    TYPE_CHECKING,
+)
 
-from .generators import generate
-from .types import GenerationParameters
-from ...types import VSSGraphQLSchema
+if TYPE_CHECKING:
+    from ...types import VSSGraphQLSchema
 
 
 def handle_command(
     args: argparse.Namespace,
-    vss_graphql: VSSGraphQLSchema,
-) -> None:
+    vss_graphql: 'VSSGraphQLSchema',
+) -> Iterable[str]:
+    # Jinja and the templates are only loaded when actually generating
+    from .bytecode_cache import get_bytecode_cache
+    from .generators import generate
+    from .templates import Templates
+    from .types import GenerationParameters
+
+    bytecode_cache = get_bytecode_cache(
+        args.template_cache, args.template_cache_max_size)
+    if bytecode_cache:
+        Templates.env.bytecode_cache = bytecode_cache
+
+    if args.separate:
+        # only the separate object sources include the permissions symbols
+        permissions_symbols_file = os.path.relpath(
+            args.permissions_symbols, args.separate)
+    else:
+        permissions_symbols_file = os.path.basename(args.permissions_symbols)
+
     params = GenerationParameters(
         vss_graphql=vss_graphql,
         graphql_namespace=args.graphql_namespace,
-        permissions_symbols_file=os.path.basename(
-            args.permissions_symbols.name),
+        permissions_symbols_file=permissions_symbols_file,
         header_open=args.header_open.read() if args.header_open else '',
         header_close=args.header_close.read() if args.header_close else '',
         source_open=args.source_open.read() if args.source_open else '',
         source_close=args.source_close.read() if args.source_close else '',
         visibility_attribute=args.visibility_attribute,
+        jobs=args.jobs or os.cpu_count() or 1,
     )
-    generate(
-        params,
-        args.main_source,
-        args.main_header,
-        args.permissions_symbols,
-    )
+    if not args.profile_templates:
+        return generate(
+            params,
+            args.main_source,
+            args.main_header,
+            args.permissions_symbols,
+            args.separate,
+        )
+
+    from .template_profiler import TemplateProfiler
+
+    profiler = TemplateProfiler()
+    profiler.install(Templates.env)
+    try:
+        # renders done by forked jobs would not be collected
+        return generate(
+            params._replace(jobs=1),
+            args.main_source,
+            args.main_header,
+            args.permissions_symbols,
+            args.separate,
+        )
+    finally:
+        profiler.uninstall()
+        print(  # noqa: T001
+            profiler.format_table(args.profile_templates),
+            file=sys.stderr,
+        )
 
 
 def add_arguments(subparsers: argparse._SubParsersAction) -> None:
@@ -93,24 +137,68 @@ def add_arguments(subparsers: argparse._SubParsersAction) -> None:
         type=str,
     )
 
-    # TODO: --separate
+    sp.add_argument(
+        '--jobs',
+        metavar='N',
+        help='Render the entries using N processes, 0 uses all CPUs.'
+             ' The output is the same as the sequential one.',
+        type=int,
+        default=1,
+    )
+
+    sp.add_argument(
+        '--template_cache',
+        metavar='directory',
+        help='Directory to persist the compiled templates across runs.'
+             ' Defaults to the GRAPHQL_SCHEMA2CPP_CODEGEN_TEMPLATE_CACHE'
+             ' environment variable, if set.',
+        type=str,
+    )
+    sp.add_argument(
+        '--template_cache_max_size',
+        metavar='bytes',
+        help='Least recently used templates are evicted from the cache'
+             ' once it gets bigger than this.',
+        type=int,
+        default=64 * 1024 * 1024,
+    )
+
+    sp.add_argument(
+        '--separate',
+        metavar='directory',
+        help='Generate each object type in its own source (.cpp) and'
+             ' header (.hpp) files inside the given directory. The main'
+             ' header only gets the declarations shared by them.',
+        type=str,
+    )
+
+    sp.add_argument(
+        '--profile_templates',
+        metavar='N',
+        help='Print to stderr the render count, time and output size of'
+             ' each template and macro, and of the N (default 20) most'
+             ' expensive entries. Forces a single job.',
+        nargs='?',
+        const=20,
+        type=int,
+    )
 
     sp.add_argument(
         'main_source',
         help='Main C++ source (.cpp) file to generate',
-        type=argparse.FileType('w'),
+        type=str,
     )
 
     sp.add_argument(
         'main_header',
         help='Main C++ header (.hpp) file to generate',
-        type=argparse.FileType('w'),
+        type=str,
     )
 
     sp.add_argument(
         'permissions_symbols',
         help='Generate C++ permissions symbols and knownPermissions getter',
-        type=argparse.FileType('w'),
+        type=str,
     )
 
     sp.set_defaults(generator=handle_command)
@@ -0,0 +1,104 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import os
+from typing import Optional
+
+import jinja2
+from jinja2 import Environment
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from .templates import environment_options
+from ...utils import evict_lru
+
+
+CACHE_DIR_ENV = 'GRAPHQL_SCHEMA2CPP_CODEGEN_TEMPLATE_CACHE'
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    '''
+    Persistent bytecode cache shared by many generator runs.
+
+    Entries are keyed by the template source checksum, so different
+    versions of a template (ie: local overrides) don't evict each other,
+    and by the Jinja version and environment options the bytecode
+    depends on.
+
+    The least recently used entries are evicted once the cache exceeds
+    ``max_size`` bytes.
+    '''
+    max_size: int
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory)
+        self.max_size = max_size
+        self.evict()
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: Optional[str],
+        source: str,
+    ) -> Bucket:
+        checksum = self.get_source_checksum(source)
+        key = self.get_cache_key(
+            f'{name}\0{checksum}\0{jinja2.__version__}\0'
+            f'{sorted(environment_options.items())}',
+            filename,
+        )
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            # mtime tracks the last use for the eviction
+            try:
+                os.utime(self._get_cache_filename(bucket))
+            except OSError:
+                pass
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        super().dump_bytecode(bucket)
+        self.evict()
+
+    def evict(self) -> None:
+        '''
+        Removes the least recently used entries until the cache fits
+        ``max_size``.
+        '''
+        evict_lru(self.directory, self.pattern % ('*',), self.max_size)
+
+
+def get_bytecode_cache(
+    directory: Optional[str],
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> Optional[TemplateBytecodeCache]:
+    '''
+    Returns the cache at the given directory or the one set by the
+    environment variable, if any.
+    '''
+    directory = directory or os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    return TemplateBytecodeCache(directory, max_size)
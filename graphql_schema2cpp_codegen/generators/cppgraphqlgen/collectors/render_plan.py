@@ -0,0 +1,147 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from jinja2 import Environment
+from jinja2.runtime import Macro
+
+from ....types import (
+    VSSGraphQLField,
+    VSSGraphQLInputObject,
+    VSSGraphQLObject,
+)
+
+
+ROOT_FIELD_TEMPLATES = {
+    'mutation': 'object_source_entry_mutation.cpp.jinja',
+    'subscription': 'object_source_entry_subscription.cpp.jinja',
+}
+DEFAULT_FIELD_TEMPLATE = 'object_source_entry_query.cpp.jinja'
+# Environment attribute caching the macros, so they live as long as the
+# environment that created them
+MACROS_ATTRIBUTE = 'render_plan_macros'
+
+
+def get_macro(env: Environment, template: str, name: str) -> Macro:
+    '''
+    Same macro a ``{% from template import name %}`` would give, the
+    template module is only created once per environment.
+    '''
+    macros: Optional[Dict[Tuple[str, str], Macro]] = getattr(
+        env, MACROS_ATTRIBUTE, None)
+    if macros is None:
+        macros = {}
+        env.extend(**{MACROS_ATTRIBUTE: macros})
+    try:
+        return macros[(template, name)]
+    except KeyError:
+        macro = getattr(env.get_template(template).module, name)
+        macros[(template, name)] = macro
+        return macro
+
+
+class FieldRenderPlan(NamedTuple):
+    '''
+    Macros resolved for a field, so the templates don't need to look up
+    and import them for every field.
+
+    ``render`` is the ``object_source_entry`` of the root kind, ``body``
+    (called with ``body_args``) the query field implementation and
+    ``arg_deploys`` the mutation deploy per ``(arg, arg_field)`` names.
+    '''
+    field: VSSGraphQLField
+    render: Macro
+    body: Optional[Macro]
+    body_args: Tuple[Any, ...]
+    arg_deploys: Dict[Tuple[str, str], Macro]
+
+
+class CollectRenderPlan:
+    env: Environment
+    result: List[FieldRenderPlan]
+
+    def __init__(self, env: Environment, entry: VSSGraphQLObject) -> None:
+        self.env = env
+        self.result = [
+            self._plan(entry, field) for field in entry.fields.values()
+        ]
+
+    def _query_body(
+        self,
+        entry: VSSGraphQLObject,
+        field: VSSGraphQLField,
+    ) -> Tuple[Optional[Macro], Tuple[Any, ...]]:
+        if field.deploy:
+            return get_macro(
+                self.env,
+                f'object_source_entry_query_deploy_{field.deploy.kind}'
+                '.cpp.jinja',
+                'object_source_entry_query_deploy',
+            ), (entry, field, field.deploy)
+        if field.is_list:
+            return get_macro(
+                self.env,
+                'object_source_entry_query_list.cpp.jinja',
+                'object_source_entry_query_list',
+            ), (entry, field)
+        if entry.is_list_item:
+            return get_macro(
+                self.env,
+                'object_source_entry_query_return_modifier.cpp.jinja',
+                'object_source_entry_query_return_modifier',
+            ), (field,)
+        return None, ()
+
+    def _arg_deploys(
+        self,
+        field: VSSGraphQLField,
+    ) -> Dict[Tuple[str, str], Macro]:
+        arg_deploys = {}
+        for arg in field.args.values():
+            if not isinstance(arg.unwrapped_type, VSSGraphQLInputObject):
+                continue
+            for arg_field in arg.unwrapped_type.fields.values():
+                if arg_field.deploy:
+                    arg_deploys[(arg.name, arg_field.name)] = get_macro(
+                        self.env,
+                        'object_source_entry_mutation_deploy_'
+                        f'{arg_field.deploy.kind}.cpp.jinja',
+                        'object_source_entry_mutation_deploy',
+                    )
+        return arg_deploys
+
+    def _plan(
+        self,
+        entry: VSSGraphQLObject,
+        field: VSSGraphQLField,
+    ) -> FieldRenderPlan:
+        template = ROOT_FIELD_TEMPLATES.get(
+            entry.is_root or '', DEFAULT_FIELD_TEMPLATE)
+        render = get_macro(self.env, template, 'object_source_entry')
+        if entry.is_root == 'mutation':
+            return FieldRenderPlan(
+                field, render, None, (), self._arg_deploys(field))
+        if entry.is_root == 'subscription':
+            return FieldRenderPlan(field, render, None, (), {})
+        body, body_args = self._query_body(entry, field)
+        return FieldRenderPlan(field, render, body, body_args, {})
@@ -0,0 +1,71 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Compiles the templates to Python modules loaded by ``jinja2.ModuleLoader``,
+so generator runs don't need to parse and compile them.
+'''
+
+import argparse
+import os
+import shutil
+
+from jinja2 import FileSystemLoader
+
+from .templates import (
+    compiled_templates_dir,
+    compiled_templates_stamp,
+    create_environment,
+    get_templates_digest,
+    templates_dir,
+)
+
+
+def compile_templates(
+    target: str = compiled_templates_dir,
+    source: str = templates_dir,
+) -> None:
+    env = create_environment(FileSystemLoader(source))
+
+    shutil.rmtree(target, ignore_errors=True)
+    env.compile_templates(
+        target,
+        extensions=('jinja',),
+        zip=None,
+        ignore_errors=False,
+    )
+
+    # written last: the modules are only used if the stamp matches
+    with open(os.path.join(target, compiled_templates_stamp), 'w') as f:
+        f.write(get_templates_digest(source))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Precompile the cppgraphqlgen templates',
+    )
+    parser.add_argument(
+        '--output',
+        help='Directory to write the compiled templates to',
+        metavar='directory',
+        type=str,
+        default=compiled_templates_dir,
+    )
+    args = parser.parse_args()
+    compile_templates(args.output)
+
+
+if __name__ == '__main__':
+    main()
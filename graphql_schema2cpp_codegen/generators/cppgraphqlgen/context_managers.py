@@ -13,7 +13,7 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-import os
+import io
 from typing import (
     Any,
     ClassVar,
@@ -22,26 +22,42 @@ from typing import (
     TextIO,
 )
 
-from jinja2 import Template
-
 from .templates import Templates
 from .types import GenerationParameters
+from ...utils import write_if_changed
+
+
+class OutputBuffer(io.StringIO):
+    '''
+    In-memory output that keeps the name of the file it will be saved to.
+    '''
+    name: str
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
 
 
 class BaseTemplateContext:
+    '''
+    Renders the file into memory and only replaces it on disk if the
+    contents changed, keeping the mtime of unchanged outputs.
+    '''
     __slots__ = ('file', 'params', 'variables')
-    file: TextIO
+    file: OutputBuffer
     params: MutableMapping[str, Any]
-    open_template: ClassVar[Optional[Template]] = None
-    close_template: ClassVar[Optional[Template]] = None
+    # Templates attribute names, resolved lazily
+    open_template: ClassVar[Optional[str]] = None
+    close_template: ClassVar[Optional[str]] = None
 
-    def __init__(self, file: TextIO, params: GenerationParameters) -> None:
-        self.file = file
+    def __init__(self, filename: str, params: GenerationParameters) -> None:
+        self.file = OutputBuffer(filename)
         self.variables = {'generator_params': params}
 
     def __enter__(self) -> TextIO:
         if self.open_template:
-            self.open_template.stream(self.variables).dump(self.file)
+            template = getattr(Templates, self.open_template)
+            template.stream(self.variables).dump(self.file)
         return self.file
 
     def __exit__(
@@ -51,24 +67,25 @@ class BaseTemplateContext:
         exc_traceback: Any,
     ) -> None:
         if exc_value:
-            try:
-                os.remove(self.file.name)
-            except OSError:
-                pass
-        elif self.close_template:
-            self.close_template.stream(self.variables).dump(self.file)
+            # the file on disk was not touched, keep its previous contents
+            self.file.close()
+            return
+        if self.close_template:
+            template = getattr(Templates, self.close_template)
+            template.stream(self.variables).dump(self.file)
+        write_if_changed(self.file.name, self.file.getvalue())
 
 
 class HeaderFile(BaseTemplateContext):
-    open_template = Templates.header_open
-    close_template = Templates.header_close
+    open_template = 'header_open'
+    close_template = 'header_close'
 
 
 class SourceFile(BaseTemplateContext):
-    open_template = Templates.source_open
-    close_template = Templates.source_close
+    open_template = 'source_open'
+    close_template = 'source_close'
 
 
 class PermissionsSymbolsFile(BaseTemplateContext):
-    open_template = Templates.permissions_symbols_open
-    close_template = Templates.permissions_symbols_close
+    open_template = 'permissions_symbols_open'
+    close_template = 'permissions_symbols_close'
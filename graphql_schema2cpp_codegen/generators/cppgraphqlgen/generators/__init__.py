@@ -13,12 +13,15 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import os
 from typing import (
+    List,
+    Optional,
     TextIO,
 )
 
 from .common import generate_section_common
-from .object import generate_section_object
+from .object import generate_section_object, generate_section_object_separate
 from .permissions import generate_permissions_symbols
 from ..context_managers import (
     HeaderFile,
@@ -26,6 +29,7 @@ from ..context_managers import (
     SourceFile,
 )
 from ..types import GenerationParameters
+from ....profiling import profile_stage
 from ....types import (
     VSSGraphQLIterationValue,
 )
@@ -48,14 +52,35 @@ def generate_section(
 
 def generate(
     params: GenerationParameters,
-    main_source: TextIO,
-    main_header: TextIO,
-    permissions_symbols: TextIO,
-) -> None:
+    main_source: str,
+    main_header: str,
+    permissions_symbols: str,
+    separate_dir: Optional[str] = None,
+) -> List[str]:
+    '''
+    Generates all the files and returns their names.
+
+    If ``separate_dir`` is given, each object type is generated in its
+    own source and header files inside that directory, ``main_header``
+    gets the declarations they share.
+    '''
+    outputs = [main_source, main_header, permissions_symbols]
+    if separate_dir:
+        os.makedirs(separate_dir, exist_ok=True)
+
     with HeaderFile(main_header, params) as header:
         with SourceFile(main_source, params) as source:
             for section in params.vss_graphql:
-                generate_section(params, source, header, section)
+                with profile_stage(f'section {section[0]}'):
+                    if separate_dir and section[0] == 'object':
+                        outputs.extend(generate_section_object_separate(
+                            params, header, section[1], separate_dir,
+                        ))
+                    else:
+                        generate_section(params, source, header, section)
+
+    with profile_stage('permissions_symbols'):
+        with PermissionsSymbolsFile(permissions_symbols, params) as perms:
+            generate_permissions_symbols(params, perms)
 
-    with PermissionsSymbolsFile(permissions_symbols, params) as perms:
-        generate_permissions_symbols(params, perms)
+    return outputs
@@ -20,11 +20,13 @@ from typing import (
     Iterable,
     Mapping,
     TextIO,
+    Tuple,
     TypeVar,
 )
 
 import jinja2
 
+from .parallel import parallel_map
 from ..templates import Templates
 from ..types import GenerationParameters
 from ....types import VSSGraphQLIterationValue
@@ -79,20 +81,50 @@ class CommonGeneratorSingle(Generic[TEntry]):
             variables.update(extra_vars)
         self.entry_template.stream(variables).dump(self.output)
 
+    def render_entry(
+        self,
+        entry: TEntry,
+        extra_vars: Mapping[str, Any] = {},
+    ) -> str:
+        variables = {'generator_params': self.params, 'entry': entry}
+        if extra_vars:
+            variables.update(extra_vars)
+        return self.entry_template.render(variables)
+
+    def emit_section(
+        self,
+        extra_vars: Mapping[str, Any] = {},
+        open_close: bool = True,
+    ) -> None:
+        '''
+        Renders the open template, all entries and the close template in
+        a single template invocation, instead of one per entry.
+        '''
+        variables = {
+            'generator_params': self.params,
+            'section_entries': self.entries,
+            'section_entry_template': self.entry_template,
+            'section_open_template': None,
+            'section_close_template': None,
+        }
+        if open_close:
+            variables['section_open_template'] = self.open_template
+            variables['section_close_template'] = self.close_template
+        if extra_vars:
+            variables.update(extra_vars)
+        self.output.write(Templates.section.render(variables))
+
     def emit_all_entries(self, extra_vars: Mapping[str, Any] = {}) -> None:
-        for entry in self.entries:
-            self.emit_entry(entry, extra_vars)
+        self.emit_section(extra_vars, open_close=False)
 
     def emit_all(self, extra_vars: Mapping[str, Any] = {}) -> None:
-        self.emit_open(extra_vars)
-        self.emit_all_entries(extra_vars)
-        self.emit_close(extra_vars)
+        self.emit_section(extra_vars)
 
 
 class CommonGeneratorUmbrella(Generic[TEntry]):
     params: GenerationParameters
     name: str
-    entries: Iterable[TEntry]
+    entries: Tuple[TEntry, ...]
     generators: Mapping[str, CommonGeneratorSingle[TEntry]]
 
     def __init__(
@@ -131,9 +163,32 @@ class CommonGeneratorUmbrella(Generic[TEntry]):
         for gen in self.generators.values():
             gen.emit_entry(entry, extra_vars)
 
+    def render_entry(
+        self,
+        entry: TEntry,
+        extra_vars: Mapping[str, Any] = {},
+    ) -> Tuple[str, ...]:
+        return tuple(
+            gen.render_entry(entry, extra_vars)
+            for gen in self.generators.values()
+        )
+
     def emit_all_entries(self, extra_vars: Mapping[str, Any] = {}) -> None:
-        for entry in self.entries:
-            self.emit_entry(entry, extra_vars)
+        if self.params.jobs <= 1:
+            for gen in self.generators.values():
+                gen.emit_all_entries(extra_vars)
+            return
+
+        # render in worker processes, then write in the original order
+        fragments = parallel_map(
+            self.params.jobs,
+            lambda i: self.render_entry(self.entries[i], extra_vars),
+            len(self.entries),
+        )
+        for entry_fragments in fragments:
+            for gen, fragment in zip(self.generators.values(),
+                                     entry_fragments):
+                gen.output.write(fragment)
 
     def emit_all(self, extra_vars: Mapping[str, Any] = {}) -> None:
         self.emit_open(extra_vars)
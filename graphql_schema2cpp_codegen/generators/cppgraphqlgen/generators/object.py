@@ -13,21 +13,29 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-import os.path
+import os
 from typing import (
     Any,
     Iterable,
     List,
     Mapping,
     TextIO,
+    Tuple,
 )
 
 from .common import CommonGeneratorSingle, CommonGeneratorUmbrella
+from .parallel import parallel_map
 from ..collectors.implementation import CollectImplementation
+from ..context_managers import HeaderFile, SourceFile
 from ..types import GenerationParameters
 from ....types import (
     VSSGraphQLObject,
 )
+from ....utils import atomic_write
+
+
+# lists the files generated in the separate directory by the last run
+SEPARATE_FILES_LIST = '.generated_files'
 
 
 class ForwardClassDeclarationsGenerator(CommonGeneratorSingle):
@@ -70,6 +78,44 @@ class SourceIncludeGenerator(CommonGeneratorSingle):
         super().__init__(params, output, 'object_source_include', entries)
 
 
+class HeaderIncludeGenerator(CommonGeneratorSingle):
+    def __init__(
+        self,
+        params: GenerationParameters,
+        output: TextIO,
+        entries: Iterable[str],
+    ) -> None:
+        super().__init__(params, output, 'object_header_include', entries)
+
+
+class ObjectTypesHeaderGenerator(CommonGeneratorSingle):
+    '''
+    Declarations shared by all object types when each one of them is
+    generated in its own source and header files.
+    '''
+    def __init__(
+        self,
+        params: GenerationParameters,
+        output: TextIO,
+        entries: Iterable[VSSGraphQLObject],
+    ) -> None:
+        super().__init__(params, output, 'object_header', tuple(entries))
+
+    def emit_all(self, extra_vars: Mapping[str, Any] = {}) -> None:
+        ForwardImplementationDeclarationsGenerator(
+            self.params,
+            self.output,
+            self.entries,
+        ).emit_all(extra_vars)
+        self.emit_open(extra_vars)
+        ForwardClassDeclarationsGenerator(
+            self.params,
+            self.output,
+            self.entries,
+        ).emit_all(extra_vars)
+        self.emit_close(extra_vars)
+
+
 class ObjectGenerator(CommonGeneratorUmbrella):
     source: TextIO
     header: TextIO
@@ -118,7 +164,7 @@ class ObjectGenerator(CommonGeneratorUmbrella):
         self,
         extra_vars: Mapping[str, Any] = {}
     ) -> None:
-        headers = self.get_implementation_headers()
+        headers = self.get_source_includes()
         if headers:
             SourceIncludeGenerator(
                 self.params,
@@ -126,6 +172,9 @@ class ObjectGenerator(CommonGeneratorUmbrella):
                 headers,
             ).emit_all(extra_vars)
 
+    def get_source_includes(self) -> List[str]:
+        return self.get_implementation_headers()
+
     def get_implementation_headers(self) -> List[str]:
         headers: List[str] = []
 
@@ -136,6 +185,56 @@ class ObjectGenerator(CommonGeneratorUmbrella):
         return sorted(headers)
 
 
+class SeparateObjectGenerator(ObjectGenerator):
+    '''
+    Generates a single object type in its own source and header files.
+
+    The header includes the shared types header, the source includes
+    only the implementation headers used by this type and the headers
+    of the object types it returns.
+    '''
+    types_header: str
+
+    def __init__(
+        self,
+        params: GenerationParameters,
+        source: TextIO,
+        header: TextIO,
+        entry: VSSGraphQLObject,
+        types_header: str,
+    ) -> None:
+        super().__init__(params, source, header, (entry,))
+        self.types_header = types_header
+
+    def emit_open(self, extra_vars: Mapping[str, Any] = {}) -> None:
+        variables = {
+            **extra_vars,
+            'header_file': os.path.basename(self.header.name),
+        }
+
+        HeaderIncludeGenerator(
+            self.params,
+            self.header,
+            (self.types_header,),
+        ).emit_all(extra_vars)
+
+        self.emit_source_includes(variables)
+
+        super(ObjectGenerator, self).emit_open(variables)
+
+    def get_source_includes(self) -> List[str]:
+        return self.get_implementation_headers() + self.get_object_headers()
+
+    def get_object_headers(self) -> List[str]:
+        names = set()
+        for entry in self.entries:
+            for field in entry.fields.values():
+                t = field.unwrapped_type
+                if isinstance(t, VSSGraphQLObject) and t is not entry:
+                    names.add(t.name)
+        return sorted(f'{name}.hpp' for name in names)
+
+
 def generate_section_object(
     params: GenerationParameters,
     source: TextIO,
@@ -148,3 +247,72 @@ def generate_section_object(
         header,
         entries.values(),
     ).emit_all()
+
+
+def generate_section_object_separate(
+    params: GenerationParameters,
+    header: TextIO,
+    entries: Mapping[str, VSSGraphQLObject],
+    directory: str,
+) -> List[str]:
+    '''
+    Generates the object types declarations shared by all of them to
+    ``header`` and one source and header pair per object type inside
+    ``directory``.
+
+    Returns the generated file names.
+    '''
+    ObjectTypesHeaderGenerator(params, header, entries.values()).emit_all()
+
+    types_header = os.path.relpath(header.name, directory)
+    objects = tuple(entries.values())
+
+    def generate_entry(index: int) -> Tuple[str, str]:
+        entry = objects[index]
+        header_name = os.path.join(directory, f'{entry.name}.hpp')
+        source_name = os.path.join(directory, f'{entry.name}.cpp')
+        with HeaderFile(header_name, params) as entry_header:
+            with SourceFile(source_name, params) as entry_source:
+                SeparateObjectGenerator(
+                    params,
+                    entry_source,
+                    entry_header,
+                    entry,
+                    types_header,
+                ).emit_all()
+        return source_name, header_name
+
+    outputs: List[str] = []
+    for names in parallel_map(params.jobs, generate_entry, len(objects)):
+        outputs.extend(names)
+    remove_stale_files(directory, outputs)
+    return outputs
+
+
+def remove_stale_files(directory: str, outputs: Iterable[str]) -> None:
+    '''
+    Removes the files generated in ``directory`` by the previous run that
+    were not generated again, ie: of object types removed from the
+    schema, then records ``outputs`` for the next run.
+
+    Only the recorded files are removed, others in ``directory`` are
+    never touched.
+    '''
+    list_file = os.path.join(directory, SEPARATE_FILES_LIST)
+    names = sorted(os.path.basename(path) for path in outputs)
+    try:
+        with open(list_file, encoding='utf-8') as f:
+            previous = f.read().splitlines()
+    except OSError:
+        previous = []
+
+    current = set(names)
+    for name in previous:
+        if name and name not in current and name == os.path.basename(name):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    if previous != names:
+        atomic_write(list_file, ''.join(f'{name}\n' for name in names))
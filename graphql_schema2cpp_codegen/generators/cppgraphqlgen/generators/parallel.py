@@ -0,0 +1,67 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import multiprocessing
+from typing import (
+    Callable,
+    List,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from ....utils import can_fork
+
+
+T = TypeVar('T')
+
+# Set before the pool is forked, so workers inherit the function (and the
+# whole schema it references) instead of pickling it for every task.
+_worker_func: Optional[Callable[[int], object]] = None
+
+
+def _call_worker_func(index: int) -> object:
+    assert _worker_func is not None
+    return _worker_func(index)
+
+
+def parallel_map(
+    jobs: int,
+    func: Callable[[int], T],
+    count: int,
+) -> List[T]:
+    '''
+    Returns ``[func(0), ..., func(count - 1)]`` computed by ``jobs``
+    forked processes, in order.
+
+    ``func`` is not pickled, only its results are, so it may reference
+    any state of the parent process. If the platform can't fork or there
+    is nothing to parallelize, it runs sequentially.
+    '''
+    global _worker_func
+
+    if jobs <= 1 or count <= 1 or not can_fork():
+        return [func(i) for i in range(count)]
+
+    jobs = min(jobs, count)
+    chunksize = max(1, count // (jobs * 4))
+    _worker_func = func
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(jobs) as pool:
+            results = pool.map(_call_worker_func, range(count), chunksize)
+            return cast(List[T], results)
+    finally:
+        _worker_func = None
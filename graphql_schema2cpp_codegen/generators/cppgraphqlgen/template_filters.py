@@ -13,6 +13,8 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+from typing import List
+
 from graphql.type.scalars import (
     GraphQLBoolean,
     GraphQLFloat,
@@ -21,11 +23,14 @@ from graphql.type.scalars import (
     GraphQLString,
 )
 
+from jinja2 import Environment, pass_environment
+
 
 from vss_deploy.model.deploy.types.deploy_custom import DeployCustom
 from vss_deploy.model.franca_idl.deploy_franca_idl import DeployFrancaIDL
 
 
+from .collectors.render_plan import CollectRenderPlan, FieldRenderPlan
 from ...types import (
     VSSGraphQLList,
     VSSGraphQLNonNull,
@@ -141,6 +146,14 @@ def indent_spaces(s: str, width: int = 1, blank: bool = False) -> str:
     return res[:-1]
 
 
+@pass_environment
+def field_render_plan(
+    env: Environment,
+    entry: VSSGraphQLObject,
+) -> List[FieldRenderPlan]:
+    return CollectRenderPlan(env, entry).result
+
+
 all_filters = {
     'cpp_type': cpp_type,
     'franca_idl_attribute': franca_idl_attribute,
@@ -148,4 +161,5 @@ all_filters = {
     'indent_spaces': indent_spaces,
     'upper_first_letter': upper_first_letter,
     'custom_singleton': custom_singleton,
+    'field_render_plan': field_render_plan,
 }
@@ -0,0 +1,222 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Attributes the rendering cost to templates, macros and entries.
+'''
+
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from jinja2 import Environment, Template
+from jinja2.runtime import Context, Macro
+
+
+class RenderStats:
+    '''
+    Render count, time and output size of a template, macro or entry.
+
+    ``total`` includes the nested renders, ``own`` excludes the nested
+    templates and macros. Entries have no ``own`` time.
+    '''
+    __slots__ = ('count', 'total', 'own', 'size')
+    count: int
+    total: float
+    own: Optional[float]
+    size: int
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.own = None
+        self.size = 0
+
+    def add(self, total: float, own: Optional[float], size: int) -> None:
+        self.count += 1
+        self.total += total
+        if own is not None:
+            self.own = (self.own or 0.0) + own
+        self.size += size
+
+
+def get_entry_key(entry: Any) -> Tuple[str, str]:
+    return type(entry).__name__, getattr(entry, 'name', repr(entry))
+
+
+class TemplateProfiler:
+    '''
+    Instruments the environment rendering.
+
+    Every template render and macro invocation is timed, nested ones
+    included. Sections render each entry with the ``entry`` variable
+    set, the time spent in each one is also attributed to it.
+
+    Macros are instrumented for every environment while installed and
+    renders done by forked processes are not collected, use a single
+    job when profiling.
+    '''
+    __slots__ = (
+        'templates', 'macros', 'entries', '_env', '_get_template',
+        '_invoke', '_wrapped', '_children', '_entries_stack',
+    )
+    templates: Dict[str, RenderStats]
+    macros: Dict[str, RenderStats]
+    entries: Dict[Tuple[str, str], RenderStats]
+    _env: Optional[Environment]
+    _get_template: Optional[Callable[..., Template]]
+    _invoke: Optional[Callable[..., str]]
+    _wrapped: Dict[int, Tuple[Template, Callable[[Context], Iterator[str]]]]
+    _children: List[float]
+    _entries_stack: List[Any]
+
+    def __init__(self) -> None:
+        self.templates = {}
+        self.macros = {}
+        self.entries = {}
+        self._env = None
+        self._get_template = None
+        self._invoke = None
+        self._wrapped = {}
+        self._children = [0.0]
+        self._entries_stack = []
+
+    def _record(
+        self,
+        stats: RenderStats,
+        start: float,
+        size: int,
+    ) -> float:
+        elapsed = time.perf_counter() - start
+        children = self._children.pop()
+        self._children[-1] += elapsed
+        stats.add(elapsed, elapsed - children, size)
+        return elapsed
+
+    def _wrap_template(self, template: Template) -> None:
+        if id(template) in self._wrapped:
+            return
+        root_render_func = template.root_render_func
+        self._wrapped[id(template)] = (template, root_render_func)
+        stats = self.templates.setdefault(
+            template.name or repr(template), RenderStats())
+
+        def render(context: Context) -> Iterator[str]:
+            entry = context.get('entry')
+            if self._entries_stack and self._entries_stack[-1] is entry:
+                entry = None  # nested template of the same entry
+            if entry is not None:
+                self._entries_stack.append(entry)
+            start = time.perf_counter()
+            self._children.append(0.0)
+            size = 0
+            try:
+                for chunk in root_render_func(context):
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                elapsed = self._record(stats, start, size)
+                if entry is not None:
+                    self._entries_stack.pop()
+                    self.entries.setdefault(
+                        get_entry_key(entry), RenderStats(),
+                    ).add(elapsed, None, size)
+
+        template.root_render_func = render  # type: ignore
+
+    def install(self, env: Environment) -> None:
+        get_template = env.get_template
+        invoke = Macro._invoke
+        profiler = self
+
+        def instrumented_get_template(*args: Any, **kwargs: Any) -> Template:
+            template = get_template(*args, **kwargs)
+            profiler._wrap_template(template)
+            return template
+
+        def instrumented_invoke(
+            macro: Macro,
+            arguments: List[Any],
+            autoescape: bool,
+        ) -> str:
+            template = macro._func.__globals__.get('name')
+            stats = profiler.macros.setdefault(
+                f'{template}:{macro.name}', RenderStats())
+            start = time.perf_counter()
+            profiler._children.append(0.0)
+            rv = ''
+            try:
+                rv = invoke(macro, arguments, autoescape)
+            finally:
+                profiler._record(stats, start, len(rv))
+            return rv
+
+        self._env = env
+        self._get_template = get_template
+        self._invoke = invoke
+        # the generated code loads the included templates with
+        # environment.get_template(), the instance attribute wins
+        env.get_template = instrumented_get_template  # type: ignore
+        Macro._invoke = instrumented_invoke  # type: ignore
+
+    def uninstall(self) -> None:
+        if self._env is None:
+            return
+        del self._env.get_template
+        Macro._invoke = self._invoke  # type: ignore
+        for template, root_render_func in self._wrapped.values():
+            template.root_render_func = root_render_func  # type: ignore
+        self._wrapped.clear()
+        self._env = None
+
+    def format_table(self, top: int) -> str:
+        def rows(
+            title: str,
+            stats: Dict[Any, RenderStats],
+            limit: Optional[int] = None,
+        ) -> List[str]:
+            items = [
+                (' '.join(k) if isinstance(k, tuple) else k, s)
+                for k, s in sorted(
+                    stats.items(), key=lambda i: i[1].total, reverse=True,
+                )[:limit]
+            ]
+            width = max([len(title)] + [len(k) for k, _ in items])
+            lines = [
+                f'{title:<{width}} {"count":>7} {"total s":>9}'
+                f' {"own s":>9} {"chars":>10}'
+            ]
+            for name, s in items:
+                own = f'{s.own:9.3f}' if s.own is not None else ''
+                lines.append(
+                    f'{name:<{width}} {s.count:7} {s.total:9.3f} {own:>9}'
+                    f' {s.size:10}'
+                )
+            return lines
+
+        return '\n'.join(
+            rows('template', self.templates)
+            + ['']
+            + rows('macro', self.macros)
+            + ['']
+            + rows(f'top {top} entries', self.entries, top)
+        )
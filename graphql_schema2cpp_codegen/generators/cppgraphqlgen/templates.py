@@ -13,81 +13,242 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import hashlib
+import importlib.resources
 import os
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+)
 
-from jinja2 import ChoiceLoader, Environment, FileSystemLoader, FunctionLoader
-
-from pkg_resources import resource_stream
+import jinja2
+from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
+    Environment,
+    ModuleLoader,
+    Template,
+    TemplateNotFound,
+)
 
 from .template_filters import all_filters
 from .template_tests import all_tests
 
+if TYPE_CHECKING:
+    from importlib.abc import Traversable
+
 templates_dir = os.path.join(os.path.dirname(__file__), 'templates')
+compiled_templates_dir = os.path.join(
+    os.path.dirname(__file__), 'templates_compiled')
+compiled_templates_stamp = 'stamp'
 
+environment_options: Dict[str, Any] = {
+    'trim_blocks': True,
+    'lstrip_blocks': True,
+    'keep_trailing_newline': True,
+}
 
-def load_template(
-    name: str,
-    module: str = 'graphql_schema2cpp_codegen.generators.cppgraphqlgen'
-) -> str:
-    with resource_stream(module, os.path.join('templates', name)) as file:
-        return file.read().decode('utf-8')
 
+class PackageResourceLoader(BaseLoader):
+    '''
+    Loads the templates from the package resources, keeping their sources
+    in memory since they don't change while generating.
 
-loader = ChoiceLoader([
-    FunctionLoader(load_template),
-    FileSystemLoader(templates_dir),
-])
+    Unlike ``pkg_resources``, ``importlib.resources`` doesn't need to scan
+    every installed distribution when imported.
+    '''
+    package: str
+    directory: str
+    sources: Dict[str, Tuple[str, Optional[str]]]
 
+    def __init__(
+        self,
+        package: str = 'graphql_schema2cpp_codegen.generators.cppgraphqlgen',
+        directory: str = 'templates',
+    ) -> None:
+        self.package = package
+        self.directory = directory
+        self.sources = {}
 
-class Templates:
+    def _get_directory(self) -> 'Traversable':
+        return importlib.resources.files(self.package) / self.directory
+
+    def _read(self, template: str) -> Tuple[str, Optional[str]]:
+        if not hasattr(importlib.resources, 'files'):  # Python 3.8
+            filename = os.path.join(templates_dir, template)
+            with open(filename, encoding='utf-8') as f:
+                return f.read(), filename
+        resource = self._get_directory() / template
+        source = resource.read_text(encoding='utf-8')
+        if isinstance(resource, os.PathLike):
+            return source, os.fspath(resource)
+        return source, None
+
+    def get_source(
+        self,
+        environment: Environment,
+        template: str,
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        try:
+            source, filename = self.sources[template]
+        except KeyError:
+            try:
+                source, filename = self._read(template)
+            except OSError as e:
+                raise TemplateNotFound(template) from e
+            self.sources[template] = (source, filename)
+        return source, filename, lambda: True
+
+    def list_templates(self) -> List[str]:
+        if not hasattr(importlib.resources, 'files'):  # Python 3.8
+            names = os.listdir(templates_dir)
+        else:
+            names = [
+                resource.name
+                for resource in self._get_directory().iterdir()
+                if resource.is_file()
+            ]
+        return sorted(name for name in names if name.endswith('.jinja'))
+
+
+def get_filter_sources() -> List[str]:
+    '''
+    Returns the sources of the modules defining the filters and tests.
+    The compiled templates depend on them: the filter signatures (ie:
+    ``pass_environment``) are resolved when compiling.
+    '''
+    modules = {
+        f.__module__ for f in (*all_filters.values(), *all_tests.values())
+    }
+    return sorted(
+        path for path in (
+            getattr(sys.modules.get(m), '__file__', None) for m in modules
+        )
+        if path
+    )
+
+
+def get_templates_digest(directory: str = templates_dir) -> str:
+    '''
+    Hash of everything the precompiled templates depend on: the template
+    sources, the filters and tests, the Jinja version and the environment
+    options.
+    '''
+    digest = hashlib.sha256(
+        f'{jinja2.__version__} {sorted(environment_options.items())}'
+        .encode('utf-8')
+    )
+    paths = [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith('.jinja')
+    ]
+    paths.extend(get_filter_sources())
+    for path in paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        digest.update(b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def has_compiled_templates(directory: str = compiled_templates_dir) -> bool:
+    '''
+    Whether the precompiled templates exist and match the sources.
+    '''
+    try:
+        with open(os.path.join(directory, compiled_templates_stamp)) as f:
+            return f.read().strip() == get_templates_digest()
+    except OSError:
+        return False
+
+
+def get_loader() -> BaseLoader:
+    loader = PackageResourceLoader()
+    if has_compiled_templates():
+        # prefer the precompiled modules: no parsing nor compiling
+        return ChoiceLoader([ModuleLoader(compiled_templates_dir), loader])
+    return loader
+
+
+def create_environment(loader: Optional[BaseLoader] = None) -> Environment:
     env = Environment(
-        loader=loader,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        keep_trailing_newline=True,
+        loader=loader or get_loader(),
+        **environment_options,
     )
     env.filters.update(all_filters)
     env.tests.update(all_tests)
+    return env
+
+
+class TemplateAttribute:
+    '''
+    Loads the template on first access instead of at import time.
+    '''
+    __slots__ = ('name',)
+    name: str
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Type['Templates']) -> Template:
+        return owner.env.get_template(self.name)
+
+
+class Templates:
+    env = create_environment()
 
     # keep sorted! -- do not break lines, it's easier to sort
-    enum_header_close = env.get_template('enum_header_close.hpp.jinja')
-    enum_header_entry = env.get_template('enum_header_entry.hpp.jinja')
-    enum_header_open = env.get_template('enum_header_open.hpp.jinja')
-    enum_source_close = env.get_template('enum_source_close.cpp.jinja')
-    enum_source_entry = env.get_template('enum_source_entry.cpp.jinja')
-    enum_source_open = env.get_template('enum_source_open.cpp.jinja')
-    header_close = env.get_template('header_close.hpp.jinja')
-    header_open = env.get_template('header_open.hpp.jinja')
-    input_header_close = env.get_template('input_header_close.hpp.jinja')
-    input_header_entry = env.get_template('input_header_entry.hpp.jinja')
-    input_header_open = env.get_template('input_header_open.hpp.jinja')
-    input_source_close = env.get_template('input_source_close.cpp.jinja')
-    input_source_entry = env.get_template('input_source_entry.cpp.jinja')
-    input_source_open = env.get_template('input_source_open.cpp.jinja')
-    object_fwd_class_close = env.get_template('object_fwd_class_close.hpp.jinja')  # noqa: E501
-    object_fwd_class_entry = env.get_template('object_fwd_class_entry.hpp.jinja')  # noqa: E501
-    object_fwd_class_open = env.get_template('object_fwd_class_open.hpp.jinja')
-    object_fwd_implementation_close = env.get_template('object_fwd_implementation_close.hpp.jinja')  # noqa: E501
-    object_fwd_implementation_entry = env.get_template('object_fwd_implementation_entry.hpp.jinja')  # noqa: E501
-    object_fwd_implementation_open = env.get_template('object_fwd_implementation_open.hpp.jinja')  # noqa: E501
-    object_header_close = env.get_template('object_header_close.hpp.jinja')
-    object_header_entry = env.get_template('object_header_entry.hpp.jinja')
-    object_header_open = env.get_template('object_header_open.hpp.jinja')
-    object_source_close = env.get_template('object_source_close.cpp.jinja')
-    object_source_entry = env.get_template('object_source_entry.cpp.jinja')
-    object_source_include_close = env.get_template('object_source_include_close.cpp.jinja')  # noqa: E501
-    object_source_include_entry = env.get_template('object_source_include_entry.cpp.jinja')  # noqa: E501
-    object_source_include_open = env.get_template('object_source_include_open.cpp.jinja')  # noqa: E501
-    object_source_open = env.get_template('object_source_open.cpp.jinja')
-    permissions_symbols_close = env.get_template('permissions_symbols_close.hpp.jinja')  # noqa: E501
-    permissions_symbols_entry = env.get_template('permissions_symbols_entry.hpp.jinja')  # noqa: E501
-    permissions_symbols_known_symbols = env.get_template('permissions_symbols_known_symbols.hpp.jinja')  # noqa: E501
-    permissions_symbols_open = env.get_template('permissions_symbols_open.hpp.jinja')  # noqa: E501
-    scalar_header_close = env.get_template('scalar_header_close.hpp.jinja')
-    scalar_header_entry = env.get_template('scalar_header_entry.hpp.jinja')
-    scalar_header_open = env.get_template('scalar_header_open.hpp.jinja')
-    scalar_source_close = env.get_template('scalar_source_close.cpp.jinja')
-    scalar_source_entry = env.get_template('scalar_source_entry.cpp.jinja')
-    scalar_source_open = env.get_template('scalar_source_open.cpp.jinja')
-    source_close = env.get_template('source_close.cpp.jinja')
-    source_open = env.get_template('source_open.cpp.jinja')
+    enum_header_close = TemplateAttribute('enum_header_close.hpp.jinja')
+    enum_header_entry = TemplateAttribute('enum_header_entry.hpp.jinja')
+    enum_header_open = TemplateAttribute('enum_header_open.hpp.jinja')
+    enum_source_close = TemplateAttribute('enum_source_close.cpp.jinja')
+    enum_source_entry = TemplateAttribute('enum_source_entry.cpp.jinja')
+    enum_source_open = TemplateAttribute('enum_source_open.cpp.jinja')
+    header_close = TemplateAttribute('header_close.hpp.jinja')
+    header_open = TemplateAttribute('header_open.hpp.jinja')
+    input_header_close = TemplateAttribute('input_header_close.hpp.jinja')
+    input_header_entry = TemplateAttribute('input_header_entry.hpp.jinja')
+    input_header_open = TemplateAttribute('input_header_open.hpp.jinja')
+    input_source_close = TemplateAttribute('input_source_close.cpp.jinja')
+    input_source_entry = TemplateAttribute('input_source_entry.cpp.jinja')
+    input_source_open = TemplateAttribute('input_source_open.cpp.jinja')
+    object_fwd_class_close = TemplateAttribute('object_fwd_class_close.hpp.jinja')  # noqa: E501
+    object_fwd_class_entry = TemplateAttribute('object_fwd_class_entry.hpp.jinja')  # noqa: E501
+    object_fwd_class_open = TemplateAttribute('object_fwd_class_open.hpp.jinja')  # noqa: E501
+    object_fwd_implementation_close = TemplateAttribute('object_fwd_implementation_close.hpp.jinja')  # noqa: E501
+    object_fwd_implementation_entry = TemplateAttribute('object_fwd_implementation_entry.hpp.jinja')  # noqa: E501
+    object_fwd_implementation_open = TemplateAttribute('object_fwd_implementation_open.hpp.jinja')  # noqa: E501
+    object_header_close = TemplateAttribute('object_header_close.hpp.jinja')
+    object_header_entry = TemplateAttribute('object_header_entry.hpp.jinja')
+    object_header_include_close = TemplateAttribute('object_header_include_close.hpp.jinja')  # noqa: E501
+    object_header_include_entry = TemplateAttribute('object_header_include_entry.hpp.jinja')  # noqa: E501
+    object_header_include_open = TemplateAttribute('object_header_include_open.hpp.jinja')  # noqa: E501
+    object_header_open = TemplateAttribute('object_header_open.hpp.jinja')
+    object_source_close = TemplateAttribute('object_source_close.cpp.jinja')
+    object_source_entry = TemplateAttribute('object_source_entry.cpp.jinja')
+    object_source_include_close = TemplateAttribute('object_source_include_close.cpp.jinja')  # noqa: E501
+    object_source_include_entry = TemplateAttribute('object_source_include_entry.cpp.jinja')  # noqa: E501
+    object_source_include_open = TemplateAttribute('object_source_include_open.cpp.jinja')  # noqa: E501
+    object_source_open = TemplateAttribute('object_source_open.cpp.jinja')
+    permissions_symbols_close = TemplateAttribute('permissions_symbols_close.hpp.jinja')  # noqa: E501
+    permissions_symbols_entry = TemplateAttribute('permissions_symbols_entry.hpp.jinja')  # noqa: E501
+    permissions_symbols_known_symbols = TemplateAttribute('permissions_symbols_known_symbols.hpp.jinja')  # noqa: E501
+    permissions_symbols_open = TemplateAttribute('permissions_symbols_open.hpp.jinja')  # noqa: E501
+    scalar_header_close = TemplateAttribute('scalar_header_close.hpp.jinja')
+    scalar_header_entry = TemplateAttribute('scalar_header_entry.hpp.jinja')
+    scalar_header_open = TemplateAttribute('scalar_header_open.hpp.jinja')
+    scalar_source_close = TemplateAttribute('scalar_source_close.cpp.jinja')
+    scalar_source_entry = TemplateAttribute('scalar_source_entry.cpp.jinja')
+    scalar_source_open = TemplateAttribute('scalar_source_open.cpp.jinja')
+    section = TemplateAttribute('_section.jinja')
+    source_close = TemplateAttribute('source_close.cpp.jinja')
+    source_open = TemplateAttribute('source_open.cpp.jinja')
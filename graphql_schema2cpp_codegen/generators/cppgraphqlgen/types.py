@@ -29,3 +29,4 @@ class GenerationParameters(NamedTuple):
     source_open: str
     source_close: str
     visibility_attribute: str
+    jobs: int = 1
@@ -14,16 +14,21 @@
 # http://mozilla.org/MPL/2.0/.
 
 import argparse
+import os
+from typing import Iterable, Optional
 
-from graphql import Source, build_schema
-
-from vss_deploy.model.deploy import (
-    get_depl_types_map, update_permissions
+from .generators import usable_generators
+from .manifest import BuildManifest
+from .model_cache import (
+    CACHE_DIR_ENV,
+    DEFAULT_MAX_SIZE,
+    ModelCache,
+    get_model_cache,
 )
-from vss_deploy.model.permissions_registry import PermissionsRegistry
+from .profiling import Profiler, profile_stage, set_active_profiler
 
-from .generators import usable_generators
-from .types import VSSGraphQLSchema
+
+DEPL_CACHE_DIR_ENV = 'GRAPHQL_SCHEMA2CPP_CODEGEN_DEPL_CACHE'
 
 
 def get_argparse() -> argparse.ArgumentParser:
@@ -53,6 +58,82 @@ def get_argparse() -> argparse.ArgumentParser:
         required=True,
     )
 
+    parser.add_argument(
+        '--depl_jobs',
+        help='Parse the included deploy files using N processes,'
+             ' 0 uses all CPUs. The result is the same as the sequential'
+             ' one',
+        metavar='N',
+        type=int,
+        default=1,
+    )
+
+    parser.add_argument(
+        '--depl_cache',
+        help='Directory to keep the parsed deploy include files across'
+             ' runs, it may be shared by concurrent builds. Defaults to'
+             ' the %s environment variable, if set' % DEPL_CACHE_DIR_ENV,
+        metavar='directory',
+        type=str,
+    )
+
+    parser.add_argument(
+        '--manifest',
+        help='Build manifest with the hashes of all inputs and outputs.'
+             ' If nothing changed since the last run, generation is skipped',
+        metavar='manifest.json',
+        type=str,
+    )
+
+    parser.add_argument(
+        '--model_cache',
+        help='Directory to keep snapshots of the built model, so runs with'
+             ' the same schema, deploy and permissions files skip parsing'
+             ' them. Defaults to the %s environment variable, if set'
+             % CACHE_DIR_ENV,
+        metavar='directory',
+        type=str,
+    )
+
+    parser.add_argument(
+        '--model_cache_max_size',
+        help='Maximum size of the model cache directory, the least'
+             ' recently used snapshots are removed past it'
+             ' (default: %(default)s)',
+        metavar='bytes',
+        type=int,
+        default=DEFAULT_MAX_SIZE,
+    )
+
+    parser.add_argument(
+        '--profile',
+        help='Report the wall time, CPU time and memory of each stage,'
+             ' to stderr unless --profile_output is given',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--profile_output',
+        help='Write the --profile report as JSON to this file, implies'
+             ' --profile',
+        metavar='profile.json',
+        type=str,
+    )
+
+    parser.add_argument(
+        '--profile_tracemalloc',
+        help='Also trace the peak of Python allocations of each profiled'
+             ' stage. The run gets slower',
+        action='store_true',
+    )
+
+    parser.add_argument(
+        '--profile_dump',
+        help='Write the cProfile statistics of the whole run to this file',
+        metavar='run.prof',
+        type=str,
+    )
+
     subparsers = parser.add_subparsers(dest='generator', required=True)
     for entry in usable_generators:
         entry(subparsers)
@@ -60,28 +141,136 @@ def get_argparse() -> argparse.ArgumentParser:
     return parser
 
 
-def main():
-    parser = get_argparse()
-    args = parser.parse_args()
+def load_cached_model(args: argparse.Namespace, cache: ModelCache):
+    with profile_stage('model_cache'):
+        key = cache.get_key(args.graphql.name, args.layer.name, args.perms)
+        if key is None:
+            return None
+        data = cache.load(key)
+        if data is None:
+            return None
+
+        from .types import VSSGraphQLSchema
+        try:
+            return VSSGraphQLSchema.loads(data)
+        except Exception:
+            # stale or truncated entry, rebuild it
+            cache.discard(key)
+            return None
+
+
+def build_model(args: argparse.Namespace):
+    # Heavy imports are delayed so a run skipped by the manifest
+    # doesn't pay for them
+    with profile_stage('imports'):
+        from graphql import Source, build_schema
+
+        from vss_deploy.model.deploy import (
+            IncludeCache, IncludeStore, get_depl_types_map, update_permissions
+        )
+        from vss_deploy.model.permissions_registry import (
+            PermissionsRegistry,
+        )
+
+        from .types import VSSGraphQLSchema
+
+    with profile_stage('load_depl'):
+        depl_cache = args.depl_cache or os.environ.get(DEPL_CACHE_DIR_ENV)
+        include_cache = IncludeCache(
+            IncludeStore(depl_cache) if depl_cache else None
+        )
+        layer_map = get_depl_types_map(
+            args.layer, args.depl_jobs, include_cache,
+        )
 
-    layer_map = get_depl_types_map(args.layer)
+    with profile_stage('build_schema'):
+        schema = build_schema(Source(
+            args.graphql.read(),
+            args.graphql.name,
+        ))
 
-    schema = build_schema(Source(
-        args.graphql.read(),
-        args.graphql.name,
-    ))
+    with profile_stage('permissions'):
+        permissions_registry = PermissionsRegistry.create(args.perms)
+        update_permissions(permissions_registry, schema)
+        if permissions_registry.changed:
+            print('Permissions updated')  # noqa: T001
+            permissions_registry.save(args.perms)
 
-    permissions_registry = PermissionsRegistry.create(args.perms)
-    update_permissions(permissions_registry, schema)
-    if permissions_registry.changed:
-        print('Permissions updated')  # noqa: T001
-        permissions_registry.save(args.perms)
+    with profile_stage('build_model'):
+        vss_graphql = VSSGraphQLSchema(
+            schema, layer_map, permissions_registry.registry
+        )
+        # the model doesn't reference the schema, release it before
+        # rendering
+        del schema
 
-    vss_graphql = VSSGraphQLSchema(
-        schema, layer_map, permissions_registry.registry
+    return vss_graphql
+
+
+def run(args: argparse.Namespace) -> Iterable[str]:
+    cache: Optional[ModelCache] = get_model_cache(
+        args.model_cache, args.model_cache_max_size,
     )
+    vss_graphql = None
+    if cache:
+        vss_graphql = load_cached_model(args, cache)
+
+    if vss_graphql is None:
+        vss_graphql = build_model(args)
+        if cache:
+            with profile_stage('model_cache'):
+                # the permissions registry may have been updated by the
+                # build, the key must match the files a warm run sees
+                key = cache.get_key(
+                    args.graphql.name, args.layer.name, args.perms,
+                )
+                if key is not None:
+                    cache.store(key, vss_graphql.dumps())
+
+    with profile_stage('generate'):
+        return args.generator(args, vss_graphql)
+
+
+def run_with_manifest(args: argparse.Namespace) -> None:
+    manifest = None
+    if args.manifest:
+        with profile_stage('manifest'):
+            manifest = BuildManifest(args.manifest, args)
+            if manifest.is_up_to_date():
+                return
+
+    outputs = run(args)
+
+    if manifest:
+        with profile_stage('manifest'):
+            manifest.save(outputs, args.perms)
 
-    args.generator(args, vss_graphql)
+
+def main():
+    parser = get_argparse()
+    args = parser.parse_args()
+
+    profile = args.profile or bool(args.profile_output)
+    if not profile and not args.profile_dump:
+        run_with_manifest(args)
+        return
+
+    profiler = Profiler(
+        trace_memory=args.profile_tracemalloc,
+        cprofile=bool(args.profile_dump),
+    )
+    set_active_profiler(profiler)
+    profiler.start()
+    try:
+        with profile_stage('total'):
+            run_with_manifest(args)
+    finally:
+        profiler.stop()
+        set_active_profiler(None)
+        if args.profile_dump:
+            profiler.dump_stats(args.profile_dump)
+        if profile:
+            profiler.report(args.profile_output)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,237 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Build manifest used to skip generation when nothing changed.
+
+This module must only depend on the standard library: it runs before
+graphql-core, Jinja and the deploy model are imported so a no-op build
+returns as fast as possible.
+'''
+
+import argparse
+import glob
+import hashlib
+import importlib.util
+import io
+import json
+import os
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+from vss_deploy.model.deploy.includes import get_include_patterns
+
+from .utils import atomic_write
+
+
+MANIFEST_VERSION = 1
+PACKAGE_FILE_EXTENSIONS = ('.py', '.jinja')
+# options that don't change the outputs
+IGNORED_OPTIONS = (
+    'depl_cache',
+    'depl_jobs',
+    'jobs',
+    'manifest',
+    'model_cache',
+    'model_cache_max_size',
+    'profile',
+    'profile_dump',
+    'profile_output',
+    'profile_templates',
+    'profile_tracemalloc',
+    'template_cache',
+    'template_cache_max_size',
+)
+
+
+def hash_file(path: str) -> str:
+    '''
+    Returns the sha256 of the file contents or an empty string if it
+    does not exist.
+    '''
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return ''
+    return digest.hexdigest()
+
+
+def get_include_closure(root_file: str) -> List[str]:
+    '''
+    Returns the root deploy file and every file it (transitively)
+    includes.
+
+    Includes are resolved the same way ``yamlinclude`` does it: relative
+    to the directory of the root file, with glob patterns expanded.
+
+    >>> get_include_closure('/nonexistent/Vehicle.depl')
+    ['/nonexistent/Vehicle.depl']
+    '''
+    root_file = os.path.abspath(root_file)
+    base_dir = os.path.dirname(root_file)
+    closure = [root_file]
+    seen = {root_file}
+    pending = [root_file]
+    while pending:
+        try:
+            with open(pending.pop(), encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for pattern in get_include_patterns(text):
+            path = os.path.join(base_dir, pattern)
+            if glob.has_magic(path):
+                paths = sorted(glob.glob(path, recursive=True))
+            else:
+                paths = [path]
+            for p in paths:
+                p = os.path.abspath(p)
+                if p not in seen:
+                    seen.add(p)
+                    closure.append(p)
+                    pending.append(p)
+    return closure
+
+
+def get_package_files() -> List[str]:
+    '''
+    Returns the generator sources and templates: changing any of them
+    must regenerate the outputs.
+    '''
+    dirs = [os.path.dirname(os.path.abspath(__file__))]
+    spec = importlib.util.find_spec('vss_deploy')
+    if spec and spec.submodule_search_locations:
+        dirs.extend(spec.submodule_search_locations)
+
+    files: List[str] = []
+    for d in dirs:
+        for root, subdirs, names in os.walk(d):
+            subdirs[:] = sorted(s for s in subdirs if s != '__pycache__')
+            files.extend(
+                os.path.join(root, name)
+                for name in sorted(names)
+                if name.endswith(PACKAGE_FILE_EXTENSIONS)
+            )
+    return files
+
+
+def _get_option_value(value: Any) -> Optional[str]:
+    if isinstance(value, io.IOBase):
+        # argparse.FileType: the contents are hashed as inputs
+        name = getattr(value, 'name', '')
+        return f'file:{os.path.abspath(name)}'
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    return repr(value)
+
+
+def get_inputs(args: argparse.Namespace) -> Optional[Dict[str, str]]:
+    '''
+    Computes the hashes of every input of a run.
+
+    Returns ``None`` if some input can't be hashed (ie: read from stdin),
+    in that case the run can't be skipped.
+    '''
+    inputs: Dict[str, str] = {'cwd': os.getcwd()}
+    files: List[str] = []
+    for key, value in sorted(vars(args).items()):
+        if key in IGNORED_OPTIONS:
+            continue
+        if isinstance(value, io.IOBase):
+            name = getattr(value, 'name', None)
+            if not isinstance(name, str) or not os.path.isfile(name):
+                return None
+            if key == 'layer':
+                files.extend(get_include_closure(name))
+            else:
+                files.append(os.path.abspath(name))
+        inputs[f'option:{key}'] = str(_get_option_value(value))
+
+    files.append(os.path.abspath(args.perms))
+    files.extend(get_package_files())
+    for path in files:
+        inputs[f'file:{path}'] = hash_file(path)
+    return inputs
+
+
+class BuildManifest:
+    '''
+    Records the input and output hashes of a successful run.
+
+    The run can be skipped if the inputs did not change and the outputs
+    were not touched since then.
+    '''
+    __slots__ = ('filename', 'inputs')
+    filename: str
+    inputs: Optional[Dict[str, str]]
+
+    def __init__(self, filename: str, args: argparse.Namespace) -> None:
+        self.filename = filename
+        self.inputs = get_inputs(args)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.filename, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get('version') != MANIFEST_VERSION:
+            return None
+        return data
+
+    def is_up_to_date(self) -> bool:
+        if self.inputs is None:
+            return False
+        data = self._load()
+        if not data or data.get('inputs') != self.inputs:
+            return False
+        outputs = data.get('outputs')
+        if not outputs:
+            return False
+        return all(
+            os.path.exists(path) and hash_file(path) == digest
+            for path, digest in outputs.items()
+        )
+
+    def save(self, outputs: Iterable[str], perms: str) -> None:
+        '''
+        Saves the manifest after a successful run.
+
+        The permissions registry is hashed again since the run may
+        have updated it.
+        '''
+        if self.inputs is None:
+            return
+        perms = os.path.abspath(perms)
+        self.inputs[f'file:{perms}'] = hash_file(perms)
+        data = {
+            'version': MANIFEST_VERSION,
+            'inputs': self.inputs,
+            'outputs': {
+                os.path.abspath(path): hash_file(path)
+                for path in outputs
+            },
+        }
+        atomic_write(self.filename, json.dumps(data, indent=1, sort_keys=True))
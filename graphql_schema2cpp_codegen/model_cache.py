@@ -0,0 +1,147 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Snapshots of the built model, so runs with the same schema, deploy and
+permissions inputs skip straight to the generation.
+
+Like the build manifest, this module only depends on the standard
+library: a warm run doesn't import graphql-core nor parse YAML.
+'''
+
+import hashlib
+import os
+import sys
+from typing import Optional
+
+from .manifest import (
+    get_include_closure,
+    get_package_files,
+    hash_file,
+)
+from .utils import atomic_write, evict_lru
+
+
+MODEL_CACHE_VERSION = 1
+CACHE_DIR_ENV = 'GRAPHQL_SCHEMA2CPP_CODEGEN_MODEL_CACHE'
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+ENTRY_PREFIX = 'model-'
+ENTRY_SUFFIX = '.pickle'
+
+
+def get_model_sources_digest() -> str:
+    '''
+    Hash of the code that builds the model: the generators only read it.
+    '''
+    digest = hashlib.sha256()
+    generators = os.path.join(os.path.dirname(__file__), 'generators')
+    for path in get_package_files():
+        if not path.endswith('.py') or path.startswith(generators):
+            continue
+        digest.update(f'{path}\0{hash_file(path)}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ModelCache:
+    '''
+    Directory of serialized models keyed by the hashes of their inputs.
+
+    The least recently used entries are evicted once the cache exceeds
+    ``max_size`` bytes.
+    '''
+    __slots__ = ('directory', 'max_size')
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+
+    def get_key(
+        self,
+        schema_file: str,
+        layer_file: str,
+        perms_file: str,
+    ) -> Optional[str]:
+        '''
+        Returns the key of the model built from these inputs, or ``None``
+        if some of them can't be hashed (ie: read from stdin).
+        '''
+        if not os.path.isfile(schema_file) or not os.path.isfile(layer_file):
+            return None
+
+        digest = hashlib.sha256(
+            f'{MODEL_CACHE_VERSION}\0{sys.version}\0'
+            f'{get_model_sources_digest()}\0'.encode('utf-8')
+        )
+        files = [schema_file, '', *get_include_closure(layer_file), '']
+        files.append(os.path.abspath(perms_file))
+        for path in files:
+            if path:
+                path = os.path.abspath(path)
+                digest.update(f'{path}\0{hash_file(path)}\0'.encode('utf-8'))
+            else:
+                digest.update(b'\1')  # separates the inputs
+        return digest.hexdigest()
+
+    def _get_filename(self, key: str) -> str:
+        return os.path.join(
+            self.directory, f'{ENTRY_PREFIX}{key}{ENTRY_SUFFIX}')
+
+    def load(self, key: str) -> Optional[bytes]:
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+            # mtime tracks the last use for the eviction
+            os.utime(filename)
+        except OSError:
+            return None
+        return data
+
+    def discard(self, key: str) -> None:
+        '''
+        Removes an entry that could not be loaded.
+        '''
+        try:
+            os.remove(self._get_filename(key))
+        except OSError:
+            pass
+
+    def store(self, key: str, data: bytes) -> None:
+        atomic_write(self._get_filename(key), data)
+        self.evict()
+
+    def evict(self) -> None:
+        evict_lru(
+            self.directory,
+            f'{ENTRY_PREFIX}*{ENTRY_SUFFIX}',
+            self.max_size,
+        )
+
+
+def get_model_cache(
+    directory: Optional[str],
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> Optional[ModelCache]:
+    '''
+    Returns the cache at the given directory or the one set by the
+    environment variable, if any.
+    '''
+    directory = directory or os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    return ModelCache(directory, max_size)
@@ -0,0 +1,184 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Optional instrumentation of the run stages.
+
+Only the standard library is used so it can be set up before the heavy
+modules are imported. When profiling is disabled ``profile_stage()`` is
+a no-op.
+'''
+
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import (
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from .utils import atomic_write
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+
+class StageProfile(NamedTuple):
+    name: str
+    depth: int
+    wall_seconds: float
+    cpu_seconds: float
+    # kibibytes on Linux, bytes on macOS: as reported by getrusage().
+    # Zero where it's not available
+    max_rss: int
+    tracemalloc_peak_bytes: Optional[int]
+
+
+def get_max_rss() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Profiler:
+    '''
+    Records wall time, CPU time and memory of each stage.
+
+    Stages may be nested, they are reported in the order they started.
+    Tracing the Python allocations makes the run slower, so it's only
+    done if ``trace_memory``. If ``cprofile``, the whole run is also
+    profiled with ``cProfile``.
+    '''
+    __slots__ = ('stages', 'trace_memory', 'cprofile', '_depth', '_peaks')
+    stages: List[StageProfile]
+    trace_memory: bool
+    cprofile: Optional[cProfile.Profile]
+    _depth: int
+    _peaks: List[int]
+
+    def __init__(self, trace_memory: bool = False, cprofile: bool = False):
+        self.stages = []
+        self.trace_memory = trace_memory
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self._depth = 0
+        self._peaks = []
+
+    def start(self) -> None:
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.cprofile:
+            self.cprofile.enable()
+
+    def stop(self) -> None:
+        if self.cprofile:
+            self.cprofile.disable()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    def _reset_peak(self) -> None:
+        # Python < 3.9 can't reset the peak, the peak so far is reported
+        reset_peak = getattr(tracemalloc, 'reset_peak', None)
+        if reset_peak:
+            reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if self._peaks:
+                # the enclosing stage peak must survive the reset
+                _, traced = tracemalloc.get_traced_memory()
+                self._peaks[-1] = max(self._peaks[-1], traced)
+            self._reset_peak()
+            self._peaks.append(0)
+
+        index = len(self.stages)
+        # placeholder keeps the stages in their starting order
+        self.stages.append(StageProfile(name, self._depth, 0, 0, 0, None))
+        self._depth += 1
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self._depth -= 1
+            peak = None
+            if tracing:
+                _, traced = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), traced)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                self._reset_peak()
+            self.stages[index] = StageProfile(
+                name, self._depth, wall, cpu, get_max_rss(), peak)
+
+    def dump_stats(self, filename: str) -> None:
+        if self.cprofile:
+            self.cprofile.dump_stats(filename)
+
+    def format_table(self) -> str:
+        lines = [
+            f'{"stage":<32} {"wall s":>9} {"cpu s":>9}'
+            f' {"max RSS":>10} {"traced peak":>12}'
+        ]
+        for s in self.stages:
+            name = '  ' * s.depth + s.name
+            peak = '' if s.tracemalloc_peak_bytes is None \
+                else str(s.tracemalloc_peak_bytes)
+            lines.append(
+                f'{name:<32} {s.wall_seconds:9.3f} {s.cpu_seconds:9.3f}'
+                f' {s.max_rss:10} {peak:>12}'
+            )
+        return '\n'.join(lines)
+
+    def report(self, filename: Optional[str] = None) -> None:
+        '''
+        Writes the stages as JSON to ``filename`` or, if not given, as a
+        table to stderr.
+        '''
+        if filename is None:
+            print(self.format_table(), file=sys.stderr)  # noqa: T001
+            return
+        atomic_write(filename, json.dumps(
+            [s._asdict() for s in self.stages], indent=2))
+
+
+_active_profiler: Optional[Profiler] = None
+
+
+def set_active_profiler(profiler: Optional[Profiler]) -> None:
+    global _active_profiler
+    _active_profiler = profiler
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    '''
+    Records the stage in the active profiler, if any.
+    '''
+    if _active_profiler is None:
+        yield
+        return
+    with _active_profiler.stage(name):
+        yield
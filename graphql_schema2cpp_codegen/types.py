@@ -13,6 +13,7 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import pickle
 import re
 from collections import OrderedDict
 from typing import (
@@ -103,7 +104,7 @@ VSSGraphQLNamedTypeMap = Mapping[str, 'VSSGraphQLNamedTypes']
 
 
 class VSSGraphQLWrappingType:
-    __slots__ = ('graphql', 'of_type')
+    __slots__ = ('of_type',)
     of_type: VSSGraphQLWrapableTypes
 
     def __init__(self, of_type: VSSGraphQLWrapableTypes) -> None:
@@ -111,11 +112,15 @@ class VSSGraphQLWrappingType:
 
 
 class VSSGraphQLNonNull(VSSGraphQLWrappingType):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'nonNull({self.of_type})'
 
 
 class VSSGraphQLList(VSSGraphQLWrappingType):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'list({self.of_type})'
 
@@ -195,32 +200,28 @@ def get_vss_names(graphql_name: str) -> Iterator[str]:
 
 
 class VSSGraphQLEnum:
-    __slots__ = ('graphql', 'is_list')
-    graphql: GraphQLEnumType
+    __slots__ = ('name', 'is_list')
+    name: str
     is_list: bool
 
     def __init__(self, graphql: GraphQLEnumType) -> None:
-        self.graphql = graphql
+        self.name = graphql.name
         self.is_list = False
 
     def __repr__(self) -> str:
         return f'enum {self.name}'
 
-    @property
-    def name(self):
-        return self.graphql.name
-
 
 class VSSGraphQLScalar:
-    __slots__ = ('graphql', 'is_custom', 'is_string', 'is_integer', 'is_list')
-    graphql: GraphQLScalarType
+    __slots__ = ('name', 'is_custom', 'is_string', 'is_integer', 'is_list')
+    name: str
     is_custom: bool
     is_string: bool
     is_integer: bool
     is_list: bool
 
     def __init__(self, graphql: GraphQLScalarType) -> None:
-        self.graphql = graphql
+        self.name = graphql.name
         self.is_custom = not is_specified_scalar_type(graphql)
         self.is_string = is_string_scalar(graphql)
         self.is_integer = is_int_scalar(graphql)
@@ -234,10 +235,6 @@ class VSSGraphQLScalar:
             qualifier += ' is_string'
         return f'scalar {self.name}{qualifier}'
 
-    @property
-    def name(self):
-        return self.graphql.name
-
 
 TUnwrapped = TypeVar('TUnwrapped', bound=VSSGraphQLUnwrappedTypes)
 TGraphQLFieldType = TypeVar('TGraphQLFieldType', bound=Union[
@@ -249,11 +246,10 @@ TGraphQLFieldType = TypeVar('TGraphQLFieldType', bound=Union[
 
 class _ContainerField(Generic[TUnwrapped, TGraphQLFieldType]):
     __slots__ = (
-        'name', 'graphql', 'deploy', 'type', 'unwrapped_type',
-        'permissions', 'range', 'is_list',
+        'name', 'deploy', 'type', 'unwrapped_type', 'permissions', 'range',
+        'is_list',
     )
     name: str
-    graphql: TGraphQLFieldType
     deploy: Optional[DeployType]
     type: Union[TUnwrapped, VSSGraphQLWrappingTypes]  # noqa: A003
     unwrapped_type: TUnwrapped
@@ -271,14 +267,17 @@ class _ContainerField(Generic[TUnwrapped, TGraphQLFieldType]):
         deploy_map: Dict[str, DeployType],
     ) -> None:
         self.name = name
-        self.graphql = graphql
-        self._setup_type(named_map)
+        self._setup_type(graphql, named_map)
         self.unwrapped_type = cast(TUnwrapped, get_unwrapped_type(self.type))
         self._setup_deploy(parent, deploy_map)
-        self._setup_directives(directives)
+        self._setup_directives(graphql, directives)
         self.is_list = check_list(graphql.type)
 
-    def _setup_type(self, named_map: VSSGraphQLNamedTypeMap) -> None:
+    def _setup_type(
+        self,
+        graphql: TGraphQLFieldType,
+        named_map: VSSGraphQLNamedTypeMap,
+    ) -> None:
         raise NotImplementedError
 
     def _setup_deploy(
@@ -294,9 +293,10 @@ class _ContainerField(Generic[TUnwrapped, TGraphQLFieldType]):
 
     def _setup_directives(
         self,
+        graphql: TGraphQLFieldType,
         directives: Mapping[str, GraphQLDirective],
     ) -> None:
-        ast_node = self.graphql.ast_node
+        ast_node = graphql.ast_node
         self.permissions = Permissions.from_node(ast_node, directives)
         type_permissions = getattr(self.type, 'permissions', None)
         if type_permissions:
@@ -333,10 +333,10 @@ class _Container(Generic[
     TContainerFieldType,
 ]):
     __slots__ = (
-        'graphql', 'deploy', 'all_deploy', 'fields', 'permissions',
+        'name', 'deploy', 'all_deploy', 'fields', 'permissions',
         'is_list_item', 'is_list'
     )
-    graphql: TGraphQLContainerType
+    name: str
     deploy: Optional[DeployType]
     all_deploy: Optional[List[DeployType]]
     fields: MutableMapping[str, TContainerFieldType]
@@ -351,28 +351,30 @@ class _Container(Generic[
         deploy: Optional[DeployType],
         directives: Mapping[str, GraphQLDirective],
     ) -> None:
-        self.graphql = graphql
+        self.name = graphql.name
         self.deploy = deploy
         self.is_list_item = False
         self.is_list = False
         self.fields = OrderedDict()
-        self._setup_directives(directives)
+        self._setup_directives(graphql, directives)
 
     def _setup_directives(
         self,
+        graphql: TGraphQLContainerType,
         directives: Mapping[str, GraphQLDirective],
     ) -> None:
-        ast_node = self.graphql.ast_node
+        ast_node = graphql.ast_node
         self.permissions = Permissions.from_node(ast_node, directives)
 
     def _populate_fields(
         self,
+        graphql: TGraphQLContainerType,
         named_map: VSSGraphQLNamedTypeMap,
         directives: Mapping[str, GraphQLDirective],
         deploy_map: Dict[str, DeployType],
     ) -> None:
         child_deploy: List[DeployType] = []
-        for n, f in self.graphql.fields.items():
+        for n, f in graphql.fields.items():
             vss_field = self._create_field(
                 n, f, named_map, directives, deploy_map)
             self.fields[n] = vss_field
@@ -406,6 +408,22 @@ class _Container(Generic[
     def _fields_populated(self) -> None:
         pass
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # VSSGraphQLSchema pickles the fields after all the containers,
+        # otherwise a chain of types referencing each other would be
+        # pickled recursively
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, '__slots__', ())
+            if name != 'fields' and hasattr(self, name)
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.fields = OrderedDict()
+
     def __repr__(self) -> str:
         qualifier = ''
         if self.is_list_item:
@@ -414,10 +432,6 @@ class _Container(Generic[
             qualifier = f' (deploy: {self.deploy})'
         return f'{self.kind} {self.name}{qualifier}'
 
-    @property
-    def name(self):
-        return self.graphql.name
-
     def mark_list_item(self) -> None:
         if self.is_list_item:
             return
@@ -431,8 +445,14 @@ class VSSGraphQLInputField(_ContainerField[
     VSSGraphQLInputUnwrappedTypes,
     GraphQLInputField,
 ]):
-    def _setup_type(self, named_map: VSSGraphQLNamedTypeMap) -> None:
-        self.type = get_input_type(self.graphql.type, named_map)
+    __slots__ = ()
+
+    def _setup_type(
+        self,
+        graphql: GraphQLInputField,
+        named_map: VSSGraphQLNamedTypeMap,
+    ) -> None:
+        self.type = get_input_type(graphql.type, named_map)
 
     def _setup_deploy(
         self,
@@ -461,11 +481,12 @@ class VSSGraphQLInputObject(_Container[
 
     def _setup_directives(
         self,
+        graphql: GraphQLInputObjectType,
         directives: Mapping[str, GraphQLDirective],
     ) -> None:
-        ast_node = self.graphql.ast_node
+        ast_node = graphql.ast_node
         self.range = Range.from_node(ast_node, directives)
-        return super()._setup_directives(directives)
+        return super()._setup_directives(graphql, directives)
 
     def _create_field(
         self,
@@ -491,14 +512,23 @@ class VSSGraphQLArgument(_ContainerField[
     VSSGraphQLInputUnwrappedTypes,
     GraphQLArgument,
 ]):
-    def _setup_type(self, named_map: VSSGraphQLNamedTypeMap) -> None:
-        self.type = get_input_type(self.graphql.type, named_map)
+    __slots__ = ()
+
+    def _setup_type(
+        self,
+        graphql: GraphQLArgument,
+        named_map: VSSGraphQLNamedTypeMap,
+    ) -> None:
+        self.type = get_input_type(graphql.type, named_map)
 
 
 class VSSGraphQLField(_ContainerField[
     VSSGraphQLOutputUnwrappedTypes,
     GraphQLField,
 ]):
+    __slots__ = ('args',)
+    args: MutableMapping[str, VSSGraphQLArgument]
+
     def __init__(
         self,
         parent: '_Container[Any, Any, Any]',
@@ -510,24 +540,30 @@ class VSSGraphQLField(_ContainerField[
     ) -> None:
         super().__init__(
             parent, name, graphql, named_map, directives, deploy_map)
-        self._populate_args(parent, named_map, directives, deploy_map)
+        self._populate_args(
+            parent, graphql, named_map, directives, deploy_map)
         if self.is_list:
             self.unwrapped_type.is_list = True
             if isinstance(self.unwrapped_type, VSSGraphQLObject):
                 self.unwrapped_type.mark_list_item()
 
-    def _setup_type(self, named_map: VSSGraphQLNamedTypeMap) -> None:
-        self.type = get_output_type(self.graphql.type, named_map)
+    def _setup_type(
+        self,
+        graphql: GraphQLField,
+        named_map: VSSGraphQLNamedTypeMap,
+    ) -> None:
+        self.type = get_output_type(graphql.type, named_map)
 
     def _populate_args(
         self,
         parent: '_Container[Any, Any, Any]',
+        graphql: GraphQLField,
         named_map: VSSGraphQLNamedTypeMap,
         directives: Mapping[str, GraphQLDirective],
         deploy_map: Dict[str, DeployType],
     ) -> None:
         args = OrderedDict()
-        for n, a in sorted(self.graphql.args.items()):
+        for n, a in sorted(graphql.args.items()):
             args[n] = VSSGraphQLArgument(
                 parent, n, a, named_map, directives, deploy_map)
         self.args = args
@@ -666,7 +702,23 @@ VSSGraphQLNamedTypes = Union[
 
 
 class VSSGraphQLSchema:
-    schema: GraphQLSchema
+    '''
+    Model the templates are rendered from.
+
+    The graphql-core schema is only used while building it: the model
+    holds no reference to it, so the schema can be released right after
+    and the model is cheap to pickle (see ``dumps()``).
+
+    The model is read-only by convention, it isn't frozen: building it
+    marks the list items and entry points of objects created earlier and
+    a frozen flag would cost every slotted instance. The templates,
+    filters and collectors must not modify it, the separate and parallel
+    renders share it.
+    '''
+    __slots__ = (
+        'deploy_map', 'permissions_registry', 'root_types',
+        'enums', 'inputs', 'objects', 'scalars', 'named_types',
+    )
     deploy_map: Dict[str, DeployType]
     permissions_registry: Mapping[str, int]
     root_types: Mapping[str, Optional[VSSGraphQLRootTypes]]
@@ -677,7 +729,6 @@ class VSSGraphQLSchema:
     scalars: MutableMapping[str, VSSGraphQLScalar]
 
     named_types: MutableMapping[str, VSSGraphQLNamedTypes]
-    directives: MutableMapping[str, GraphQLDirective]
 
     def __init__(
         self,
@@ -685,7 +736,6 @@ class VSSGraphQLSchema:
         deploy_map: Dict[str, DeployType],
         permissions_registry: Mapping[str, int],
     ) -> None:
-        self.schema = schema
         self.deploy_map = deploy_map
         self.permissions_registry = permissions_registry
         self.enums = OrderedDict()
@@ -693,57 +743,65 @@ class VSSGraphQLSchema:
         self.objects = OrderedDict()
         self.scalars = OrderedDict()
         self.named_types = OrderedDict()
-        self.directives = {}
-        self._populate_root_types()
-        self._populate_graphql()
+        self._populate_root_types(schema)
+        self._populate_graphql(schema)
 
-    def _populate_root_types(self) -> None:
+    def _populate_root_types(self, schema: GraphQLSchema) -> None:
         root_types: Dict[str, VSSGraphQLRootTypes] = {}
-        if self.schema.query_type:
-            root_types[self.schema.query_type.name] = 'query'
-        if self.schema.mutation_type:
-            root_types[self.schema.mutation_type.name] = 'mutation'
-        if self.schema.subscription_type:
-            root_types[self.schema.subscription_type.name] = 'subscription'
+        if schema.query_type:
+            root_types[schema.query_type.name] = 'query'
+        if schema.mutation_type:
+            root_types[schema.mutation_type.name] = 'mutation'
+        if schema.subscription_type:
+            root_types[schema.subscription_type.name] = 'subscription'
         self.root_types = root_types
 
-    def _populate_graphql(self) -> None:
-        for d in self.schema.directives:
-            self.directives[d.name] = d
+    def _populate_graphql(self, schema: GraphQLSchema) -> None:
+        directives = {d.name: d for d in schema.directives}
 
-        for n, t in sorted(self.schema.type_map.items()):
+        for n, t in sorted(schema.type_map.items()):
             if is_introspection_type(t):
                 continue
             if isinstance(t, GraphQLEnumType):
                 self._add_enum(n, t)
             elif isinstance(t, GraphQLInputObjectType):
-                self._add_input(n, t)
+                self._add_input(n, t, directives)
             elif isinstance(t, GraphQLObjectType):
-                self._add_object(n, t)
+                self._add_object(n, t, directives)
             elif isinstance(t, GraphQLScalarType):
                 self._add_scalar(n, t)
             else:
                 # Union, Interfaces
                 raise ValueError(f'Unsupported NamedType: {t}')
 
-        self._populate_input_fields()
-        self._populate_object_fields()
+        self._populate_input_fields(schema, directives)
+        self._populate_object_fields(schema, directives)
 
     def _add_enum(self, name: str, t: GraphQLEnumType) -> None:
         v = VSSGraphQLEnum(t)
         self.enums[name] = v
         self.named_types[name] = v
 
-    def _add_input(self, name: str, t: GraphQLInputObjectType) -> None:
+    def _add_input(
+        self,
+        name: str,
+        t: GraphQLInputObjectType,
+        directives: Mapping[str, GraphQLDirective],
+    ) -> None:
         deploy = get_deploy(self.deploy_map, name)
-        v = VSSGraphQLInputObject(t, deploy, self.directives)
+        v = VSSGraphQLInputObject(t, deploy, directives)
         self.inputs[name] = v
         self.named_types[name] = v
 
-    def _add_object(self, name: str, t: GraphQLObjectType) -> None:
+    def _add_object(
+        self,
+        name: str,
+        t: GraphQLObjectType,
+        directives: Mapping[str, GraphQLDirective],
+    ) -> None:
         deploy = get_deploy(self.deploy_map, name)
         is_root = self.root_types.get(name)
-        v = VSSGraphQLObject(t, deploy, self.directives, is_root)
+        v = VSSGraphQLObject(t, deploy, directives, is_root)
         self.objects[name] = v
         self.named_types[name] = v
 
@@ -752,22 +810,60 @@ class VSSGraphQLSchema:
         self.scalars[name] = v
         self.named_types[name] = v
 
-    def _populate_input_fields(self) -> None:
+    def _populate_input_fields(
+        self,
+        schema: GraphQLSchema,
+        directives: Mapping[str, GraphQLDirective],
+    ) -> None:
         named_map = self.named_types
-        directives = self.directives
         deploy_map = self.deploy_map
-        for i in self.inputs.values():
-            i._populate_fields(named_map, directives, deploy_map)
+        for n, i in self.inputs.items():
+            graphql = cast(GraphQLInputObjectType, schema.type_map[n])
+            i._populate_fields(graphql, named_map, directives, deploy_map)
 
-    def _populate_object_fields(self) -> None:
+    def _populate_object_fields(
+        self,
+        schema: GraphQLSchema,
+        directives: Mapping[str, GraphQLDirective],
+    ) -> None:
         named_map = self.named_types
-        directives = self.directives
         deploy_map = self.deploy_map
-        for o in self.objects.values():
-            o._populate_fields(named_map, directives, deploy_map)
+        for n, o in self.objects.items():
+            graphql = cast(GraphQLObjectType, schema.type_map[n])
+            o._populate_fields(graphql, named_map, directives, deploy_map)
 
     def __iter__(self) -> Iterator[VSSGraphQLIterationValue]:
         yield cast(VSSGraphQLIterationScalars, ('scalar', self.scalars))
         yield cast(VSSGraphQLIterationEnums, ('enum', self.enums))
         yield cast(VSSGraphQLIterationInputObjects, ('input', self.inputs))
         yield cast(VSSGraphQLIterationObjects, ('object', self.objects))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        # after the containers, see _Container.__getstate__()
+        fields: Dict[Tuple[str, str], MutableMapping[str, Any]] = {}
+        for n, i in self.inputs.items():
+            fields[(i.kind, n)] = i.fields
+        for n, o in self.objects.items():
+            fields[(o.kind, n)] = o.fields
+        state['fields'] = fields
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        fields = state.pop('fields')
+        for name, value in state.items():
+            setattr(self, name, value)
+        for n, i in self.inputs.items():
+            i.fields = fields[(i.kind, n)]
+        for n, o in self.objects.items():
+            o.fields = fields[(o.kind, n)]
+
+    def dumps(self) -> bytes:
+        return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data: bytes) -> 'VSSGraphQLSchema':
+        model = pickle.loads(data)
+        if not isinstance(model, VSSGraphQLSchema):
+            raise TypeError(f'Not a VSSGraphQLSchema: {type(model)}')
+        return model
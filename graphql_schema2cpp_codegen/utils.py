@@ -13,6 +13,53 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
+import fnmatch
+import os
+
+from vss_deploy.utils import atomic_write, can_fork  # noqa: F401
+
 
 def upper_first_letter(text: str) -> str:
     return f'{text[0].upper()}{text[1:]}'
+
+
+def write_if_changed(filename: str, content: str) -> bool:
+    '''
+    Writes the file only if its contents differ, keeping the mtime of
+    unchanged files so build systems don't rebuild their dependents.
+
+    Returns whether the file was written.
+    '''
+    try:
+        with open(filename) as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    atomic_write(filename, content)
+    return True
+
+
+def evict_lru(directory: str, pattern: str, max_size: int) -> None:
+    '''
+    Removes the least recently used files (by mtime) matching the
+    pattern until their total size fits ``max_size``.
+    '''
+    entries = []
+    for name in fnmatch.filter(os.listdir(directory), pattern):
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    size = sum(e[1] for e in entries)
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        size -= entry_size
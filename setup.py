@@ -17,12 +17,41 @@
 
 # -*- coding: utf-8 -*-
 
+import os
+
 from setuptools import find_packages, setup  # type: ignore
+from setuptools.command.build_py import build_py  # type: ignore
 
 name = 'graphql_schema2cpp_codegen'
 version = 1
 release = 0
 
+
+class BuildPyCommand(build_py):
+    '''
+    Ships the templates precompiled to Python modules.
+
+    Compiling imports the package, hence its runtime dependencies. They
+    are not build requirements: without them the templates are not
+    precompiled and they are compiled from the sources at runtime.
+    '''
+
+    def run(self):
+        super().run()
+        try:
+            from graphql_schema2cpp_codegen.generators.cppgraphqlgen import (
+                compile_templates,
+            )
+        except ImportError as e:
+            self.warn(f'templates were not precompiled: {e}')
+            return
+        compile_templates.compile_templates(os.path.join(
+            self.build_lib,
+            'graphql_schema2cpp_codegen', 'generators', 'cppgraphqlgen',
+            'templates_compiled',
+        ))
+
+
 setup(
     name=name,
     version=f'{version}.{release}',
@@ -46,13 +75,20 @@ setup(
         'console_scripts': [
             'graphql_schema2cpp_codegen=graphql_schema2cpp_codegen.graphql_schema2cpp_codegen:main',  # noqa: E501
             'vssdeploy2json=vss_deploy.deploy2json:main',
+            'graphql_schema2cpp_codegen_compile_templates=graphql_schema2cpp_codegen.generators.cppgraphqlgen.compile_templates:main',  # noqa: E501
         ],
     },
     platforms='any',
-    packages=find_packages(),
+    packages=find_packages(
+        exclude=('benchmarks', 'benchmarks.*', 'tests', 'tests.*')),
     package_data={
         'graphql_schema2cpp_codegen.generators.cppgraphqlgen': [
-            'templates/*.jinja'
+            'templates/*.jinja',
+            'templates_compiled/*.py',
+            'templates_compiled/stamp',
         ]
     },
+    cmdclass={
+        'build_py': BuildPyCommand,
+    },
 )
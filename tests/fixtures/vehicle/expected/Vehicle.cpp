@@ -0,0 +1,183 @@
+
+#include "implementation/can/vehicle/seats.hpp"
+#include "implementation/constant/vehicle.hpp"
+#include "implementation/dispatcher/vehicle.hpp"
+#include "implementation/dispatcher/vehicle/seats.hpp"
+#include "implementation/franca_idl/vehicle.hpp"
+#include "implementation/franca_idl/vehicle/cabin.hpp"
+#include "implementation/http/vehicle.hpp"
+#include "implementation/list/vehicle.hpp"
+#include "implementation/mqtt/vehicle/cabin.hpp"
+
+#include <vss_cpp_graphql/support/scalars.hpp>
+#include <vss_cpp_graphql/protocol/graphqlrequeststate.hpp>
+
+#include "Vehicle.hpp"
+#include "permissions_symbols.hpp"
+
+namespace graphql::vehicle {
+
+service::FieldResult<std::shared_ptr<object::Vehicle_Cabin>>
+Mutation::applyVehicle_Cabin(service::FieldParams&& params, Vehicle_Cabin_Input&& input) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+
+    if (input.temperature.has_value())
+    {
+        state->validate(permissions::Vehicle_Cabin_Temperature_WRITE);
+        state->getSingleton<v2_com_example_cabin_ClimateProxy_main__TemperatureAttribute>()
+            ->mutateValue(validateRange<double>(input.temperature.value(), {-10.0, 50.0}));
+    }
+    if (input.mode.has_value())
+    {
+        implementation::Mutation::writeMode<Vehicle_Cabin, object::Vehicle_Cabin>();
+    }
+
+    return std::make_shared<Vehicle_Cabin>();
+}
+
+service::FieldResult<std::shared_ptr<object::Vehicle_Seats>>
+Mutation::applyVehicle_Seats(service::FieldParams&& params, Vehicle_Seats_Input&& input) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+
+    auto modifiers = std::make_shared<implementation::Vehicle_Seats::Modifiers>(state, input.id);
+
+    if (input.heating.has_value())
+    {
+        modifiers->applyVehicle_SeatsHeating(validateRange<int16_t>(input.heating.value(), {0, 3}));
+    }
+
+    return std::make_shared<Vehicle_Seats>(modifiers);
+}
+
+service::FieldResult<std::shared_ptr<object::Vehicle>>
+Query::getVehicle(service::FieldParams&& params) const
+{
+    return std::make_shared<Vehicle>();
+}
+
+service::FieldResult<std::shared_ptr<object::Vehicle>>
+Subscription::getVehicle(service::FieldParams&& params, SubscriptionDeliveryInterval&& deliveryInterval) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    switch (deliveryInterval)
+    {
+        case SubscriptionDeliveryInterval::REALTIME:
+            state->validate(permissions::Subscription_Vehicle_REALTIME);
+            state->setSubscriptionmIntervalBetweenDeliveries(std::chrono::milliseconds(0));
+            break;
+
+        case SubscriptionDeliveryInterval::DELIVERY_INTERVAL_1_SECOND:
+            state->validate(permissions::Subscription_Vehicle_DELIVERY_INTERVAL_1_SECOND);
+            state->setSubscriptionmIntervalBetweenDeliveries(std::chrono::seconds(1));
+            break;
+
+        case SubscriptionDeliveryInterval::DELIVERY_INTERVAL_5_SECONDS:
+            state->setSubscriptionmIntervalBetweenDeliveries(std::chrono::seconds(5));
+            break;
+    }
+
+    return std::make_shared<Vehicle>();
+}
+
+service::FieldResult<std::optional<double>>
+Vehicle::getSpeed(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    state->validate(permissions::Vehicle_Speed_READ);
+    return state->getSingleton<v1_com_example_vehicle_SpeedProxy_main__SpeedChangedEvent>()->getValue<double>();
+}
+
+service::FieldResult<std::optional<std::string>>
+Vehicle::getVin(service::FieldParams&& params) const
+{
+                return "WVW123";
+}
+
+service::FieldResult<std::optional<std::string>>
+Vehicle::getModel(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    return state->getSingleton<Http__model>()->getValue<std::string>();
+}
+
+service::FieldResult<std::optional<response::Value>>
+Vehicle::getGear(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    switch (implementation::Vehicle::gearSelector(state)) {
+        case 0:
+            return state->getSingleton<v3_com_example_gear_GearProxy_g1__GearAttribute>()->getValue<response::Value>();
+        default:
+            throw std::invalid_argument("Unsupported deploy type.");
+    }
+}
+
+service::FieldResult<std::shared_ptr<object::Vehicle_Cabin>>
+Vehicle::getCabin(service::FieldParams&& params) const
+{
+    return std::make_shared<Vehicle_Cabin>();
+}
+
+service::FieldResult<std::optional<std::vector<std::shared_ptr<object::Vehicle_Seats>>>>
+Vehicle::getSeats(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    return implementation::Vehicle::getSeats<Vehicle_Seats, object::Vehicle_Seats>(state);
+}
+
+service::FieldResult<std::optional<double>>
+Vehicle_Cabin::getTemperature(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    state->validate(permissions::Vehicle_Cabin_Temperature_READ);
+    return state->getSingleton<v2_com_example_cabin_ClimateProxy_main__TemperatureAttribute>()->getValue<double>(
+        implementation::Vehicle_Cabin::convertTemp
+    );
+}
+
+service::FieldResult<std::optional<response::Value>>
+Vehicle_Cabin::getMode(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    return implementation::Vehicle_Cabin::readMode();
+}
+
+service::FieldResult<std::optional<response::Value>>
+Vehicle_Cabin::getFan(service::FieldParams&& params) const
+{
+    return response::Value();
+}
+
+service::FieldResult<std::optional<std::string>>
+Vehicle_Cabin::getRow(service::FieldParams&& params) const
+{
+    return m_Row;
+}
+
+service::FieldResult<std::optional<std::string>>
+Vehicle_Seats::getId(service::FieldParams&& params) const
+{
+    return m_Modifiers->getId();
+}
+
+service::FieldResult<std::optional<response::Value>>
+Vehicle_Seats::getPosition(service::FieldParams&& params) const
+{
+    auto state = GraphQLRequestState::fromRequestState(params.state);
+    switch (implementation::Vehicle_Seats::getSeatSelector(state, m_Modifiers)) {
+        case 0:
+            return std::optional<response::Value>(m_Modifiers->getPositionFromposition());
+        default:
+            throw std::invalid_argument("Unsupported deploy type.");
+    }
+}
+
+service::FieldResult<std::optional<response::Value>>
+Vehicle_Seats::getHeating(service::FieldParams&& params) const
+{
+    return std::optional<response::Value>(m_Modifiers->getHeating());
+}
+
+} // namespace graphql::vehicle
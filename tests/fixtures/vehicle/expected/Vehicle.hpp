@@ -0,0 +1,141 @@
+#pragma once
+// Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+//   Author: Alexander Domin (Alexander.Domin@bmw.de)
+// Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+//   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+//   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+//   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+//   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+//
+// SPDX-License-Identifier: MPL-2.0
+//
+// This Source Code Form is subject to the terms of the
+// Mozilla Public License, v. 2.0. If a copy of the MPL was
+// not distributed with this file, You can obtain one at
+// http://mozilla.org/MPL/2.0/.
+
+
+#ifdef VEHICLE_API
+#undef VEHICLE_API
+#endif
+#if defined(BMW_CPP_GRAPHQL_BUILD_SHARED_LIBS) && BMW_CPP_GRAPHQL_BUILD_SHARED_LIBS
+#define VEHICLE_API __attribute__ ((visibility ("default")))
+#else
+#define VEHICLE_API
+#endif
+
+#include "VehicleSchema.h"
+
+
+namespace implementation {
+    namespace Vehicle_Seats { struct Modifiers; }
+} // namespace implementation
+
+namespace graphql::vehicle {
+
+using namespace graphql;
+class Mutation;
+class Query;
+class Subscription;
+class Vehicle;
+class Vehicle_Cabin;
+class Vehicle_Seats;
+
+class VEHICLE_API Mutation : public object::Mutation
+{
+public:
+    VEHICLE_API explicit Mutation() = default;
+
+    service::FieldResult<std::shared_ptr<object::Vehicle_Cabin>>
+    applyVehicle_Cabin(service::FieldParams&& params, Vehicle_Cabin_Input&& input) const final;
+
+    service::FieldResult<std::shared_ptr<object::Vehicle_Seats>>
+    applyVehicle_Seats(service::FieldParams&& params, Vehicle_Seats_Input&& input) const final;
+};
+
+class VEHICLE_API Query : public object::Query
+{
+public:
+    VEHICLE_API explicit Query() = default;
+
+    service::FieldResult<std::shared_ptr<object::Vehicle>>
+    getVehicle(service::FieldParams&& params) const final;
+};
+
+class VEHICLE_API Subscription : public object::Subscription
+{
+public:
+    VEHICLE_API explicit Subscription() = default;
+
+    service::FieldResult<std::shared_ptr<object::Vehicle>>
+    getVehicle(service::FieldParams&& params, SubscriptionDeliveryInterval&& deliveryInterval) const final;
+};
+
+class Vehicle : public object::Vehicle
+{
+public:
+    explicit Vehicle() = default;
+
+    service::FieldResult<std::optional<double>>
+    getSpeed(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<std::string>>
+    getVin(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<std::string>>
+    getModel(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<response::Value>>
+    getGear(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::shared_ptr<object::Vehicle_Cabin>>
+    getCabin(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<std::vector<std::shared_ptr<object::Vehicle_Seats>>>>
+    getSeats(service::FieldParams&& params) const final;
+};
+
+class Vehicle_Cabin : public object::Vehicle_Cabin
+{
+    const std::optional<std::string> m_Row;
+
+public:
+    explicit Vehicle_Cabin(std::optional<std::string>&& row)
+        : m_Row(std::move(row))
+    {
+    }
+
+    service::FieldResult<std::optional<double>>
+    getTemperature(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<response::Value>>
+    getMode(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<response::Value>>
+    getFan(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<std::string>>
+    getRow(service::FieldParams&& params) const final;
+};
+
+class Vehicle_Seats : public object::Vehicle_Seats
+{
+    const std::shared_ptr<implementation::Vehicle_Seats::Modifiers> m_Modifiers;
+
+public:
+    explicit Vehicle_Seats(std::shared_ptr<implementation::Vehicle_Seats::Modifiers> modifiers)
+        : m_Modifiers(modifiers)
+    {
+    }
+
+    service::FieldResult<std::optional<std::string>>
+    getId(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<response::Value>>
+    getPosition(service::FieldParams&& params) const final;
+
+    service::FieldResult<std::optional<response::Value>>
+    getHeating(service::FieldParams&& params) const final;
+};
+
+} // namespace graphql::vehicle
@@ -0,0 +1,15 @@
+#pragma once
+#include <vss_cpp_graphql/support/permissions.hpp>
+namespace permissions {
+static inline constexpr ClientPermissions::Key Vehicle_Cabin_Temperature_READ = 2;
+static inline constexpr ClientPermissions::Key Vehicle_Cabin_Temperature_WRITE = 0;
+static inline constexpr ClientPermissions::Key Vehicle_Speed_READ = 1;
+static inline std::unordered_map<std::string_view, ClientPermissions::Key> getKnownPermissions()
+{
+    return std::unordered_map<std::string_view, ClientPermissions::Key> {
+        { "Vehicle.Cabin.Temperature_READ", Vehicle_Cabin_Temperature_READ },
+        { "Vehicle.Cabin.Temperature_WRITE", Vehicle_Cabin_Temperature_WRITE },
+        { "Vehicle.Speed_READ", Vehicle_Speed_READ },
+    };
+}
+} // namespace permissions
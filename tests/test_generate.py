@@ -0,0 +1,223 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Generates the code of the fixtures and compares it to the expected
+outputs.
+
+The expected outputs were produced by the generator before the field
+macros were resolved in Python (``CollectRenderPlan``), they cover the
+query, mutation and subscription paths.
+
+The build manifest and ``--separate`` tests modify a copy of the
+fixture to check the outputs follow the changes of the inputs.
+'''
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import Sequence, Tuple
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+FIXTURES_DIR = os.path.join(TESTS_DIR, 'fixtures')
+HEADER_OPEN = os.path.join(ROOT_DIR, 'resources', 'vehicle_hpp_headers_open.hpp')  # noqa: E501
+OUTPUTS = ('Vehicle.cpp', 'Vehicle.hpp', 'permissions_symbols.hpp')
+
+
+class GenerateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def generate(
+        self,
+        fixture: str,
+        *extra_args: str,
+        options: Sequence[str] = (),
+    ) -> str:
+        '''
+        Runs the generator over the fixture, given by its name or its
+        directory (ie: ``copy_fixture()``), with the global ``options``.
+        The permissions registry starts as the expected one and is kept
+        by the following runs. Returns the fixture directory.
+        '''
+        fixture_dir = os.path.join(FIXTURES_DIR, fixture)
+        expected_dir = os.path.join(fixture_dir, 'expected')
+        perms = os.path.join(self.output_dir, 'perms.yaml')
+        if not os.path.exists(perms):
+            shutil.copy(os.path.join(expected_dir, 'perms.yaml'), perms)
+        subprocess.run(
+            [
+                sys.executable, '-m', 'graphql_schema2cpp_codegen',
+                *options,
+                '--graphql', os.path.join(fixture_dir, 'schema.graphql'),
+                '--layer', os.path.join(fixture_dir, 'Vehicle.depl'),
+                '--perms', perms,
+                'cppgraphqlgen',
+                '--visibility_attribute=VEHICLE_API',
+                f'--header_open={HEADER_OPEN}',
+                *extra_args,
+                *(os.path.join(self.output_dir, name) for name in OUTPUTS),
+            ],
+            check=True,
+            cwd=ROOT_DIR,
+            stdout=subprocess.DEVNULL,
+        )
+        return fixture_dir
+
+    def copy_fixture(self, fixture: str) -> str:
+        fixture_dir = os.path.join(self.output_dir, 'fixture')
+        shutil.copytree(os.path.join(FIXTURES_DIR, fixture), fixture_dir)
+        return fixture_dir
+
+    def edit(self, path: str, old: str, new: str) -> None:
+        with open(path, encoding='utf-8') as f:
+            contents = f.read()
+        self.assertIn(old, contents)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(contents.replace(old, new))
+
+    def read_output(self, name: str) -> str:
+        with open(os.path.join(self.output_dir, name), encoding='utf-8') as f:
+            return f.read()
+
+    def generate_with_manifest(
+        self,
+        fixture_dir: str,
+        *extra_args: str,
+    ) -> bool:
+        '''
+        Runs the generator with a build manifest, returns whether it
+        regenerated the outputs: the manifest is only saved then.
+        '''
+        manifest = os.path.join(self.output_dir, 'manifest.json')
+
+        def get_manifest_id() -> Tuple[int, int]:
+            try:
+                st = os.stat(manifest)
+            except FileNotFoundError:
+                return (0, 0)
+            return (st.st_ino, st.st_mtime_ns)
+
+        before = get_manifest_id()
+        self.generate(
+            fixture_dir, *extra_args, options=('--manifest', manifest))
+        return get_manifest_id() != before
+
+    def assert_outputs(self, fixture_dir: str) -> None:
+        for name in OUTPUTS + ('perms.yaml',):
+            with self.subTest(name=name):
+                path = os.path.join(fixture_dir, 'expected', name)
+                with open(path, encoding='utf-8') as f:
+                    expected = f.read()
+                path = os.path.join(self.output_dir, name)
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(f.read(), expected)
+
+    def test_vehicle(self) -> None:
+        self.assert_outputs(self.generate('vehicle', '--jobs=1'))
+
+    def test_vehicle_parallel(self) -> None:
+        self.assert_outputs(self.generate('vehicle', '--jobs=2'))
+
+    def test_manifest_skips_unchanged_inputs(self) -> None:
+        fixture_dir = self.copy_fixture('vehicle')
+        self.assertTrue(self.generate_with_manifest(fixture_dir))
+        self.assertFalse(self.generate_with_manifest(fixture_dir))
+        self.assert_outputs(fixture_dir)
+
+        # an output modified by hand is generated again
+        self.edit(
+            os.path.join(self.output_dir, 'Vehicle.hpp'), 'VEHICLE_API', '')
+        self.assertTrue(self.generate_with_manifest(fixture_dir))
+        self.assert_outputs(fixture_dir)
+
+    def test_manifest_regenerates_changed_inputs(self) -> None:
+        fixture_dir = self.copy_fixture('vehicle')
+        self.assertTrue(self.generate_with_manifest(fixture_dir))
+
+        with self.subTest(changed='included layer'):
+            self.edit(
+                os.path.join(fixture_dir, 'cabin.depl'),
+                'convertTemp', 'convertTemperature',
+            )
+            self.assertTrue(self.generate_with_manifest(fixture_dir))
+            self.assertIn(
+                'Vehicle_Cabin::convertTemperature',
+                self.read_output('Vehicle.cpp'),
+            )
+            self.assertFalse(self.generate_with_manifest(fixture_dir))
+
+        with self.subTest(changed='permissions'):
+            with open(os.path.join(self.output_dir, 'perms.yaml'), 'a') as f:
+                f.write('Vehicle.Gear_READ: 100\n')
+            self.assertTrue(self.generate_with_manifest(fixture_dir))
+            self.assertIn(
+                'Vehicle.Gear_READ',
+                self.read_output('permissions_symbols.hpp'),
+            )
+            self.assertFalse(self.generate_with_manifest(fixture_dir))
+
+        with self.subTest(changed='option'):
+            option = '--visibility_attribute=OTHER_API'
+            self.assertTrue(self.generate_with_manifest(fixture_dir, option))
+            self.assertIn('OTHER_API', self.read_output('Vehicle.hpp'))
+            self.assertFalse(self.generate_with_manifest(fixture_dir, option))
+
+    def test_separate_removes_stale_files(self) -> None:
+        fixture_dir = self.copy_fixture('vehicle')
+        separate_dir = os.path.join(self.output_dir, 'objects')
+        self.generate(fixture_dir, f'--separate={separate_dir}')
+        self.assertTrue(
+            os.path.exists(os.path.join(separate_dir, 'Vehicle_Seats.hpp')))
+        # files not listed in .generated_files are not the generator's
+        user_file = os.path.join(separate_dir, 'README.md')
+        with open(user_file, 'w') as f:
+            f.write('objects\n')
+
+        schema = os.path.join(fixture_dir, 'schema.graphql')
+        self.edit(schema, '  seats: [Vehicle_Seats]\n', '')
+        self.edit(
+            schema,
+            '  vehicle_Seats(input: Vehicle_Seats_Input!): Vehicle_Seats\n',
+            '',
+        )
+        self.edit(
+            schema,
+            'type Vehicle_Seats {\n'
+            '  id: String\n'
+            '  position: Int16\n'
+            '  heating: Int16\n'
+            '}\n',
+            '',
+        )
+        self.generate(fixture_dir, f'--separate={separate_dir}')
+
+        names = set(os.listdir(separate_dir))
+        self.assertNotIn('Vehicle_Seats.cpp', names)
+        self.assertNotIn('Vehicle_Seats.hpp', names)
+        self.assertIn('Vehicle_Cabin.hpp', names)
+        self.assertIn('README.md', names)
+        with open(os.path.join(separate_dir, '.generated_files')) as f:
+            self.assertNotIn('Vehicle_Seats.hpp', f.read().split())
+
+
+if __name__ == '__main__':
+    unittest.main()
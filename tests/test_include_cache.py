@@ -0,0 +1,88 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Include cache invalidation: only the files that don't include others are
+memoized, keyed by their mtime and size.
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any
+
+from vss_deploy.model.deploy import IncludeCache, load_depl
+
+
+class IncludeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        # root.depl -> a.depl -> b.depl
+        self.write('root.depl', 'A: !include a.depl\n')
+        self.write('a.depl', 'B: !include b.depl\nname: a\n')
+        self.write('b.depl', 'x: 1\n')
+        self.cache = IncludeCache()
+
+    def write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(contents)
+        return path
+
+    def load(self) -> Any:
+        with open(os.path.join(self.directory, 'root.depl')) as f:
+            return load_depl(f, self.directory, include_cache=self.cache)
+
+    def test_leaves_are_memoized(self) -> None:
+        expected = {'A': {'B': {'x': 1}, 'name': 'a'}}
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.load(), expected)
+        # a.depl is parsed by both loads, b.depl by the first one
+        self.assertEqual(self.cache.stats[:2], (1, 3))
+
+    def test_edited_leaf_is_loaded_again(self) -> None:
+        self.load()
+        path = self.write('b.depl', 'x: 22\n')
+        self.assertEqual(self.load(), {'A': {'B': {'x': 22}, 'name': 'a'}})
+
+        # same size: the mtime tells the edit apart
+        st = os.stat(path)
+        self.write('b.depl', 'x: 33\n')
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.load(), {'A': {'B': {'x': 33}, 'name': 'a'}})
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_including_files_are_not_memoized(self) -> None:
+        self.load()
+        self.assertEqual(
+            list(self.cache._entries),
+            [os.path.join(self.directory, 'b.depl')],
+        )
+
+        # an edit of the leaf is seen through the including file even
+        # if the latter is unchanged
+        self.write('b.depl', 'x: 22\n')
+        self.assertEqual(self.load(), {'A': {'B': {'x': 22}, 'name': 'a'}})
+
+    def test_hits_are_copies(self) -> None:
+        first = self.load()
+        first['A']['B']['x'] = 2
+        self.assertEqual(self.load()['A']['B'], {'x': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
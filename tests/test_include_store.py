@@ -0,0 +1,96 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+On-disk include store shared across runs (``--depl_cache``).
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, List
+
+from vss_deploy.model.deploy import IncludeCache, IncludeStore, load_depl
+from vss_deploy.model.deploy.include_store import ENTRY_PREFIX
+
+
+class IncludeStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store_dir = os.path.join(self.directory, 'cache')
+        self.write('root.depl', 'A: !include a.depl\nB: !include b.depl\n')
+        self.write('a.depl', 'x: 1\n')
+        self.write('b.depl', 'y: [1, 2]\n')
+
+    def write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(contents)
+        return path
+
+    def load(self) -> Any:
+        '''
+        Loads the tree as a new run would: with a new cache sharing the
+        store directory.
+        '''
+        self.cache = IncludeCache(IncludeStore(self.store_dir))
+        with open(os.path.join(self.directory, 'root.depl')) as f:
+            return load_depl(f, self.directory, include_cache=self.cache)
+
+    def get_entries(self) -> List[str]:
+        return [
+            name for name in os.listdir(self.store_dir)
+            if name.startswith(ENTRY_PREFIX)
+        ]
+
+    def test_runs_share_the_store(self) -> None:
+        expected = {'A': {'x': 1}, 'B': {'y': [1, 2]}}
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.cache.stats, (0, 2, 0, 0))
+        self.assertEqual(len(self.get_entries()), 2)
+
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.cache.stats, (0, 0, 0, 2))
+
+    def test_edited_leaf_is_not_stale(self) -> None:
+        self.load()
+        st = os.stat(os.path.join(self.directory, 'a.depl'))
+        path = self.write('a.depl', 'x: 2\n')
+        # same size and mtime: the store is keyed by the contents
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(self.load(), {'A': {'x': 2}, 'B': {'y': [1, 2]}})
+        self.assertEqual(self.cache.stats, (0, 1, 0, 1))
+
+    def test_corrupted_entries_are_parsed_again(self) -> None:
+        self.load()
+        for name in self.get_entries():
+            with open(os.path.join(self.store_dir, name), 'wb') as f:
+                f.write(b'\xff')
+        self.assertEqual(self.load(), {'A': {'x': 1}, 'B': {'y': [1, 2]}})
+        self.assertEqual(self.cache.stats, (0, 2, 0, 0))
+
+    def test_entries_follow_the_umask(self) -> None:
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        self.load()
+        for name in self.get_entries():
+            st = os.stat(os.path.join(self.store_dir, name))
+            self.assertEqual(st.st_mode & 0o777, 0o644)
+
+
+if __name__ == '__main__':
+    unittest.main()
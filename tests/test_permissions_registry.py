@@ -0,0 +1,145 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Dict, List
+
+from vss_deploy.model import permissions_registry
+from vss_deploy.model.permissions_registry import PermissionsRegistry
+from vss_deploy.utils import can_fork
+
+import yaml
+
+
+def register_and_save(args: tuple) -> Dict[str, int]:
+    '''
+    Worker of the concurrent test: registers shared and own permissions
+    in a few rounds, compacting the file on some of them, returns the ids
+    each one got.
+    '''
+    filename, worker, rounds = args
+    ids: Dict[str, int] = {}
+    for i in range(rounds):
+        registry = PermissionsRegistry.create(filename)
+        permissions = [f'shared_{(worker + i) % 7}', f'own_{worker}_{i}']
+        registry.register_many(permissions)
+        registry.save(filename)
+        if (worker + i) % 4 == 0:
+            registry.compact(filename)
+        for permission in permissions:
+            ids[permission] = registry.registry[permission]
+    return ids
+
+
+class PermissionsRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = os.path.join(directory, 'perms.yaml')
+
+    def write(self, contents: str) -> None:
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            f.write(contents)
+
+    def read(self) -> str:
+        with open(self.filename, encoding='utf-8') as f:
+            return f.read()
+
+    def test_new_file_is_sorted(self) -> None:
+        registry = PermissionsRegistry.create(self.filename)
+        registry.register_many(['b', 'a'])
+        self.assertTrue(registry.save(self.filename))
+        self.assertEqual(self.read(), 'a: 1\nb: 0\n')
+        self.assertFalse(registry.save(self.filename))
+
+    def test_appends_new_permissions(self) -> None:
+        self.write('b: 0\nc: 1\n')
+        registry = PermissionsRegistry.create(self.filename)
+        registry.register_many(['c', 'a'])
+        registry.save(self.filename)
+        self.assertEqual(self.read(), 'b: 0\nc: 1\na: 2\n')
+
+    def test_rewrites_flow_mappings(self) -> None:
+        for contents, expected in (
+            ('{b: 0}\n', {'a': 1, 'b': 0}),
+            ('{}', {'a': 0}),
+            ('---\nb: 0\n...\n', {'a': 1, 'b': 0}),
+        ):
+            with self.subTest(contents=contents):
+                self.write(contents)
+                registry = PermissionsRegistry.create(self.filename)
+                registry.register('a')
+                registry.save(self.filename)
+                self.assertEqual(yaml.safe_load(self.read()), expected)
+
+    def test_keeps_the_file_mode(self) -> None:
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        registry = PermissionsRegistry.create(self.filename)
+        registry.register('a')
+        registry.save(self.filename)
+        self.assertEqual(os.stat(self.filename).st_mode & 0o777, 0o644)
+        self.assertEqual(os.listdir(os.path.dirname(self.filename)),
+                         ['perms.yaml'])
+
+        os.chmod(self.filename, 0o640)
+        self.write('{a: 0}\n')
+        registry = PermissionsRegistry.create(self.filename)
+        registry.register('b')
+        registry.save(self.filename)
+        registry.compact(self.filename)
+        self.assertEqual(self.read(), 'a: 0\nb: 1\n')
+        self.assertEqual(os.stat(self.filename).st_mode & 0o777, 0o640)
+
+    def test_merges_entries_saved_meanwhile(self) -> None:
+        self.write('a: 0\n')
+        first = PermissionsRegistry.create(self.filename)
+        second = PermissionsRegistry.create(self.filename)
+        first.register_many(['b', 'c'])
+        second.register_many(['c', 'd'])
+        first.save(self.filename)
+        second.save(self.filename)
+        self.assertEqual(second.registry, {'a': 0, 'b': 1, 'c': 2, 'd': 3})
+        self.assertEqual(yaml.safe_load(self.read()), second.registry)
+
+    @unittest.skipUnless(
+        permissions_registry.fcntl is not None and can_fork(),
+        'needs fcntl and fork',
+    )
+    def test_concurrent_saves(self) -> None:
+        self.write('base: 0\n')
+        workers = 8
+        rounds = 10
+        context = multiprocessing.get_context('fork')
+        with context.Pool(4) as pool:
+            results: List[Dict[str, int]] = pool.map(
+                register_and_save,
+                [(self.filename, worker, rounds) for worker in range(workers)],
+            )
+
+        saved = yaml.safe_load(self.read())
+        self.assertEqual(len(saved), 1 + 7 + workers * rounds)
+        self.assertEqual(len(set(saved.values())), len(saved))
+        for ids in results:
+            for permission, i in ids.items():
+                self.assertEqual(saved[permission], i)
+
+
+if __name__ == '__main__':
+    unittest.main()
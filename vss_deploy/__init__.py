@@ -13,18 +13,37 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from .model.deploy.deploy_entry import VehicleDeployEntry
-from .model.deploy.deploy_map import VehicleDeployMap
-from .model.directives import Directives
-from .model.permissions_registry import PermissionsRegistry
-from .model.vehicle_node import VehicleNode
-from .vssfilter import filter_vss_tree
+from typing import TYPE_CHECKING
+
+from .utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .model.compact_tree import CompactVehicleNode
+    from .model.deploy.deploy_entry import VehicleDeployEntry
+    from .model.deploy.deploy_map import VehicleDeployMap
+    from .model.directives import Directives
+    from .model.permissions_registry import PermissionsRegistry
+    from .model.vehicle_node import VehicleNode
+    from .vssfilter import filter_vss_tree, filter_vss_tree_compact
 
 __all__ = [
+    'CompactVehicleNode',
     'filter_vss_tree',
+    'filter_vss_tree_compact',
     'Directives',
     'PermissionsRegistry',
     'VehicleNode',
     'VehicleDeployEntry',
     'VehicleDeployMap'
 ]
+
+__getattr__ = lazy_exports(__name__, {
+    'CompactVehicleNode': '.model.compact_tree',
+    'filter_vss_tree': '.vssfilter',
+    'filter_vss_tree_compact': '.vssfilter',
+    'Directives': '.model.directives',
+    'PermissionsRegistry': '.model.permissions_registry',
+    'VehicleNode': '.model.vehicle_node',
+    'VehicleDeployEntry': '.model.deploy.deploy_entry',
+    'VehicleDeployMap': '.model.deploy.deploy_map',
+})
@@ -13,14 +13,31 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from .cardinality import Cardinality
-from .directives import Directives
-from .permissions_registry import PermissionsRegistry
-from .vehicle_node import VehicleNode
+from typing import TYPE_CHECKING
+
+from ..utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .cardinality import Cardinality
+    from .compact_tree import CompactVehicleNode, CompactVehicleTree
+    from .directives import Directives
+    from .permissions_registry import PermissionsRegistry
+    from .vehicle_node import VehicleNode
 
 __all__ = [
     'Cardinality',
+    'CompactVehicleNode',
+    'CompactVehicleTree',
     'Directives',
     'PermissionsRegistry',
     'VehicleNode',
 ]
+
+__getattr__ = lazy_exports(__name__, {
+    'Cardinality': '.cardinality',
+    'CompactVehicleNode': '.compact_tree',
+    'CompactVehicleTree': '.compact_tree',
+    'Directives': '.directives',
+    'PermissionsRegistry': '.permissions_registry',
+    'VehicleNode': '.vehicle_node',
+})
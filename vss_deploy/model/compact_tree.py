@@ -0,0 +1,347 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Compact, read-only alternative to trees of ``VehicleNode``.
+
+The nodes of a ``CompactVehicleTree`` live in parallel arrays of
+indexes, a ``CompactVehicleNode`` is just a view of one of them: there
+is no per node object, nor anytree bookkeeping, while the tree is
+built. Views expose the ``VehicleNode`` API and the read-only part of
+anytree's, so anytree iterators and renderers work on them.
+'''
+
+from array import array
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from vspec import VSSNode
+from vspec.model.vsstree import DEFAULT_SEPARATOR
+
+from . import Cardinality
+from .deploy.deploy import deploy_from_entry
+from .deploy.deploy_entry import VehicleDeployEntry
+from .deploy.types.deploy_type import DeployType
+from .deploy.types.deploy_with_method import DeployWithMethod
+from .directives import Directives
+
+
+NO_INDEX = -1
+
+
+class CompactVehicleTree:
+    '''
+    Nodes stored as parallel arrays, indexed by their creation order.
+
+    ``parent``, ``first_child`` and ``next_sibling`` link the nodes,
+    ``name_id`` indexes the interned ``names`` and ``deploy_index`` the
+    ``deploy_entries`` and ``deploy_infos`` of the deployed nodes. The
+    ``qualifiers`` are only created for the nodes they are asked for.
+    '''
+    __slots__ = (
+        'parent', 'first_child', 'next_sibling', 'name_id', 'deploy_index',
+        'names', 'original_nodes', 'qualifiers', 'deploy_entries',
+        'deploy_infos', '_name_ids',
+    )
+    parent: 'array[int]'
+    first_child: 'array[int]'
+    next_sibling: 'array[int]'
+    name_id: 'array[int]'
+    deploy_index: 'array[int]'
+    names: List[str]
+    original_nodes: List[VSSNode]
+    qualifiers: Dict[int, Directives]
+    deploy_entries: List[VehicleDeployEntry]
+    deploy_infos: List[Optional[DeployType]]
+    _name_ids: Dict[str, int]
+
+    def __init__(self) -> None:
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.next_sibling = array('l')
+        self.name_id = array('l')
+        self.deploy_index = array('l')
+        self.names = []
+        self.original_nodes = []
+        self.qualifiers = {}
+        self.deploy_entries = []
+        self.deploy_infos = []
+        self._name_ids = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(
+        self,
+        original_node: VSSNode,
+        deploy_entry: Optional[VehicleDeployEntry] = None,
+    ) -> int:
+        '''
+        Adds an unlinked node, returns its index.
+        '''
+        name_id = self._name_ids.get(original_node.name)
+        if name_id is None:
+            name_id = self._name_ids[original_node.name] = len(self.names)
+            self.names.append(original_node.name)
+
+        deploy_index = NO_INDEX
+        if deploy_entry:
+            deploy_index = len(self.deploy_entries)
+            self.deploy_entries.append(deploy_entry)
+            self.deploy_infos.append(deploy_from_entry(deploy_entry))
+
+        self.parent.append(NO_INDEX)
+        self.first_child.append(NO_INDEX)
+        self.next_sibling.append(NO_INDEX)
+        self.name_id.append(name_id)
+        self.deploy_index.append(deploy_index)
+        self.original_nodes.append(original_node)
+        return len(self.parent) - 1
+
+    def link(self, index: int, children: List[int]) -> None:
+        '''
+        Sets the children of a node, in order.
+        '''
+        previous = NO_INDEX
+        for child in children:
+            self.parent[child] = index
+            if previous == NO_INDEX:
+                self.first_child[index] = child
+            else:
+                self.next_sibling[previous] = child
+            previous = child
+
+    def pop(self, index: int) -> None:
+        '''
+        Removes the last added node, which must not be linked.
+        '''
+        assert index == len(self.parent) - 1
+        if self.deploy_index[index] != NO_INDEX:
+            self.deploy_entries.pop()
+            self.deploy_infos.pop()
+        for a in (self.parent, self.first_child, self.next_sibling,
+                  self.name_id, self.deploy_index):
+            a.pop()
+        self.original_nodes.pop()
+
+    def iter_children(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        while child != NO_INDEX:
+            yield child
+            child = self.next_sibling[child]
+
+    def node(self, index: int = 0) -> 'CompactVehicleNode':
+        return CompactVehicleNode(self, index)
+
+    @property
+    def root(self) -> 'CompactVehicleNode':
+        return CompactVehicleNode(self, 0)
+
+
+class CompactVehicleNode:
+    '''
+    View of a node of a ``CompactVehicleTree``.
+
+    Views are created on demand and compare equal when they refer to the
+    same node, they are read-only: the tree can't be modified through
+    them.
+    '''
+    __slots__ = ('tree', 'index')
+    separator = '/'
+    tree: CompactVehicleTree
+    index: int
+
+    def __init__(self, tree: CompactVehicleTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompactVehicleNode) \
+            and other.tree is self.tree and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.qualified_name()!r})'
+
+    def _view(self, index: int) -> Optional['CompactVehicleNode']:
+        return None if index == NO_INDEX else CompactVehicleNode(
+            self.tree, index)
+
+    # anytree API
+
+    @property
+    def name(self) -> str:
+        return self.tree.names[self.tree.name_id[self.index]]
+
+    @property
+    def parent(self) -> Optional['CompactVehicleNode']:
+        return self._view(self.tree.parent[self.index])
+
+    @property
+    def children(self) -> Tuple['CompactVehicleNode', ...]:
+        return tuple(
+            CompactVehicleNode(self.tree, i)
+            for i in self.tree.iter_children(self.index)
+        )
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.tree.first_child[self.index] == NO_INDEX
+
+    @property
+    def is_root(self) -> bool:
+        return self.tree.parent[self.index] == NO_INDEX
+
+    def iter_path_reverse(self) -> Iterator['CompactVehicleNode']:
+        index = self.index
+        while index != NO_INDEX:
+            yield CompactVehicleNode(self.tree, index)
+            index = self.tree.parent[index]
+
+    @property
+    def path(self) -> Tuple['CompactVehicleNode', ...]:
+        return tuple(reversed(list(self.iter_path_reverse())))
+
+    @property
+    def ancestors(self) -> Tuple['CompactVehicleNode', ...]:
+        return self.path[:-1]
+
+    @property
+    def root(self) -> 'CompactVehicleNode':
+        return self.path[0]
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for _ in self.iter_path_reverse()) - 1
+
+    def _iter_descendants(self) -> Iterator[int]:
+        pending = list(reversed(list(self.tree.iter_children(self.index))))
+        while pending:
+            index = pending.pop()
+            yield index
+            pending.extend(reversed(list(self.tree.iter_children(index))))
+
+    @property
+    def descendants(self) -> Tuple['CompactVehicleNode', ...]:
+        return tuple(
+            CompactVehicleNode(self.tree, i) for i in self._iter_descendants()
+        )
+
+    @property
+    def leaves(self) -> Tuple['CompactVehicleNode', ...]:
+        if self.is_leaf:
+            return (self,)
+        return tuple(
+            CompactVehicleNode(self.tree, i) for i in self._iter_descendants()
+            if self.tree.first_child[i] == NO_INDEX
+        )
+
+    @property
+    def siblings(self) -> Tuple['CompactVehicleNode', ...]:
+        parent = self.parent
+        if parent is None:
+            return ()
+        return tuple(c for c in parent.children if c.index != self.index)
+
+    @property
+    def size(self) -> int:
+        return 1 + sum(1 for _ in self._iter_descendants())
+
+    @property
+    def height(self) -> int:
+        heights: Dict[int, int] = {}
+        for i in reversed(list(self._iter_descendants())):
+            heights[i] = max(
+                (heights[c] + 1 for c in self.tree.iter_children(i)),
+                default=0,
+            )
+        return max(
+            (heights[c] + 1 for c in self.tree.iter_children(self.index)),
+            default=0,
+        )
+
+    # VehicleNode API
+
+    @staticmethod
+    def supports_parameter() -> bool:
+        return False
+
+    @property
+    def original_node(self) -> VSSNode:
+        return self.tree.original_nodes[self.index]
+
+    @property
+    def qualifiers(self) -> Directives:
+        qualifiers = self.tree.qualifiers.get(self.index)
+        if qualifiers is None:
+            qualifiers = self.tree.qualifiers[self.index] = Directives(
+                self.original_node)
+        return qualifiers
+
+    @property
+    def deploy_entry(self) -> Optional[VehicleDeployEntry]:
+        deploy_index = self.tree.deploy_index[self.index]
+        if deploy_index == NO_INDEX:
+            return None
+        return self.tree.deploy_entries[deploy_index]
+
+    @property
+    def deploy_info(self) -> Optional[DeployType]:
+        deploy_index = self.tree.deploy_index[self.index]
+        if deploy_index == NO_INDEX:
+            return None
+        return self.tree.deploy_infos[deploy_index]
+
+    @property
+    def cardinality(self) -> Optional[Cardinality]:
+        deploy_entry = self.deploy_entry
+        return deploy_entry.cardinality if deploy_entry else None
+
+    @property
+    def deprecation(self) -> Optional[str]:
+        return self.original_node.deprecation or None
+
+    @property
+    def description(self) -> Optional[str]:
+        original_node = self.original_node
+        unit = getattr(original_node, 'unit', None)
+        if unit is not None:
+            return f'{original_node}\n@Unit: {unit.value}'
+        return original_node.description or None
+
+    @property
+    def vss_node_type(self):
+        return self.original_node.type
+
+    @property
+    def vss_node_data_type(self):
+        return self.original_node.data_type
+
+    @property
+    def has_write_method(self) -> bool:
+        deploy_info = self.deploy_info
+        if isinstance(deploy_info, DeployWithMethod):
+            return deploy_info.has_write_method
+        return False
+
+    def qualified_name(self, separator=DEFAULT_SEPARATOR) -> str:
+        return self.original_node.qualified_name(separator=separator)
@@ -13,18 +13,44 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from .deploy import (
-    deploy_map_factory, get_depl_map, get_depl_types_map,
-    get_permissions_registry, load_depl, update_permissions
-)
-from .deploy_map import VehicleDeployMap
+from typing import TYPE_CHECKING
+
+from ...utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .deploy import (
+        deploy_map_factory, get_depl_map, get_depl_types_map,
+        get_deploy_types, get_permissions_registry, load_depl,
+        update_permissions
+    )
+    from .deploy_map import VehicleDeployMap
+    from .include_cache import IncludeCache, IncludeCacheStats
+    from .include_store import IncludeStore
 
 __all__ = [
     'deploy_map_factory',
     'get_depl_map',
     'get_depl_types_map',
+    'get_deploy_types',
     'get_permissions_registry',
+    'IncludeCache',
+    'IncludeCacheStats',
+    'IncludeStore',
     'load_depl',
     'update_permissions',
     'VehicleDeployMap',
 ]
+
+__getattr__ = lazy_exports(__name__, {
+    'deploy_map_factory': '.deploy',
+    'get_depl_map': '.deploy',
+    'get_depl_types_map': '.deploy',
+    'get_deploy_types': '.deploy',
+    'get_permissions_registry': '.deploy',
+    'IncludeCache': '.include_cache',
+    'IncludeCacheStats': '.include_cache',
+    'IncludeStore': '.include_store',
+    'load_depl': '.deploy',
+    'update_permissions': '.deploy',
+    'VehicleDeployMap': '.deploy_map',
+})
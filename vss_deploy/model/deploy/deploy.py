@@ -16,8 +16,7 @@
 # http://mozilla.org/MPL/2.0/.
 
 import os
-import re
-from typing import (Dict, List, Mapping, Optional, TextIO, Union)
+from typing import (Dict, List, Mapping, Optional, TextIO, Type, Union)
 
 from graphql import GraphQLInputObjectType, GraphQLObjectType, GraphQLSchema
 
@@ -27,15 +26,14 @@ import yamlinclude
 
 from .deploy_entry import VehicleDeployEntry
 from .deploy_map import VehicleDeployMap
+from .include_cache import IncludeCache
 from .types.deploy_factory import deploy_map_factory
 from .types.deploy_list import DeployList
 from .types.deploy_type import DeployType
 from ..permissions_registry import PermissionsRegistry
+from ..yaml_loaders import FullLoader
 
 
-READER_TABLE = [
-    (re.compile(r'^.+\.depl$', re.IGNORECASE), yamlinclude.YamlReader),
-]
 GRAPHQL_TYPES_WITH_PERMISSION = (GraphQLObjectType, GraphQLInputObjectType)
 
 
@@ -69,7 +67,13 @@ def deploy_from_entry(
     return None
 
 
-def load_depl(root_file: TextIO, base_dir: str) -> dict:
+def load_depl(
+    root_file: TextIO,
+    base_dir: str,
+    loader_class: Type = FullLoader,
+    include_cache: Optional[IncludeCache] = None,
+    jobs: int = 1,
+) -> dict:
     '''
     Parsers deploy yaml files.
 
@@ -84,29 +88,70 @@ def load_depl(root_file: TextIO, base_dir: str) -> dict:
     base_dir : str
         Directory that contains the root depl file
 
+    loader_class : Type
+        YAML loader used for the root and included files, libyaml's
+        ``CFullLoader`` if available.
+
+    include_cache : IncludeCache
+        Parsed include files, each file that doesn't include others is
+        only parsed the first time it's included. Pass one to share it
+        between calls or to read its statistics, otherwise a new one is
+        used for this call.
+
+    jobs : int
+        Processes used to parse the included files that don't include
+        others ahead of the sequential load, 0 uses all CPUs. The result
+        is the same as the sequential one.
+
     Returns
     -------
     depl_data : dict
         Nested dictionary with the data of the parsed deploy files.
     '''
 
+    # The includes are resolved relative to base_dir: register them in a
+    # subclass so the shared loader class is left untouched
+    if include_cache is None:
+        include_cache = IncludeCache()
+    if jobs != 1 and isinstance(getattr(root_file, 'name', None), str):
+        include_cache.prefetch(
+            root_file.name,
+            base_dir,
+            loader_class,
+            jobs or os.cpu_count() or 1,
+        )
+    loader = type('DeployLoader', (loader_class,), {})
     yamlinclude.YamlIncludeConstructor.add_to_loader_class(
-        loader_class=yaml.FullLoader,
+        loader_class=loader,
         base_dir=base_dir,
-        reader_map=READER_TABLE
+        reader_map=include_cache.get_reader_map(loader_class),
     )
-    return yaml.load(root_file, Loader=yaml.FullLoader)
+    return yaml.load(root_file, Loader=loader)
 
 
-def get_depl_map(root_file: TextIO) -> VehicleDeployMap:
+def get_depl_map(
+    root_file: TextIO,
+    jobs: int = 1,
+    include_cache: Optional[IncludeCache] = None,
+) -> VehicleDeployMap:
     base_dir = os.path.dirname(root_file.name)
-    deploy_data = load_depl(root_file, base_dir)
+    deploy_data = load_depl(
+        root_file, base_dir, include_cache=include_cache, jobs=jobs)
     return VehicleDeployMap(deploy_data)
 
 
-def get_depl_types_map(root_file: TextIO) -> Dict[str, DeployType]:
+def get_depl_types_map(
+    root_file: TextIO,
+    jobs: int = 1,
+    include_cache: Optional[IncludeCache] = None,
+) -> Dict[str, DeployType]:
+    return get_deploy_types(get_depl_map(root_file, jobs, include_cache))
+
+
+def get_deploy_types(
+    vss_deploy_map: VehicleDeployMap
+) -> Dict[str, DeployType]:
     deploy_types_map: Dict[str, DeployType] = {}
-    vss_deploy_map = get_depl_map(root_file)
     for name, e in vss_deploy_map:
         deploy = deploy_from_entry(e)
         if deploy:
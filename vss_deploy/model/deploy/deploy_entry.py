@@ -21,6 +21,7 @@ from ..json_types import JSONChildValue
 
 
 class VehicleDeployEntry:
+    __slots__ = ('name', 'config', 'cardinality', 'is_resolvable')
     name: str
     config: dict
     cardinality: Cardinality
@@ -13,12 +13,28 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import Any, Dict, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .deploy_entry import VehicleDeployEntry
+from .deploy_trie import DeployTrie
 from .types.deploy_factory import deploy_yaml_keys
 
 
+DeployNode = Union[VehicleDeployEntry, List[VehicleDeployEntry]]
+DeployTrieNode = DeployTrie[DeployNode]
+# marks the end of the items of a stack frame
+_END = object()
+
+
 class VehicleDeployMap:
     '''
     Deploy data flat model.
@@ -32,83 +48,120 @@ class VehicleDeployMap:
             Nested dictionary containing deploy data. It may be generated
             by `load_depl()`.
 
+    Entries are also indexed by a trie of their path segments, see
+    `find()`, `has_subtree()` and `glob()`.
+
     Methods:
     --------
         get_entry(entry_name: str)
             Returns the content of the deploy node entry_name.
+        find(path: Union[str, Sequence[str]], parent: DeployTrieNode)
+            Returns the trie node of a path, relative to parent.
+        has_subtree(path: Union[str, Sequence[str]])
+            Whether there are entries at or under path.
+        glob(pattern: str)
+            Yields the names and contents of the entries matching pattern.
     '''
-    _deploy_nodes: dict = {}
+    __slots__ = ('_deploy_nodes', '_root')
+    _deploy_nodes: Dict[str, DeployNode]
+    _root: DeployTrieNode
 
     def flat_deploy_model(  # noqa: C901
         self,
-        depl_dict: dict,
+        depl_dict: Dict[str, DeployNode],
         path: str,
         depl_data: Union[dict, list],
-        is_list_item: bool = False
+        is_list_item: bool = False,
+        node: Optional[DeployTrieNode] = None,
     ):
-
-        if isinstance(depl_data, dict):
-            if deploy_yaml_keys['constants'] in depl_data:
-                self._handle_constant(path, depl_dict, depl_data)
-            for key, value in depl_data.items():
-                if key in deploy_yaml_keys.values():
+        '''
+        Adds the entries of ``depl_data`` to ``depl_dict``, named after
+        their ``_`` joined keys prefixed by ``path``, and to the trie
+        under ``node`` (the root by default).
+
+        The tree is walked depth first with an explicit stack, so the
+        depth of the layers is not bound by the recursion limit. Each
+        stack frame holds the joined path of its node and its trie
+        node, children are built from them: the prefix is joined once per
+        node and each child name is a single concatenation, cheaper than
+        joining a stack of path segments for every entry.
+        '''
+        reserved_keys = set(deploy_yaml_keys.values())
+        # (path, node, items, is_list_item, is_list)
+        stack: List[
+            Tuple[str, DeployTrieNode, Iterator[Any], bool, bool]
+        ] = []
+
+        def push(
+            path: str,
+            node: DeployTrieNode,
+            data: Any,
+            is_list_item: bool,
+        ) -> None:
+            if isinstance(data, dict):
+                if deploy_yaml_keys['constants'] in data:
+                    self._handle_constant(path, depl_dict, data, node)
+                stack.append(
+                    (path, node, iter(data.items()), is_list_item, False))
+            elif isinstance(data, list):
+                stack.append((path, node, iter(data), is_list_item, True))
+
+        push(path, node or self._root, depl_data, is_list_item)
+        while stack:
+            path, node, items, is_list_item, is_list = stack[-1]
+            item: Any = next(items, _END)
+            if item is _END:
+                stack.pop()
+            elif not is_list:
+                key, value = item
+                if key in reserved_keys:
                     continue
 
                 entry_name = f'{path}_{key}' if path else key
-
+                child = node.add(key)
                 if is_list_item:
-                    self._handle_list(entry_name, depl_dict, value)
+                    self._handle_list(entry_name, depl_dict, value, child)
                 else:
-                    depl_dict[entry_name] = VehicleDeployEntry(
+                    child.entry = depl_dict[entry_name] = VehicleDeployEntry(
                         entry_name,
                         value
                     )
+                push(entry_name, child, value, is_list_item)
+            else:
+                for key in item.keys():
+                    if key not in reserved_keys:
+                        node.add(key).entry = depl_dict.setdefault(
+                            f'{path}_{key}', [])
+                push(path, node, item, True)
 
-                if (
-                    key not in deploy_yaml_keys.values()
-                    and (isinstance(value, list) or isinstance(value, dict))
-                ):
-
-                    self.flat_deploy_model(depl_dict,
-                                           entry_name,
-                                           value,
-                                           is_list_item)
-
-        elif isinstance(depl_data, list):
-            for item in depl_data:
-                for key in [k for k in item.keys()
-                            if k not in deploy_yaml_keys.values()]:
-                    entry_name = f'{path}_{key}'
-                    if not depl_dict.get(entry_name):
-                        depl_dict[f'{path}_{key}'] = []
-                self.flat_deploy_model(depl_dict, path, item, True)
+        self._root.update_sizes()
 
     def _handle_constant(self,
                          entry_name: str,
                          depl_dict: Dict,
-                         deploy_data: Dict) -> None:
-        depl_dict[entry_name] = VehicleDeployEntry(entry_name,
-                                                   deploy_data)
+                         deploy_data: Dict,
+                         node: DeployTrieNode) -> None:
+        node.entry = depl_dict[entry_name] = VehicleDeployEntry(
+            entry_name,
+            deploy_data
+        )
         constants = deploy_data[deploy_yaml_keys['constants']]
         if isinstance(constants, dict):
             for key, value in constants[next(iter(constants))].items():
                 constant_entry_name = f'{entry_name}_{key}'
-                depl_dict[constant_entry_name] = VehicleDeployEntry(
-                    constant_entry_name,
-                    value
-                )
+                entry = VehicleDeployEntry(constant_entry_name, value)
+                node.add(key).entry = depl_dict[constant_entry_name] = entry
         if isinstance(constants, list):
             for key, value in constants[0]:
                 constant_entry_name = f'{entry_name}_{key}'
-                depl_dict[constant_entry_name] = VehicleDeployEntry(
-                    constant_entry_name,
-                    value
-                )
+                entry = VehicleDeployEntry(constant_entry_name, value)
+                node.add(key).entry = depl_dict[constant_entry_name] = entry
 
     def _handle_list(self,
                      entry_name: str,
                      depl_dict: Dict,
-                     value: Any):
+                     value: Any,
+                     node: DeployTrieNode):
         if entry_name not in depl_dict:
             depl_dict[entry_name] = []
         depl_dict[entry_name].append(
@@ -117,21 +170,69 @@ class VehicleDeployMap:
                 value
             )
         )
+        node.entry = depl_dict[entry_name]
 
-    def get(self, entry_name: str) -> Optional[VehicleDeployEntry]:
+    def get(self, entry_name: str) -> Optional[DeployNode]:
         return self._deploy_nodes.get(entry_name)
 
-    # REMOVE ME: contains + get_entry is a bad pattern, double lookup
-    def get_entry(self, entry_name: str) -> VehicleDeployEntry:
+    def get_entry(self, entry_name: str) -> DeployNode:
         return self._deploy_nodes[f'{entry_name}']
 
     def contains(self, entry_name: str) -> bool:
         return entry_name in self._deploy_nodes
 
+    @property
+    def root(self) -> DeployTrieNode:
+        return self._root
+
+    def find(
+        self,
+        path: Union[str, Sequence[str]],
+        parent: Optional[DeployTrieNode] = None,
+    ) -> Optional[DeployTrieNode]:
+        '''
+        Returns the trie node of ``path``, relative to ``parent`` (the
+        root by default). Paths are either ``.`` separated strings, like
+        ``Vehicle.Cabin``, or sequences of segments. The cost depends on
+        the depth of the path only.
+        '''
+        if isinstance(path, str):
+            path = path.split('.') if path else []
+        return (parent or self._root).find(path)
+
+    def has_subtree(
+        self,
+        path: Union[str, Sequence[str]],
+        parent: Optional[DeployTrieNode] = None,
+    ) -> bool:
+        '''
+        Whether there are deploy entries at or under ``path``.
+        '''
+        node = self.find(path, parent)
+        return node is not None and node.size > 0
+
+    def glob(
+        self,
+        pattern: str,
+        parent: Optional[DeployTrieNode] = None,
+    ) -> Iterator[Tuple[str, DeployNode]]:
+        '''
+        Yields the names and contents of the entries whose paths match
+        ``pattern``, like ``Vehicle.Cabin.*.Temperature``. Segments are
+        matched with ``fnmatch`` and ``**`` matches any number of them.
+        Names are relative to ``parent``.
+        '''
+        segments = pattern.split('.') if pattern else []
+        for path, node in (parent or self._root).glob(segments):
+            assert node.entry is not None
+            yield '_'.join(path), node.entry
+
     def __iter__(self):
         return iter(self._deploy_nodes.items())
 
     def __init__(self, raw_data: dict):
+        self._deploy_nodes = {}
+        self._root = DeployTrie()
         self.flat_deploy_model(self._deploy_nodes, '', raw_data)
 
     def __repr__(self) -> str:
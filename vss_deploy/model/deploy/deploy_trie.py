@@ -0,0 +1,133 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+from fnmatch import fnmatchcase
+from typing import (
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+
+T = TypeVar('T')
+
+# matches any number of path segments in a glob pattern
+ANY_DEPTH = '**'
+MAGIC_CHARS = frozenset('*?[')
+
+
+class DeployTrie(Generic[T]):
+    '''
+    Path segment trie of the deploy entries.
+
+    Each node is a handle to a path: looking up a descendant costs one
+    dict access per segment, whatever the size of the tree. ``size`` is
+    the number of entries in the subtree, so its membership is answered
+    without walking it.
+    '''
+    __slots__ = ('children', 'entry', 'size')
+    children: Dict[str, 'DeployTrie[T]']
+    entry: Optional[T]
+    size: int
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.entry = None
+        self.size = 0
+
+    def add(self, segment: str) -> 'DeployTrie[T]':
+        '''
+        Returns the child at ``segment``, created if needed.
+        '''
+        child = self.children.get(segment)
+        if child is None:
+            child = self.children[segment] = DeployTrie()
+        return child
+
+    def find(self, segments: Sequence[str]) -> Optional['DeployTrie[T]']:
+        node: Optional[DeployTrie[T]] = self
+        for segment in segments:
+            if node is None:
+                break
+            node = node.children.get(segment)
+        return node
+
+    def update_sizes(self) -> None:
+        '''
+        Computes ``size`` of every node, after the entries were added.
+        '''
+        order: List[DeployTrie[T]] = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            order.append(node)
+            pending.extend(node.children.values())
+        for node in reversed(order):  # children before their parents
+            node.size = int(node.entry is not None) + sum(
+                c.size for c in node.children.values()
+            )
+
+    def glob(
+        self,
+        pattern: Sequence[str],
+    ) -> Iterator[Tuple[List[str], 'DeployTrie[T]']]:
+        '''
+        Yields the path segments and nodes with entries matching the
+        ``fnmatch`` style segments of ``pattern``. A ``**`` segment
+        matches any number of segments.
+
+        Segments without wildcards are looked up directly, only the
+        children of wildcard segments are scanned. Matches are yielded
+        depth first, in insertion order.
+        '''
+        seen: Set[Tuple[int, int]] = set()
+        pending: List[Tuple[DeployTrie[T], int, List[str]]] = [
+            (self, 0, []),
+        ]
+        while pending:
+            node, index, path = pending.pop()
+            if (id(node), index) in seen:
+                continue
+            seen.add((id(node), index))
+
+            if index == len(pattern):
+                if node.entry is not None:
+                    yield path, node
+                continue
+
+            segment = pattern[index]
+            if segment == ANY_DEPTH:
+                pending.extend(reversed([
+                    (child, index, path + [name])
+                    for name, child in node.children.items()
+                    if child.size
+                ]))
+                pending.append((node, index + 1, path))
+            elif MAGIC_CHARS.isdisjoint(segment):
+                child = node.children.get(segment)
+                if child is not None and child.size:
+                    pending.append((child, index + 1, path + [segment]))
+            else:
+                pending.extend(reversed([
+                    (child, index + 1, path + [name])
+                    for name, child in node.children.items()
+                    if child.size and fnmatchcase(name, segment)
+                ]))
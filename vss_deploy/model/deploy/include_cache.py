@@ -0,0 +1,356 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Memoizes the parsed include files of a deploy tree.
+
+Layers include the same subtree files (seats, doors...) many times, each
+one is parsed once and the following includes get a copy of it.
+
+Only the files that don't include others are cached: the data of the
+including files depends on the included files too, they are parsed on
+every include (their includes hit the cache).
+
+The cached files can also be parsed ahead by a pool of processes, the
+sequential load then finds all of them in the cache. They are also kept
+in the optional ``IncludeStore`` shared across runs.
+'''
+
+import copy
+import glob
+import marshal
+import multiprocessing
+import os
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Type,
+)
+
+import yaml
+
+from .include_store import IncludeStore
+from .includes import INCLUDE_RE, get_include_patterns
+from ...utils import can_fork
+
+
+DEFAULT_ENCODING = 'utf-8'
+DEPL_FILE_PATTERN = r'^.+\.depl$'
+
+
+class IncludeCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    prefetched: int = 0
+    stored: int = 0
+
+
+class _Entry(NamedTuple):
+    mtime_ns: int
+    size: int
+    # marshal serialized data, or the data itself if it holds values
+    # marshal doesn't support (ie: timestamps)
+    data: Any
+    marshaled: bool
+
+
+def get_includes(path: str, base_dir: str) -> List[str]:
+    '''
+    Returns the files included by ``path``, resolved like ``yamlinclude``
+    does it: relative to ``base_dir`` with the glob patterns expanded.
+    '''
+    with open(path, encoding=DEFAULT_ENCODING) as f:
+        text = f.read()
+    includes: List[str] = []
+    for pattern in get_include_patterns(text):
+        included = os.path.join(base_dir, pattern)
+        if glob.has_magic(included):
+            includes.extend(sorted(
+                p for p in glob.glob(included, recursive=True)
+                if os.path.isfile(p)
+            ))
+        else:
+            includes.append(included)
+    return [os.path.abspath(p) for p in includes]
+
+
+def get_include_graph(root_file: str, base_dir: str) -> Dict[str, List[str]]:
+    '''
+    Maps every file reachable from ``root_file`` to the files it includes.
+    Files that can't be read are left out.
+    '''
+    graph: Dict[str, List[str]] = {}
+    pending = [os.path.abspath(root_file)]
+    while pending:
+        path = pending.pop()
+        if path in graph:
+            continue
+        try:
+            graph[path] = get_includes(path, base_dir)
+        except (OSError, UnicodeDecodeError):
+            continue
+        pending.extend(graph[path])
+    return graph
+
+
+def _parse_leaf(
+    args: Tuple[str, Type, Optional[IncludeStore]],
+) -> Optional[Tuple[int, int, bytes]]:
+    '''
+    Parses a file in a worker process. The marshal serialization is
+    returned since it is cheaper to transfer than the data itself.
+
+    On errors the file is left to the sequential load, which reports
+    them as usual.
+    '''
+    path, loader_class, store = args
+    try:
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            contents = f.read()
+        data = yaml.load(
+            contents.decode(DEFAULT_ENCODING), Loader=loader_class)
+        serialized = marshal.dumps(data)
+    except (OSError, ValueError, yaml.YAMLError):
+        return None
+    if store is not None:
+        store.save(store.get_key(path, contents, loader_class), serialized)
+    return st.st_mtime_ns, st.st_size, serialized
+
+
+class IncludeCache:
+    '''
+    Parsed include files keyed by their absolute path and mtime.
+
+    The cached data is never handed out: the data of every hit is a
+    fresh copy, so the callers may modify it freely. Copies are built
+    from a marshal serialization, which is an order of magnitude faster
+    than parsing the file again.
+
+    ``misses`` counts the files parsed by this process, ``prefetched``
+    the ones parsed by workers and ``stored`` the ones read from the
+    store.
+    '''
+    __slots__ = ('_entries', 'store', 'hits', 'misses', 'prefetched',
+                 'stored')
+    _entries: Dict[str, _Entry]
+    store: Optional[IncludeStore]
+    hits: int
+    misses: int
+    prefetched: int
+    stored: int
+
+    def __init__(self, store: Optional[IncludeStore] = None) -> None:
+        self._entries = {}
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.stored = 0
+
+    @property
+    def stats(self) -> IncludeCacheStats:
+        return IncludeCacheStats(
+            self.hits, self.misses, self.prefetched, self.stored)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get_entry(
+        self,
+        path: str,
+        st: os.stat_result,
+    ) -> Optional[_Entry]:
+        entry = self._entries.get(path)
+        if (
+            entry is not None
+            and entry.mtime_ns == st.st_mtime_ns
+            and entry.size == st.st_size
+        ):
+            return entry
+        return None
+
+    def _load_stored(
+        self,
+        path: str,
+        st: os.stat_result,
+        key: str,
+    ) -> Optional[bytes]:
+        assert self.store is not None
+        serialized = self.store.load(key)
+        if serialized is None:
+            return None
+        try:
+            marshal.loads(serialized)
+        except (EOFError, ValueError, TypeError):
+            return None  # corrupted, parsed and stored again
+        self.stored += 1
+        self._entries[path] = _Entry(
+            st.st_mtime_ns, st.st_size, serialized, True)
+        return serialized
+
+    def load(
+        self,
+        path: str,
+        encoding: str,
+        loader_class: Type,
+        base_loader_class: Optional[Type] = None,
+    ) -> Any:
+        '''
+        Returns the data of an include file, ``loader_class`` parses it.
+
+        The stored files are keyed by ``base_loader_class``, if given: the
+        loader without the include constructor, which is the same for
+        every load.
+        '''
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        entry = self._get_entry(path, st)
+        if entry is not None:
+            self.hits += 1
+            if entry.marshaled:
+                return marshal.loads(entry.data)
+            return copy.deepcopy(entry.data)
+
+        with open(path, 'rb') as f:
+            contents = f.read()
+        if INCLUDE_RE.search(contents.decode(encoding, 'replace')):
+            # not cached: the included files may change on their own
+            self.misses += 1
+            with open(path, encoding=encoding) as f:
+                return yaml.load(f, Loader=loader_class)
+
+        key = None
+        if self.store is not None:
+            key = self.store.get_key(
+                path, contents, base_loader_class or loader_class)
+            serialized = self._load_stored(path, st, key)
+            if serialized is not None:
+                return marshal.loads(serialized)
+
+        self.misses += 1
+        with open(path, encoding=encoding) as f:
+            data = yaml.load(f, Loader=loader_class)
+        try:
+            serialized = marshal.dumps(data)
+        except ValueError:
+            self._entries[path] = _Entry(
+                st.st_mtime_ns, st.st_size, copy.deepcopy(data), False)
+            return data
+        self._entries[path] = _Entry(
+            st.st_mtime_ns, st.st_size, serialized, True)
+        if self.store is not None and key is not None:
+            self.store.save(key, serialized)
+        return data
+
+    def prefetch(
+        self,
+        root_file: str,
+        base_dir: str,
+        loader_class: Type,
+        jobs: int,
+    ) -> int:
+        '''
+        Parses the files of the include tree of ``root_file`` that don't
+        include other files using ``jobs`` processes, returns how many
+        were cached.
+
+        The loader class must not have the include constructor since the
+        workers only parse leaves. The including files are left to the
+        sequential load, which stitches the cached leaves in place.
+
+        Leaves found in the store are not parsed again.
+        '''
+        if jobs <= 1 or not can_fork():
+            return 0
+
+        pattern = re.compile(DEPL_FILE_PATTERN, re.IGNORECASE)
+        root_file = os.path.abspath(root_file)
+        leaves: List[str] = []
+        for path, includes in get_include_graph(root_file, base_dir).items():
+            if includes or path == root_file or not pattern.match(path):
+                continue
+            try:
+                if not self._is_cached(path, loader_class):
+                    leaves.append(path)
+            except OSError:
+                continue
+        if len(leaves) <= 1:
+            return 0
+
+        jobs = min(jobs, len(leaves))
+        chunksize = max(1, len(leaves) // (jobs * 4))
+        context = multiprocessing.get_context('fork')
+        with context.Pool(jobs) as pool:
+            results = pool.map(
+                _parse_leaf,
+                [(path, loader_class, self.store) for path in leaves],
+                chunksize,
+            )
+
+        count = 0
+        for path, result in zip(leaves, results):
+            if result is not None:
+                self._entries[path] = _Entry(*result, True)
+                count += 1
+        self.prefetched += count
+        return count
+
+    def _is_cached(self, path: str, loader_class: Type) -> bool:
+        st = os.stat(path)
+        if self._get_entry(path, st) is not None:
+            return True
+        if self.store is None:
+            return False
+        with open(path, 'rb') as f:
+            contents = f.read()
+        key = self.store.get_key(path, contents, loader_class)
+        return self._load_stored(path, st, key) is not None
+
+    def get_reader_map(
+        self,
+        base_loader_class: Type,
+        pattern: str = DEPL_FILE_PATTERN,
+    ) -> List[Tuple[Pattern, Callable[..., Callable[[], Any]]]]:
+        '''
+        ``yamlinclude`` reader table, the included files are parsed by
+        the loader class of the including document. ``base_loader_class``
+        is the one it derives from, without the include constructor.
+        '''
+        def get_reader(
+            path: str,
+            encoding: str = DEFAULT_ENCODING,
+            loader: Optional[yaml.BaseLoader] = None,
+            loader_class: Optional[Type] = None,
+            **kwargs: Any,
+        ) -> Callable[[], Any]:
+            # older yamlinclude versions (ie: 1.2) give the loader class,
+            # newer ones the loader instance
+            if loader is not None:
+                including_class = type(loader)
+            else:
+                assert loader_class is not None
+                including_class = loader_class
+            return lambda: self.load(
+                path, encoding, including_class, base_loader_class)
+
+        return [(re.compile(pattern, re.IGNORECASE), get_reader)]
@@ -0,0 +1,97 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+On-disk store of parsed include files shared across runs.
+
+Vehicle variants share most of their include files, a file parsed by a
+build is reused by the following ones as long as its contents, the YAML
+loader and the serialization format are the same.
+'''
+
+import hashlib
+import marshal
+import os
+from typing import Optional, Type
+
+import yaml
+
+from ...utils import atomic_write
+
+
+STORE_VERSION = 1
+ENTRY_PREFIX = 'include-'
+ENTRY_SUFFIX = '.marshal'
+
+
+def get_loader_version(loader_class: Type) -> str:
+    '''
+    Identifies the loader producing the data: its classes and the PyYAML
+    release.
+    '''
+    classes = ','.join(
+        f'{c.__module__}.{c.__qualname__}' for c in loader_class.__mro__
+    )
+    return f'{yaml.__version__}:{classes}'
+
+
+class IncludeStore:
+    '''
+    Directory of marshal serialized include files.
+
+    Entries are keyed by the file path, the hash of its contents and the
+    loader version. They are written to a temporary file then renamed in
+    place, so concurrent builds sharing the directory never read a
+    partial entry: at worst both parse the file and one rename wins.
+    '''
+    __slots__ = ('directory',)
+    directory: str
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def get_key(self, path: str, contents: bytes, loader_class: Type) -> str:
+        digest = hashlib.sha256(
+            f'{STORE_VERSION}\0{marshal.version}\0'
+            f'{get_loader_version(loader_class)}\0'
+            f'{os.path.abspath(path)}\0'.encode('utf-8')
+        )
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def _get_filename(self, key: str) -> str:
+        return os.path.join(
+            self.directory, f'{ENTRY_PREFIX}{key}{ENTRY_SUFFIX}')
+
+    def load(self, key: str) -> Optional[bytes]:
+        '''
+        Returns the marshal serialization stored for ``key``, if any.
+        '''
+        try:
+            with open(self._get_filename(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def save(self, key: str, data: bytes) -> None:
+        '''
+        Stores the marshal serialization of an include file. Failures
+        are ignored: the store is only an optimization.
+        '''
+        try:
+            atomic_write(self._get_filename(key), data)
+        except OSError:
+            pass
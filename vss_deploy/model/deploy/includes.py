@@ -0,0 +1,61 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Patterns of the ``!include`` tags of the deploy files.
+
+They are found with regular expressions instead of parsing the YAML, so
+the files that include others are known without loading them. This
+module only depends on the standard library: the build manifest uses it
+before the deploy model is imported.
+'''
+
+import re
+from typing import List
+
+
+# The argument of `!include file.depl`, `!include {pathname: file.depl}`
+# and `!include [file.depl, ...]`
+INCLUDE_RE = re.compile(r'!include\s+(\[[^\]]*\]|\{[^}]*\}|[^\s,}\]]+)')
+PATHNAME_RE = re.compile(r'pathname\s*:\s*([^\s,}]+)')
+
+
+def get_include_patterns(text: str) -> List[str]:
+    '''
+    Returns the path patterns of the ``!include`` tags of a document.
+
+    Every item of the sequence form is returned: some may be other
+    arguments, which is harmless as they don't match any file.
+
+    >>> get_include_patterns(
+    ...     "a: !include a.depl\\n"
+    ...     "b: !include {pathname: 'b/*.depl', encoding: utf-8}\\n"
+    ...     "c: !include [c.depl, \\"d.depl\\"]\\n"
+    ... )
+    ['a.depl', 'b/*.depl', 'c.depl', 'd.depl']
+    '''
+    patterns: List[str] = []
+    for argument in INCLUDE_RE.findall(text):
+        if argument.startswith('{'):
+            items = PATHNAME_RE.findall(argument)
+        elif argument.startswith('['):
+            items = argument[1:-1].split(',')
+        else:
+            items = [argument]
+        for item in items:
+            item = item.strip().strip('\'"')
+            if item:
+                patterns.append(item)
+    return patterns
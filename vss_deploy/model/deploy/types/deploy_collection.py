@@ -20,6 +20,8 @@ from .deploy_type import DeployType
 
 
 class DeployCollection(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_entries(self) -> Iterable['DeployType']:
         pass
@@ -15,7 +15,6 @@
 
 from typing import List, Literal
 
-from . import deploy_factory
 from .deploy_collection import DeployCollection
 from .deploy_type import DeployType
 from ...json_types import JSONValue
@@ -32,10 +31,12 @@ class DeployDispatcher(DeployType, DeployCollection):
         if not isinstance(spec, dict):
             raise ValueError('Dispatcher expects a JSON object')
         self.selector = spec['selector']
+        # imported here: the factory imports this module
+        from .deploy_factory import deploy_map_factory
         self.options = []
         for opt in spec['options']:
             for key, value in opt.items():
-                factory = deploy_factory.deploy_map_factory[key]
+                factory = deploy_map_factory[key]
                 self.options.append(factory(value, self.name))
                 break
 
@@ -20,7 +20,7 @@ from .deploy_type import DeployType
 
 
 class DeployList(DeployType, DeployCollection):
-    __slot__ = ('entries',)
+    __slots__ = ('entries',)
     kind: Literal['list'] = 'list'
     entries: List['DeployType']
 
@@ -14,6 +14,7 @@
 # http://mozilla.org/MPL/2.0/.
 
 class DeployType:
+    __slots__ = ('name',)
     kind: str
     name: str
 
@@ -20,10 +20,12 @@ write_keys: DeployFrancaIDLMethodsFilter = ['write']
 
 
 class DeployWithMethod:
+    # mixin: the concrete classes declare the 'methods' slot
+    __slots__ = ()
     methods: DeployMethods
 
     def __init__(self, methods: DeployMethods):
-        self.methods = methods
+        self.methods = methods  # type: ignore[misc]
 
     def _get_any_method_attribute(
         self,
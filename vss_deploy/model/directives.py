@@ -16,7 +16,7 @@
 # http://mozilla.org/MPL/2.0/.
 
 
-from typing import ClassVar, List, Optional
+from typing import ClassVar, Iterable, List, Optional
 
 from graphql import ArgumentNode, DirectiveNode, NameNode
 from graphql.pyutils import FrozenList
@@ -34,6 +34,10 @@ class Directives:
 
     Class that creates and holds custom GraphQL directives.
 
+    The directives are built on first access and memoized, most nodes
+    never need them. Permissions of the nodes are registered in batch by
+    ``register_permissions()``.
+
     Parameters:
     -----------
         node : VSSNode
@@ -44,26 +48,61 @@ class Directives:
         get_directives()
             Returns a list of the custom directives of the node.
 
+        register_permissions(nodes: Iterable[VSSNode])
+            Registers the permissions of the leaves in nodes.
+
         get_range_directive(node: VSSNode) -> DirectiveNode
             Returns range directive node.
 
         get_hasPermission_directive(node: VSSNode) -> DirectiveNode
             Retuns hasPermission directive node.
     '''
+    __slots__ = ('node', '_range_directive', '_has_permission_directive')
     range_fields = ('min', 'max')
-    range_directive: Optional[DirectiveNode]
-    has_permission_directive: Optional[DirectiveNode]
+    node: VSSNode
+    # unset until first accessed
+    _range_directive: Optional[DirectiveNode]
+    _has_permission_directive: Optional[DirectiveNode]
     permissions_registry: ClassVar[PermissionsRegistry] = PermissionsRegistry(
         None)
 
     def __init__(self, node: VSSNode):
-        if not node.is_leaf:
-            self.range_directive = None
-            self.has_permission_directive = None
-        else:
-            self.range_directive = self.get_range_directive(node)
-            self.has_permission_directive = self.get_has_permission_directive(
-                node)
+        self.node = node
+
+    @property
+    def range_directive(self) -> Optional[DirectiveNode]:
+        try:
+            return self._range_directive
+        except AttributeError:
+            pass
+        directive = None
+        if self.node.is_leaf:
+            directive = self.get_range_directive(self.node)
+        self._range_directive = directive
+        return directive
+
+    @range_directive.setter
+    def range_directive(self, directive: Optional[DirectiveNode]) -> None:
+        self._range_directive = directive
+
+    @property
+    def has_permission_directive(self) -> Optional[DirectiveNode]:
+        try:
+            return self._has_permission_directive
+        except AttributeError:
+            pass
+        directive = None
+        if self.node.is_leaf:
+            directive = self.get_has_permission_directive(self.node)
+        self._has_permission_directive = directive
+        return directive
+
+    @has_permission_directive.setter
+    def has_permission_directive(
+        self,
+        directive: Optional[DirectiveNode],
+    ) -> None:
+        self._has_permission_directive = directive
 
     def get_directives(self) -> List[DirectiveNode]:
         return FrozenList(filter(None, [
@@ -91,7 +130,8 @@ class Directives:
             node: VSSNode,
             operation: str = 'READ',
     ) -> Optional[DirectiveNode]:
-        permission = f'{node.qualified_name(".")}_{operation}'
+        permission = cls.get_permission(node, operation)
+        # no-op if it was registered in batch already
         Directives.permissions_registry.register(permission)
         arguments = [ArgumentNode(
             name=NameNode(value='permissions'),
@@ -101,6 +141,24 @@ class Directives:
             name=NameNode(value='hasPermissions'),
             arguments=FrozenList(arguments))
 
+    @staticmethod
+    def get_permission(node: VSSNode, operation: str = 'READ') -> str:
+        return f'{node.qualified_name(".")}_{operation}'
+
+    @classmethod
+    def register_permissions(
+        cls,
+        nodes: Iterable[VSSNode],
+        operation: str = 'READ',
+    ) -> None:
+        '''
+        Registers the permissions of the leaves in ``nodes``, in order.
+        '''
+        Directives.permissions_registry.register_many(
+            cls.get_permission(node, operation)
+            for node in nodes if node.is_leaf
+        )
+
     def __str__(self):
         directives_list = self.get_directives()
         directives = []
@@ -13,10 +13,116 @@
 # not distributed with this file, You can obtain one at
 # http://mozilla.org/MPL/2.0/.
 
-from typing import Dict, Optional
+'''
+Persistent permission -> id registry.
+
+The registry file is a YAML mapping used as an append-only journal:
+new permissions are appended as ``name: id`` lines, so saving only
+parses and dumps the new permissions and the file is still read by a
+plain ``yaml.load``.
+Files that are not a block mapping (ie: ``{a: 0}``) are rewritten
+instead, as sorted block mappings.
+
+Concurrent generators share the file: appends are serialized by an
+advisory lock on the registry file and the ids are assigned while
+holding it, after reading the entries other processes appended in the
+meantime, so an id is never handed out twice. The entries are known
+to be appended only if the bytes already read are unchanged: the file
+may have been rewritten meanwhile, even reusing the same inode.
+'''
+
+import hashlib
+import os
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import yaml
 
+from .yaml_loaders import Dumper, SafeLoader
+from ..utils import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+DOCUMENT_MARKER_RE = re.compile(rb'^(?:---|\.\.\.)(?:\s|$)', re.MULTILINE)
+
+
+@contextmanager
+def open_locked(filename: str, flags: int) -> Iterator[int]:
+    '''
+    Opens ``filename`` holding an advisory lock on it: shared if opened
+    read-only, exclusive otherwise. Without ``fcntl`` (ie: Windows)
+    nothing is locked.
+
+    The file may be atomically replaced while waiting for the lock, then
+    the lock is held on the old file: the new one is opened and locked
+    instead.
+    '''
+    while True:
+        fd = os.open(filename, flags | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            if fcntl is None:
+                break
+            fcntl.flock(
+                fd,
+                fcntl.LOCK_SH if flags & os.O_ACCMODE == os.O_RDONLY
+                else fcntl.LOCK_EX,
+            )
+            try:
+                if _get_file_id(os.fstat(fd)) == _get_file_id(
+                    os.stat(filename),
+                ):
+                    break
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _load_entries(data: bytes, encoding: str) -> Dict[str, int]:
+    entries = yaml.load(data.decode(encoding), Loader=SafeLoader)
+    return entries if entries else {}
+
+
+def _is_block_mapping(data: bytes, encoding: str) -> bool:
+    '''
+    Whether ``name: id`` lines can be appended to the document, keeping
+    it a valid mapping: it must be empty or a single block mapping
+    starting at the first column. Flow mappings (``{a: 0}``) and
+    explicit documents must be rewritten instead.
+    '''
+    if DOCUMENT_MARKER_RE.search(data):
+        return False
+    try:
+        for event in yaml.parse(data.decode(encoding), Loader=SafeLoader):
+            if isinstance(event, yaml.StreamEndEvent):
+                return True
+            if isinstance(
+                event, (yaml.StreamStartEvent, yaml.DocumentStartEvent),
+            ):
+                continue
+            return (
+                isinstance(event, yaml.MappingStartEvent)
+                and not event.flow_style
+                and event.start_mark.column == 0
+            )
+    except yaml.YAMLError:
+        pass
+    return False
+
+
+def _get_file_id(st: os.stat_result) -> Tuple[int, int]:
+    return (st.st_dev, st.st_ino)
+
 
 class PermissionsRegistry:
     registry: Dict[str, int]
@@ -28,6 +134,15 @@ class PermissionsRegistry:
         self.registry = registry
         self.next_id = max(registry.values()) + 1 if registry else 0
         self.changed = False
+        # permissions registered since the last load/save, in order.
+        # Their ids are provisional until saved.
+        self._pending: List[str] = []
+        # how much of the file is reflected by `registry` and the digest
+        # of those bytes
+        self._offset = 0
+        self._digest: Optional[bytes] = None
+        # whether new entries can be appended to that file
+        self._appendable = False
 
     def register(self, permission: str) -> int:
         try:
@@ -36,15 +151,130 @@ class PermissionsRegistry:
             i = self.next_id
             self.next_id += 1
             self.registry[permission] = i
+            self._pending.append(permission)
             self.changed = True
             return i
 
+    def register_many(self, permissions: Iterable[str]) -> None:
+        '''
+        Registers the new permissions, in order.
+        '''
+        registry = self.registry
+        pending = self._pending
+        for permission in permissions:
+            if permission not in registry:
+                registry[permission] = self.next_id
+                self.next_id += 1
+                pending.append(permission)
+                self.changed = True
+
+    def _set_contents(self, data: bytes) -> None:
+        self._offset = len(data)
+        self._digest = hashlib.sha256(data).digest()
+
+    def _read_new_entries(
+        self,
+        data: bytes,
+        encoding: str,
+    ) -> Optional[Dict[str, int]]:
+        '''
+        Returns the entries appended to the file since it was last read,
+        or ``None`` if it was rewritten and must be loaded as a whole.
+        '''
+        offset = self._offset
+        if (
+            len(data) < offset
+            or hashlib.sha256(data[:offset]).digest() != self._digest
+        ):
+            return None
+        if len(data) == offset:
+            return {}
+        return _load_entries(data[offset:], encoding)
+
     def save(self, filename: str, encoding: str = 'utf-8') -> bool:
+        '''
+        Assigns the final ids to the new permissions and appends them to
+        the registry file.
+
+        Entries saved by other processes since this registry was loaded
+        are merged first: permissions they already registered take their
+        ids and the new ones are numbered after every saved id. Hence
+        the ids of new permissions may change, ``registry`` must be
+        read after saving.
+        '''
         if not self.changed:
             return False
-        with open(filename, 'w', encoding=encoding) as f:
-            yaml.dump(self.registry, f, encoding=encoding)
-            return True
+        with open_locked(filename, os.O_RDWR | os.O_CREAT) as fd:
+            self._save_locked(fd, filename, encoding)
+        return True
+
+    def _save_locked(self, fd: int, filename: str, encoding: str) -> None:
+        data = os.read(fd, os.fstat(fd).st_size)
+        pending = self._pending
+        saved = self.registry
+        entries = self._read_new_entries(data, encoding)
+        if entries is None:
+            # unknown contents: everything, but the pending permissions,
+            # must come from the file
+            entries = _load_entries(data, encoding)
+            self._appendable = _is_block_mapping(data, encoding)
+            saved = entries
+        else:
+            for permission in pending:
+                del saved[permission]
+            saved.update(entries)
+
+        next_id = max(saved.values()) + 1 if saved else 0
+        new: Dict[str, int] = {}
+        for permission in pending:
+            if permission not in saved:
+                new[permission] = saved[permission] = next_id
+                next_id += 1
+
+        if not data or (new and not self._appendable):
+            # brand new file or not a block mapping (ie: flow style): write
+            # the canonical (sorted) mapping
+            data = self._write(filename, saved, encoding)
+            self._appendable = True
+        elif new:
+            appended = b'' if data.endswith(b'\n') else b'\n'
+            appended += yaml.dump(
+                new, Dumper=Dumper, encoding=encoding, sort_keys=False)
+            os.lseek(fd, 0, os.SEEK_END)
+            os.write(fd, appended)
+            data += appended
+
+        if saved is not self.registry:
+            self.registry.clear()
+            self.registry.update(saved)
+        self.next_id = next_id
+        self.changed = False
+        self._pending = []
+        self._set_contents(data)
+
+    def _write(
+        self,
+        filename: str,
+        registry: Dict[str, int],
+        encoding: str,
+    ) -> bytes:
+        data = yaml.dump(registry, Dumper=Dumper, encoding=encoding)
+        atomic_write(filename, data)
+        return data
+
+    def compact(self, filename: str, encoding: str = 'utf-8') -> None:
+        '''
+        Rewrites the registry file as a sorted mapping, dropping the
+        journal order. The file is atomically replaced, so concurrent
+        readers see either version.
+        '''
+        try:
+            with open_locked(filename, os.O_RDWR) as fd:
+                data = os.read(fd, os.fstat(fd).st_size)
+                registry = _load_entries(data, encoding)
+                self._write(filename, registry, encoding)
+        except FileNotFoundError:
+            return
 
     @classmethod
     def create(
@@ -53,8 +283,11 @@ class PermissionsRegistry:
         encoding: str = 'utf-8',
     ) -> 'PermissionsRegistry':
         try:
-            with open(filename, 'r', encoding=encoding) as f:
-                registry = yaml.load(f, Loader=yaml.SafeLoader)
-                return cls(registry)
+            with open_locked(filename, os.O_RDONLY) as fd:
+                data = os.read(fd, os.fstat(fd).st_size)
         except FileNotFoundError:
             return cls(None)
+        self = cls(_load_entries(data, encoding))
+        self._set_contents(data)
+        self._appendable = _is_block_mapping(data, encoding)
+        return self
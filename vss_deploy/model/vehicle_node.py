@@ -40,13 +40,17 @@ class VehicleNode(Node):
      :param deploy_info: Values from entry (FrancaIDL | DeployConstant |
         DeployList)
      :param qualifiers: Properties as range | hasPermission
+
+    anytree's Node keeps a ``__dict__`` for its own attributes, only
+    the ones declared here are slotted.
     '''
 
+    __slots__ = ('original_node', 'deploy_entry', 'deploy_info', 'qualifiers')
     original_node: VSSNode
     parent: Optional['VehicleNode']
     children: Iterable[Optional['VehicleNode']]
     deploy_entry: Optional[VehicleDeployEntry]
-    deploy_info = Optional[DeployType]
+    deploy_info: Optional[DeployType]
     # TODO: Change directives to qualifiers
     qualifiers: Optional[Directives]
 
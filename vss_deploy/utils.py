@@ -0,0 +1,88 @@
+# Copyright (C) 2021, Bayerische Motoren Werke Aktiengesellschaft (BMW AG),
+#   Author: Alexander Domin (Alexander.Domin@bmw.de)
+# Copyright (C) 2021, ProFUSION Sistemas e Soluções LTDA,
+#   Author: Gustavo Barbieri (barbieri@profusion.mobi)
+#   Author: Garbiel Fernandes (g7fernandes@profusion.mobi)
+#   Author: Leandro Ferlin (leandroferlin@profusion.mobi)
+#   Author: Leonardo Ramos (leo.ramos@profusion.mobi)
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This Source Code Form is subject to the terms of the
+# Mozilla Public License, v. 2.0. If a copy of the MPL was
+# not distributed with this file, You can obtain one at
+# http://mozilla.org/MPL/2.0/.
+
+'''
+Helpers that only depend on the standard library.
+
+Importing ``vss_deploy`` or one of its packages doesn't import the model:
+the package attributes are resolved on first access, so the light modules
+(ie: the ``!include`` patterns used by the build manifest) can be
+imported without graphql-core, vss-tools and the deploy types.
+'''
+
+import importlib
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Mapping, Union
+
+
+def lazy_exports(
+    package: str,
+    exports: Mapping[str, str],
+) -> Callable[[str], Any]:
+    '''
+    Returns the module ``__getattr__`` of ``package`` resolving the
+    exported names, mapped to the relative module defining them, when
+    first accessed.
+    '''
+    def getattr_export(name: str) -> Any:
+        try:
+            module = exports[name]
+        except KeyError:
+            raise AttributeError(
+                f'module {package!r} has no attribute {name!r}') from None
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    return getattr_export
+
+
+def can_fork() -> bool:
+    '''
+    Whether processes can be forked, so workers inherit the parent state
+    instead of receiving it pickled.
+    '''
+    # imported here: the build manifest imports this module
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def atomic_write(filename: str, content: Union[str, bytes]) -> None:
+    '''
+    Writes the file contents to a temporary file in the same directory
+    and atomically replaces the target, so readers never see a partially
+    written file.
+    '''
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(
+        dir=directory,
+        prefix=f'.{os.path.basename(filename)}.',
+        suffix='.tmp',
+    )
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+        if os.path.exists(filename):
+            shutil.copymode(filename, tmp)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.remove(tmp)
+        raise
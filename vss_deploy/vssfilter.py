@@ -16,14 +16,20 @@
 # http://mozilla.org/MPL/2.0/.
 
 import sys
-from typing import List, Optional
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
 
 from vspec import VSSNode
 
-from .model.deploy.deploy_map import VehicleDeployMap
+from .model.compact_tree import CompactVehicleNode, CompactVehicleTree
+from .model.deploy.deploy_entry import VehicleDeployEntry
+from .model.deploy.deploy_map import DeployTrieNode, VehicleDeployMap
+from .model.directives import Directives
 from .model.vehicle_node import VehicleNode
 
 
+N = TypeVar('N')
+
+
 def filter_vss_tree(
     vss_node: VSSNode,
     deploy_map: Optional[VehicleDeployMap] = None
@@ -47,29 +53,163 @@ def filter_vss_tree(
         New tree of objects derived from VSSNode.
     '''
 
-    deploy_entry = None
-    if deploy_map:
-        deploy_entry = deploy_map.get_entry(vss_node.qualified_name('_'))
-        if isinstance(deploy_entry, list):
-            deploy_entry = deploy_entry[0]
-
-    vehicle_node = VehicleNode(vss_node, deploy_entry=deploy_entry)
-    children: List[VehicleNode] = []
-    for child_vss_node in vss_node.children:
-        if deploy_map is None or deploy_map.contains(
-                child_vss_node.qualified_name('_')
-        ):
-            child_vehicle_node = filter_vss_tree(child_vss_node, deploy_map)
-            child_vehicle_node.parent = vehicle_node
-
-            if child_vss_node.is_leaf == child_vehicle_node.is_leaf:
-                children.append(child_vehicle_node)
-            else:
-                sys.stdout.write(
-                    'Deploy has extra node(s) at: '
-                    f'{child_vss_node.qualified_name("_")}\n'
-                )
-
-    vehicle_node.children = children
-
-    return vehicle_node
+    def close(vehicle_node: VehicleNode, children: List[VehicleNode]) -> None:
+        vehicle_node.children = children  # type: ignore[misc]
+
+    return _filter_vss_tree(
+        vss_node,
+        deploy_map,
+        lambda vss_node, deploy_entry: VehicleNode(
+            vss_node, deploy_entry=deploy_entry),
+        close,
+        lambda vehicle_node: None,
+    )
+
+
+def filter_vss_tree_compact(
+    vss_node: VSSNode,
+    deploy_map: Optional[VehicleDeployMap] = None
+) -> CompactVehicleNode:
+    '''
+    Same as ``filter_vss_tree()``, but the tree is built as a
+    ``CompactVehicleTree``, it takes less memory and time to build.
+
+    Returns:
+    --------
+    vehicle_tree : CompactVehicleNode
+        View of the root of the tree, with the same API as VehicleNode.
+    '''
+    tree = CompactVehicleTree()
+    root = _filter_vss_tree(
+        vss_node, deploy_map, tree.add, tree.link, tree.pop)
+    return tree.node(root)
+
+
+def _filter_vss_tree(
+    vss_node: VSSNode,
+    deploy_map: Optional[VehicleDeployMap],
+    create: Callable[[VSSNode, Optional[VehicleDeployEntry]], N],
+    close: Callable[[N, List[N]], None],
+    drop: Callable[[N], None],
+) -> N:
+    '''
+    Walks the VSS tree, ``create`` is called for each node kept by the
+    deploy, in pre-order. Once its subtree is done, ``close`` is called
+    with its children, then ``drop`` if it is dropped.
+
+    The permissions of the kept leaves are registered in one pass once
+    the tree is built.
+    '''
+    name = vss_node.qualified_name('_')
+    deploy_node = _find_deploy_node(vss_node, name, deploy_map)
+
+    diagnostics: List[str] = []
+    # leaves are never dropped
+    leaves: List[VSSNode] = []
+    if vss_node.is_leaf:
+        leaves.append(vss_node)
+    root = create(vss_node, _get_deploy_entry(deploy_node))
+    # Walked depth first with an explicit stack, the deep VSS trees are
+    # not bound by the recursion limit. Frames carry the qualified name
+    # of their node, so it is not computed again from the root.
+    stack = [_Frame(vss_node, deploy_node, root, name)]
+    while stack:
+        frame = stack[-1]
+        child_vss_node = next(frame.vss_children, None)
+        if child_vss_node is None:
+            stack.pop()
+            close(frame.vehicle_node, frame.children)
+            if stack:
+                _add_child(stack[-1], frame, drop, diagnostics)
+            continue
+
+        child_deploy_node = None
+        if frame.deploy_node is not None:
+            # a single lookup from the parent trie node
+            child_deploy_node = frame.deploy_node.children.get(
+                child_vss_node.name)
+            if child_deploy_node is None or child_deploy_node.entry is None:
+                continue
+
+        if child_vss_node.is_leaf:
+            leaves.append(child_vss_node)
+        stack.append(_Frame(
+            child_vss_node,
+            child_deploy_node,
+            create(child_vss_node, _get_deploy_entry(child_deploy_node)),
+            f'{frame.name}_{child_vss_node.name}',
+        ))
+
+    Directives.register_permissions(leaves)
+    if diagnostics:
+        sys.stdout.write(''.join(diagnostics))
+
+    return root
+
+
+class _Frame(Generic[N]):
+    __slots__ = (
+        'vss_node', 'vss_children', 'deploy_node', 'vehicle_node', 'name',
+        'children',
+    )
+    vss_node: VSSNode
+    vss_children: Iterator[VSSNode]
+    deploy_node: Optional[DeployTrieNode]
+    vehicle_node: N
+    name: str
+    children: List[N]
+
+    def __init__(
+        self,
+        vss_node: VSSNode,
+        deploy_node: Optional[DeployTrieNode],
+        vehicle_node: N,
+        name: str,
+    ) -> None:
+        self.vss_node = vss_node
+        self.vss_children = iter(vss_node.children)
+        self.deploy_node = deploy_node
+        self.vehicle_node = vehicle_node
+        self.name = name
+        self.children = []
+
+
+def _find_deploy_node(
+    vss_node: VSSNode,
+    name: str,
+    deploy_map: Optional[VehicleDeployMap],
+) -> Optional[DeployTrieNode]:
+    if not deploy_map:
+        return None
+    deploy_node = deploy_map.find([n.name for n in vss_node.path])
+    if deploy_node is None or deploy_node.entry is None:
+        raise KeyError(name)
+    return deploy_node
+
+
+def _get_deploy_entry(
+    deploy_node: Optional[DeployTrieNode],
+) -> Optional[VehicleDeployEntry]:
+    if deploy_node is None:
+        return None
+    deploy_entry = deploy_node.entry
+    if isinstance(deploy_entry, list):
+        return deploy_entry[0]
+    return deploy_entry
+
+
+def _add_child(
+    parent: _Frame[N],
+    child: _Frame[N],
+    drop: Callable[[N], None],
+    diagnostics: List[str],
+) -> None:
+    '''
+    Adds a filtered child once its subtree is done: VSS branches left
+    without children by the deploy are dropped.
+    '''
+    if child.vss_node.is_leaf == (not child.children):
+        parent.children.append(child.vehicle_node)
+    else:
+        drop(child.vehicle_node)
+        diagnostics.append(f'Deploy has extra node(s) at: {child.name}\n')